@@ -1,12 +1,16 @@
-from typing import Dict, List
-from random import randint
+from typing import Dict, List, Type, Sequence, Any
 from functools import reduce
-from copy import deepcopy
+from array import array
+from math import pi
+import numpy as np  #type: ignore
 
 from ackley.phenotypes import FloatPhenotype, FloatPairPhenotype
-from ackley.genotypes import FloatGenotype, FloatPairGenotype
+from ackley.genotypes import FloatGenotype, FloatPairGenotype, FloatGenotypeView, FloatPairGenotypeView
 from ackley.util import DataType
 from genetic_framework.chromosome import Chromosome
+from genetic_framework.compact import CompactChromosome
+from genetic_framework.array_population import ArrayChromosome
+from genetic_framework.randomness import get_numpy_random
 
 
 class FloatChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
@@ -36,8 +40,8 @@ class FloatChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
         return new_gene
 
     @property
-    def genotypes(self) -> List[FloatGenotype]:
-        return self._genotypes
+    def genotypes(self) -> Sequence[FloatGenotype]:
+        return tuple(self._genotypes)
 
     @genotypes.setter
     def genotypes(self, genes: List[FloatGenotype]) -> None:
@@ -47,7 +51,12 @@ class FloatChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
                 'Tried to assign genotypes to FloatChromosome with wrong number of genes ({}). Expected {}.'
                 .format(len(genes), n))
 
-        self._genotypes = deepcopy(genes)
+        self._adopt_genotypes(genes)
+
+    @property
+    def values(self) -> Sequence[float]:
+        """Value of every gene."""
+        return [gene.data for gene in self._genotypes]
 
     @property
     def phenotypes(self) -> List[FloatPhenotype]:
@@ -102,8 +111,8 @@ class AdaptiveStepFloatChromosome(Chromosome[FloatPairPhenotype,
         return new_gene
 
     @property
-    def genotypes(self) -> List[FloatPairGenotype]:
-        return self._genotypes
+    def genotypes(self) -> Sequence[FloatPairGenotype]:
+        return tuple(self._genotypes)
 
     @genotypes.setter
     def genotypes(self, genes: List[FloatPairGenotype]) -> None:
@@ -113,7 +122,12 @@ class AdaptiveStepFloatChromosome(Chromosome[FloatPairPhenotype,
                 'Tried to assign genotypes to AdaptiveStepFloatChromosome with wrong number of genes ({}). Expected {}.'
                 .format(len(genes), n))
 
-        self._genotypes = deepcopy(genes)
+        self._adopt_genotypes(genes)
+
+    @property
+    def values(self) -> Sequence[float]:
+        """Value of every gene, without step sizes."""
+        return [gene.data[0] for gene in self._genotypes]
 
     @property
     def phenotypes(self) -> List[FloatPairPhenotype]:
@@ -142,34 +156,30 @@ class CovarianceFloatChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
         k: int = int(n * (n - 1) / 2)
         size: int = 2 * n + k
 
-        self._genotypes = [
-            FloatGenotype(self.custom_data) for _ in range(size)
-        ]
+        genotypes = [FloatGenotype(self.custom_data) for _ in range(size)]
         for i in range(size):
-            if i < n:
-                self._genotypes[i].type = DataType.VARIABLE
-            elif i < 2 * n:
-                self._genotypes[i].type = DataType.STEP_SIZE
-            else:
-                self._genotypes[i].type = DataType.ROTATION_ANGLE
+            genotypes[i].type = self.gene_type(i)
+        self._genotypes = genotypes
+
+    def gene_type(self, index: int) -> DataType:
+        n: int = self.custom_data['n']
+
+        if index < n:
+            return DataType.VARIABLE
+        elif index < 2 * n:
+            return DataType.STEP_SIZE
+        return DataType.ROTATION_ANGLE
 
     def initialize(self) -> None:
         n: int = self.custom_data['n']
         k: int = int(n * (n - 1) / 2)
         size: int = 2 * n + k
 
-        self._genotypes = [
-            FloatGenotype(self.custom_data) for _ in range(size)
-        ]
+        genotypes = [FloatGenotype(self.custom_data) for _ in range(size)]
         for i in range(size):
-            if i < n:
-                self._genotypes[i].type = DataType.VARIABLE
-            elif i < 2 * n:
-                self._genotypes[i].type = DataType.STEP_SIZE
-            else:
-                self._genotypes[i].type = DataType.ROTATION_ANGLE
-
-            self._genotypes[i].initialize()
+            genotypes[i].type = self.gene_type(i)
+            genotypes[i].initialize()
+        self._genotypes = genotypes
 
     @staticmethod
     def genotype_to_phenotype(gene: FloatGenotype, **_) -> FloatPhenotype:
@@ -186,8 +196,8 @@ class CovarianceFloatChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
         return new_gene
 
     @property
-    def genotypes(self) -> List[FloatGenotype]:
-        return self._genotypes
+    def genotypes(self) -> Sequence[FloatGenotype]:
+        return tuple(self._genotypes)
 
     @genotypes.setter
     def genotypes(self, genes: List[FloatGenotype]) -> None:
@@ -200,7 +210,31 @@ class CovarianceFloatChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
                 'Tried to assign genotypes to CovarianceFloatChromosome with wrong number of genes ({}). Expected {}.'
                 .format(len(genes), size))
 
-        self._genotypes = deepcopy(genes)
+        self._adopt_genotypes(genes)
+
+    @property
+    def values(self) -> Sequence[float]:
+        """Value of every variable gene, without step sizes and angles."""
+        n: int = self.custom_data['n']
+        return [gene.data for gene in self._genotypes[:n]]
+
+    @property
+    def gene_values(self) -> Sequence[float]:
+        """Value of every gene: variables, step sizes and angles."""
+        return [gene.data for gene in self._genotypes]
+
+    def set_gene_values(self, values: Sequence[float]) -> None:
+        """Sets the value of every gene at once (variables within bounds,
+        followed by step sizes and angles)."""
+        genes = []
+        for i, value in enumerate(values):
+            gene = FloatGenotype(self.custom_data)
+            gene.type = self.gene_type(i)
+            gene._data = value
+            genes.append(gene)
+
+        self._genotypes = genes
+        self._shared_genes = False
 
     @property
     def phenotypes(self) -> List[FloatPhenotype]:
@@ -219,3 +253,143 @@ class CovarianceFloatChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
 
     def __repr__(self) -> str:
         return self.__str__()
+
+
+class CompactFloatChromosome(CompactChromosome, FloatChromosome):
+    """FloatChromosome that stores every value in a single array('d'). Genes
+    are FloatGenotype views created on demand."""
+    view_cls = FloatGenotypeView
+
+    def initialize(self) -> None:
+        self._initialize_genes(self.custom_data['n'])
+
+    @property
+    def values(self) -> Sequence[float]:
+        # The buffer itself, it must not be changed
+        return self._buffer
+
+
+class CompactAdaptiveStepFloatChromosome(CompactChromosome,
+                                         AdaptiveStepFloatChromosome):
+    """AdaptiveStepFloatChromosome that stores every (value, step size) pair
+    in a single array('d'). Genes are FloatPairGenotype views created on
+    demand."""
+    values_per_gene = 2
+    view_cls = FloatPairGenotypeView
+
+    def initialize(self) -> None:
+        self._initialize_genes(self.custom_data['n'])
+
+    @property
+    def values(self) -> Sequence[float]:
+        return self._buffer[::2]
+
+
+class CompactCovarianceFloatChromosome(CompactChromosome,
+                                       CovarianceFloatChromosome):
+    """CovarianceFloatChromosome that stores every value, step size and angle
+    in a single array('d'). Genes are FloatGenotype views created on demand.
+    """
+    view_cls = FloatGenotypeView
+
+    def _new_view(self, buffer: array, index: int) -> Any:
+        view = super()._new_view(buffer, index)
+        view.type = self.gene_type(index)
+        return view
+
+    def initialize(self) -> None:
+        n: int = self.custom_data['n']
+        k: int = int(n * (n - 1) / 2)
+
+        self._initialize_genes(2 * n + k)
+
+    @property
+    def values(self) -> Sequence[float]:
+        n: int = self.custom_data['n']
+        return self._buffer[:n]
+
+    @property
+    def gene_values(self) -> Sequence[float]:
+        # The buffer itself, it must not be changed
+        return self._buffer
+
+    def set_gene_values(self, values: Sequence[float]) -> None:
+        self._buffer = array(self.typecode, values)
+        self._shared_genes = False
+
+
+class ArrayFloatChromosome(ArrayChromosome):
+    """Array counterpart of FloatChromosome: one row of n variables."""
+    @classmethod
+    def initialize_batch(cls: Type, population_size: int) -> np.ndarray:
+        n: int = cls.custom_data['n']
+        lower_bound: float = cls.custom_data['lower_bound']
+        upper_bound: float = cls.custom_data['upper_bound']
+
+        return get_numpy_random(cls.custom_data).uniform(
+            lower_bound, upper_bound, (population_size, n))
+
+    @classmethod
+    def to_chromosome(cls: Type, row: np.ndarray) -> FloatChromosome:
+        chromosome = FloatChromosome(cls.custom_data)
+        for gene, value in zip(chromosome.writable_genotypes(), row):
+            gene.data = float(value)
+
+        return chromosome
+
+
+class ArrayAdaptiveStepFloatChromosome(ArrayChromosome):
+    """Array counterpart of AdaptiveStepFloatChromosome: n variables followed
+    by their n step sizes."""
+    @classmethod
+    def initialize_batch(cls: Type, population_size: int) -> np.ndarray:
+        n: int = cls.custom_data['n']
+        lower_bound: float = cls.custom_data['lower_bound']
+        upper_bound: float = cls.custom_data['upper_bound']
+        step_size: float = cls.custom_data['step_size']
+
+        genes = np.full((population_size, 2 * n), step_size, dtype=np.float64)
+        genes[:, :n] = get_numpy_random(cls.custom_data).uniform(
+            lower_bound, upper_bound, (population_size, n))
+        return genes
+
+    @classmethod
+    def to_chromosome(cls: Type,
+                      row: np.ndarray) -> AdaptiveStepFloatChromosome:
+        n: int = cls.custom_data['n']
+
+        chromosome = AdaptiveStepFloatChromosome(cls.custom_data)
+        for i, gene in enumerate(chromosome.writable_genotypes()):
+            gene.data = (float(row[i]), float(row[n + i]))
+
+        return chromosome
+
+
+class ArrayCovarianceFloatChromosome(ArrayChromosome):
+    """Array counterpart of CovarianceFloatChromosome: n variables, their n
+    step sizes and the n(n-1)/2 rotation angles."""
+    @classmethod
+    def initialize_batch(cls: Type, population_size: int) -> np.ndarray:
+        n: int = cls.custom_data['n']
+        k: int = int(n * (n - 1) / 2)
+        lower_bound: float = cls.custom_data['lower_bound']
+        upper_bound: float = cls.custom_data['upper_bound']
+        step_size: float = cls.custom_data['step_size']
+        rng = get_numpy_random(cls.custom_data)
+
+        genes = np.full((population_size, 2 * n + k),
+                        step_size,
+                        dtype=np.float64)
+        genes[:, :n] = rng.uniform(lower_bound, upper_bound,
+                                   (population_size, n))
+        genes[:, 2 * n:] = rng.uniform(-pi, pi, (population_size, k))
+        return genes
+
+    @classmethod
+    def to_chromosome(cls: Type,
+                      row: np.ndarray) -> CovarianceFloatChromosome:
+        chromosome = CovarianceFloatChromosome(cls.custom_data)
+        for gene, value in zip(chromosome.writable_genotypes(), row):
+            gene.data = float(value)
+
+        return chromosome
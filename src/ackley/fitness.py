@@ -2,9 +2,12 @@ from typing import Type, List
 from abc import ABC
 from math import cos, exp, sqrt, e
 
+import numpy as np  #type: ignore
+
 from genetic_framework.fitness import FitnessComputer
+from genetic_framework.array_population import ArrayFitnessComputer
 from ackley.chromosomes import FloatChromosome, AdaptiveStepFloatChromosome, CovarianceFloatChromosome
-from ackley.util import ackley_function
+from ackley.util import ackley_function, ackley_function_batch
 
 
 class AckleyFitnessComputer(FitnessComputer[FloatChromosome], ABC):
@@ -13,10 +16,22 @@ class AckleyFitnessComputer(FitnessComputer[FloatChromosome], ABC):
         c1: float = cls.custom_data['c1']
         c2: float = cls.custom_data['c2']
         c3: float = cls.custom_data['c3']
-        data = list(map(lambda gene: gene.data, chromosome.genotypes))
+        data = list(chromosome.values)
 
         return ackley_function(c1, c2, c3, data)
 
+    @classmethod
+    def fitness_batch(cls: Type,
+                      chromosomes: List[FloatChromosome]) -> List[float]:
+        c1: float = cls.custom_data['c1']
+        c2: float = cls.custom_data['c2']
+        c3: float = cls.custom_data['c3']
+        data = np.array([chromosome.values for chromosome in chromosomes])
+
+        fitnesses: List[float] = ackley_function_batch(c1, c2, c3,
+                                                       data).tolist()
+        return fitnesses
+
 
 class AdaptiveStepAckleyFitnessComputer(
         FitnessComputer[AdaptiveStepFloatChromosome], ABC):
@@ -25,19 +40,77 @@ class AdaptiveStepAckleyFitnessComputer(
         c1: float = cls.custom_data['c1']
         c2: float = cls.custom_data['c2']
         c3: float = cls.custom_data['c3']
-        data = list(map(lambda gene: gene.data[0], chromosome.genotypes))
+        data = list(chromosome.values)
 
         return ackley_function(c1, c2, c3, data)
 
+    @classmethod
+    def fitness_batch(
+            cls: Type,
+            chromosomes: List[AdaptiveStepFloatChromosome]) -> List[float]:
+        c1: float = cls.custom_data['c1']
+        c2: float = cls.custom_data['c2']
+        c3: float = cls.custom_data['c3']
+        data = np.array([chromosome.values for chromosome in chromosomes])
+
+        fitnesses: List[float] = ackley_function_batch(c1, c2, c3,
+                                                       data).tolist()
+        return fitnesses
+
 
 class CovarianceAckleyFitnessComputer(
         FitnessComputer[CovarianceFloatChromosome], ABC):
     @classmethod
     def fitness(cls: Type, chromosome: CovarianceFloatChromosome) -> float:
-        n: int = cls.custom_data['n']
         c1: float = cls.custom_data['c1']
         c2: float = cls.custom_data['c2']
         c3: float = cls.custom_data['c3']
-        data = list(map(lambda gene: gene.data, chromosome.genotypes[:n]))
+        data = list(chromosome.values)
 
         return ackley_function(c1, c2, c3, data)
+
+    @classmethod
+    def fitness_batch(
+            cls: Type,
+            chromosomes: List[CovarianceFloatChromosome]) -> List[float]:
+        n: int = cls.custom_data['n']
+        c1: float = cls.custom_data['c1']
+        c2: float = cls.custom_data['c2']
+        c3: float = cls.custom_data['c3']
+        data = np.array([chromosome.values for chromosome in chromosomes])
+
+        fitnesses: List[float] = ackley_function_batch(c1, c2, c3,
+                                                       data).tolist()
+        return fitnesses
+
+
+class ArrayAckleyFitnessComputer(ArrayFitnessComputer):
+    @classmethod
+    def fitness_batch(cls: Type, genes: np.ndarray) -> np.ndarray:
+        c1: float = cls.custom_data['c1']
+        c2: float = cls.custom_data['c2']
+        c3: float = cls.custom_data['c3']
+
+        return ackley_function_batch(c1, c2, c3, genes)
+
+
+class ArrayAdaptiveStepAckleyFitnessComputer(ArrayFitnessComputer):
+    @classmethod
+    def fitness_batch(cls: Type, genes: np.ndarray) -> np.ndarray:
+        n: int = cls.custom_data['n']
+        c1: float = cls.custom_data['c1']
+        c2: float = cls.custom_data['c2']
+        c3: float = cls.custom_data['c3']
+
+        return ackley_function_batch(c1, c2, c3, genes[:, :n])
+
+
+class ArrayCovarianceAckleyFitnessComputer(ArrayFitnessComputer):
+    @classmethod
+    def fitness_batch(cls: Type, genes: np.ndarray) -> np.ndarray:
+        n: int = cls.custom_data['n']
+        c1: float = cls.custom_data['c1']
+        c2: float = cls.custom_data['c2']
+        c3: float = cls.custom_data['c3']
+
+        return ackley_function_batch(c1, c2, c3, genes[:, :n])
@@ -1,8 +1,9 @@
 from typing import Dict, Tuple
-from random import uniform
 from math import pi
 
 from genetic_framework.chromosome import Genotype
+from genetic_framework.compact import GeneView
+from genetic_framework.randomness import get_random
 from ackley.util import DataType
 
 
@@ -16,13 +17,14 @@ class FloatGenotype(Genotype[float]):
         lower_bound: float = self.custom_data['lower_bound']
         upper_bound: float = self.custom_data['upper_bound']
         step_size: float = self.custom_data['step_size']
+        rng = get_random(self.custom_data)
 
         if self.type == DataType.VARIABLE:
-            self._data = uniform(lower_bound, upper_bound)
+            self._data = rng.uniform(lower_bound, upper_bound)
         elif self.type == DataType.STEP_SIZE:
             self._data = step_size
         else:
-            self._data = uniform(-pi, pi)
+            self._data = rng.uniform(-pi, pi)
 
     @property
     def data(self) -> float:
@@ -57,7 +59,8 @@ class FloatPairGenotype(Genotype[Tuple[float, float]]):
         lower_bound: float = self.custom_data['lower_bound']
         upper_bound: float = self.custom_data['upper_bound']
         delta: float = self.custom_data['step_size']
-        x: float = uniform(lower_bound, upper_bound)
+        x: float = get_random(self.custom_data).uniform(
+            lower_bound, upper_bound)
         self._data = (x, delta)
 
     @property
@@ -81,3 +84,23 @@ class FloatPairGenotype(Genotype[Tuple[float, float]]):
 
     def __repr__(self) -> str:
         return self.__str__()
+
+
+class FloatGenotypeView(GeneView, FloatGenotype):
+    """FloatGenotype viewing a value stored in a CompactChromosome buffer."""
+    # Overridden per view by chromosomes with genes of several types
+    type = DataType.VARIABLE
+
+
+class FloatPairGenotypeView(GeneView, FloatPairGenotype):
+    """FloatPairGenotype viewing the (value, step size) pair stored at
+    positions 2 * index and 2 * index + 1 of a CompactChromosome buffer."""
+    @property
+    def _data(self) -> Tuple[float, float]:
+        i = 2 * self._index
+        return (self._buffer[i], self._buffer[i + 1])
+
+    @_data.setter
+    def _data(self, value: Tuple[float, float]) -> None:
+        i = 2 * self._index
+        self._buffer[i], self._buffer[i + 1] = value
@@ -1,53 +1,66 @@
-from random import gauss
 from abc import ABC
-from typing import Type
+from typing import Any, Dict, Optional, Tuple, Type
 from math import sqrt, exp, radians, tan, pi
-from numpy.random import multivariate_normal  #type: ignore
 import numpy as np  #type: ignore
 
 from genetic_framework.mutator import Mutator
+from genetic_framework.randomness import get_random, get_numpy_random
+from genetic_framework.custom_data import get_operator_state
+from genetic_framework.operator_fitness import operator_fitness, operator_fitness_batch
 from genetic_framework.fitness import FitnessComputer
+from genetic_framework.array_population import ArrayMutator, ArrayFitnessComputer
 from ackley.chromosomes import FloatChromosome, AdaptiveStepFloatChromosome, CovarianceFloatChromosome
-from ackley.util import clamp, sign, assembly_covariance_matrix, lerp, compute_learning_rate
+from ackley.util import clamp, correlated_offsets, lerp, compute_learning_rate
+
+
+def _step_state(cls: Type) -> Dict[str, Any]:
+    """Step size adapted by the 1/5 success rule of cls, and the mutations it
+    is based on, for the experiment of cls.custom_data."""
+    return get_operator_state(cls.custom_data,
+                              cls,
+                              total_mutations=0,
+                              successful_mutations=0,
+                              current_step_size=cls.custom_data['step_size'])
+
+
+def _adapt_step_size(cls: Type, state: Dict[str, Any]) -> None:
+    if 5 * state['successful_mutations'] > state['total_mutations']:
+        state['current_step_size'] *= cls.step_multiplier
+    elif 5 * state['successful_mutations'] < state['total_mutations']:
+        state['current_step_size'] /= cls.step_multiplier
 
 
 class DeltaMutator(Mutator[FloatChromosome], ABC):
     step_multiplier = 0.99
-    total_mutations: int = 0
-    successful_mutations: int = 0
-    current_step_size: float = 0
+    uses_fitness = True
 
     @classmethod
     def mutate_inplace(cls: Type, chromosome: FloatChromosome) -> None:
-        # Initialize step_size
-        if (cls.current_step_size == 0):
-            cls.current_step_size = cls.custom_data['step_size']
-
+        state = _step_state(cls)
         lower_bound: float = cls.custom_data['lower_bound']
         upper_bound: float = cls.custom_data['upper_bound']
         fitness_computer: Type[FitnessComputer] = cls.custom_data[
             'fitness_computer']
+        rng = get_random(cls.custom_data)
 
-        old_fitness: float = fitness_computer.fitness(chromosome)
-        cls.total_mutations += 1
+        old_fitness = operator_fitness(cls.custom_data, fitness_computer,
+                                       chromosome)
+        state['total_mutations'] += 1
+        _adapt_step_size(cls, state)
 
-        if 5 * cls.successful_mutations > cls.total_mutations:
-            cls.current_step_size *= cls.step_multiplier
-        elif 5 * cls.successful_mutations < cls.total_mutations:
-            cls.current_step_size /= cls.step_multiplier
-
-        for gene in chromosome.genotypes:
-            delta = gauss(0, cls.current_step_size)
+        for gene in chromosome.writable_genotypes():
+            delta = rng.gauss(0, state['current_step_size'])
             new_val = gene.data + delta
 
             # Avoid moving gene data outside boundaries
             new_val = clamp(new_val, lower_bound, upper_bound)
             gene.data = new_val
 
-        new_fitness: float = fitness_computer.fitness(chromosome)
+        new_fitness = operator_fitness(cls.custom_data, fitness_computer,
+                                       chromosome)
 
         if (new_fitness > old_fitness):
-            cls.successful_mutations += 1
+            state['successful_mutations'] += 1
 
 
 class AdaptiveStepMutator(Mutator[AdaptiveStepFloatChromosome], ABC):
@@ -59,36 +72,62 @@ class AdaptiveStepMutator(Mutator[AdaptiveStepFloatChromosome], ABC):
         n: int = cls.custom_data['n']
         lr_multiplier: float = cls.custom_data['learning_rate_multiplier']
         lr = compute_learning_rate(n, lr_multiplier)
+        rng = get_random(cls.custom_data)
 
-        for gene in chromosome.genotypes:
-            new_delta = gene.data[1] * exp(lr * gauss(0, 1))
-            new_value = gene.data[0] + new_delta * gauss(0, 1)
+        for gene in chromosome.writable_genotypes():
+            new_delta = gene.data[1] * exp(lr * rng.gauss(0, 1))
+            new_value = gene.data[0] + new_delta * rng.gauss(0, 1)
             new_value = clamp(new_value, lower_bound, upper_bound)
             gene.data = (new_value, new_delta)
 
 
 class AdaptiveFitnessStepMutator(Mutator[AdaptiveStepFloatChromosome], ABC):
+    uses_fitness = True
+
     @classmethod
     def mutate_inplace(cls: Type,
                        chromosome: AdaptiveStepFloatChromosome) -> None:
         lower_bound: float = cls.custom_data['lower_bound']
         upper_bound: float = cls.custom_data['upper_bound']
         fitness_multiplier: float = cls.custom_data['mutator_fitness_scale']
-        fitness_computer_cls: FitnessComputer = cls.custom_data[
+        fitness_computer_cls: Type[FitnessComputer] = cls.custom_data[
             'fitness_computer']
         n: int = cls.custom_data['n']
         lr_multiplier: float = cls.custom_data['learning_rate_multiplier']
         lr = compute_learning_rate(n, lr_multiplier)
+        rng = get_random(cls.custom_data)
 
-        fitness = fitness_computer_cls.fitness(chromosome)
+        fitness = operator_fitness(cls.custom_data, fitness_computer_cls,
+                                   chromosome)
 
-        for gene in chromosome.genotypes:
+        for gene in chromosome.writable_genotypes():
             new_delta = lerp(lr, fitness * fitness_multiplier, gene.data[1])
-            new_value = gene.data[0] + new_delta * gauss(0, 1)
+            new_value = gene.data[0] + new_delta * rng.gauss(0, 1)
             new_value = clamp(new_value, lower_bound, upper_bound)
             gene.data = (new_value, new_delta)
 
 
+def _covariance_mutation(custom_data: Dict, lr: float,
+                         genes: np.ndarray) -> np.ndarray:
+    """Correlated mutation of rows of genes (n variables, their n step sizes
+    and their n(n-1)/2 rotation angles): step sizes and angles are mutated
+    first, and then give the offsets of the variables."""
+    n: int = custom_data['n']
+    lower_bound: float = custom_data['lower_bound']
+    upper_bound: float = custom_data['upper_bound']
+    rng = get_numpy_random(custom_data)
+
+    values, step_sizes, angles = np.split(genes, [n, 2 * n], axis=1)
+    new_step_sizes = step_sizes * np.exp(
+        lr * rng.standard_normal(step_sizes.shape))
+    new_angles = angles + radians(5) * rng.standard_normal(angles.shape)
+    new_angles -= 2 * pi * np.sign(new_angles) * (np.abs(new_angles) > pi)
+
+    new_values = values + correlated_offsets(rng, new_step_sizes, new_angles)
+    return np.hstack((np.clip(new_values, lower_bound,
+                              upper_bound), new_step_sizes, new_angles))
+
+
 class CovarianceMutator(Mutator[CovarianceFloatChromosome], ABC):
     @classmethod
     def learning_rate(cls: Type) -> float:
@@ -99,29 +138,76 @@ class CovarianceMutator(Mutator[CovarianceFloatChromosome], ABC):
     @classmethod
     def mutate_inplace(cls: Type,
                        chromosome: CovarianceFloatChromosome) -> None:
-        n: int = cls.custom_data['n']
+        genes = np.array([chromosome.gene_values])
+        new_genes = _covariance_mutation(cls.custom_data, cls.learning_rate(),
+                                         genes)
+        chromosome.set_gene_values(new_genes[0].tolist())
+
+
+class ArrayDeltaMutator(ArrayMutator):
+    """Array counterpart of DeltaMutator. The step size follows the same 1/5
+    success rule, adapted once per batch."""
+    step_multiplier = 0.99
+
+    @classmethod
+    def mutate_batch(
+            cls: Type, genes: np.ndarray,
+            fitness: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        state = _step_state(cls)
+        lower_bound: float = cls.custom_data['lower_bound']
+        upper_bound: float = cls.custom_data['upper_bound']
+        fitness_computer: Type[ArrayFitnessComputer] = cls.custom_data[
+            'array_fitness_computer']
+
+        old_fitness = operator_fitness_batch(cls.custom_data, fitness_computer,
+                                             genes, fitness)
+        state['total_mutations'] += len(genes)
+        _adapt_step_size(cls, state)
+
+        deltas = get_numpy_random(cls.custom_data).normal(
+            0, state['current_step_size'], genes.shape)
+        # Avoid moving gene data outside boundaries
+        new_genes = np.clip(genes + deltas, lower_bound, upper_bound)
+
+        new_fitness = operator_fitness_batch(cls.custom_data, fitness_computer,
+                                             new_genes)
+        state['successful_mutations'] += int(
+            np.count_nonzero(new_fitness > old_fitness))
+
+        return new_genes, new_fitness
+
+
+class ArrayAdaptiveStepMutator(ArrayMutator):
+    """Array counterpart of AdaptiveStepMutator."""
+    @classmethod
+    def mutate_batch(
+            cls: Type, genes: np.ndarray,
+            fitness: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
         lower_bound: float = cls.custom_data['lower_bound']
         upper_bound: float = cls.custom_data['upper_bound']
-        lr = cls.learning_rate()
-
-        variables = chromosome.genotypes[:n]
-        step_sizes = chromosome.genotypes[n:(2 * n)]
-        rotation_angles = chromosome.genotypes[(2 * n):]
-
-        for gene in step_sizes:
-            gene.data = gene.data * exp(lr * gauss(0, 1))
-
-        for gene in rotation_angles:
-            gene.data = gene.data + radians(5) * gauss(0, 1)
-            if gene.data > pi:
-                gene.data = gene.data - 2 * pi * sign(gene.data)
-
-        step_floats = list(map(lambda gene: gene.data, step_sizes))
-        angle_floats = list(map(lambda gene: gene.data, rotation_angles))
-        covariance_matrix = assembly_covariance_matrix(step_floats,
-                                                       angle_floats)
-        means = np.zeros((n))
-        offsets = multivariate_normal(means, covariance_matrix)
-        for i in range(n):
-            new_value = variables[i].data + offsets[i]
-            variables[i].data = clamp(new_value, lower_bound, upper_bound)
+        n: int = cls.custom_data['n']
+        lr_multiplier: float = cls.custom_data['learning_rate_multiplier']
+        lr = compute_learning_rate(n, lr_multiplier)
+
+        rng = get_numpy_random(cls.custom_data)
+
+        values, deltas = genes[:, :n], genes[:, n:]
+        new_deltas = deltas * np.exp(lr * rng.standard_normal(deltas.shape))
+        new_values = values + new_deltas * rng.standard_normal(values.shape)
+
+        return np.hstack((np.clip(new_values, lower_bound,
+                                  upper_bound), new_deltas)), None
+
+
+class ArrayCovarianceMutator(ArrayMutator):
+    """Array counterpart of CovarianceMutator."""
+    @classmethod
+    def mutate_batch(
+            cls: Type, genes: np.ndarray,
+            fitness: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        n: int = cls.custom_data['n']
+        lr_multiplier: float = cls.custom_data['learning_rate_multiplier']
+
+        return _covariance_mutation(cls.custom_data,
+                                    compute_learning_rate(n, lr_multiplier),
+                                    genes), None
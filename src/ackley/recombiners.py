@@ -1,10 +1,13 @@
 from abc import ABC
 from typing import Type
-from random import gauss
 from math import sqrt
+import numpy as np  #type: ignore
 
 from genetic_framework.fitness import FitnessComputer
 from genetic_framework.recombiner import Recombiner
+from genetic_framework.randomness import get_random, get_numpy_random
+from genetic_framework.operator_fitness import operator_fitness
+from genetic_framework.array_population import ArrayRecombiner
 from ackley.chromosomes import FloatChromosome, AdaptiveStepFloatChromosome, CovarianceFloatChromosome
 from ackley.util import lerp, clamp
 
@@ -13,8 +16,8 @@ class MidPointRecombiner(Recombiner[FloatChromosome], ABC):
     @classmethod
     def recombine(cls: Type, chromosome1: FloatChromosome,
                   chromosome2: FloatChromosome) -> FloatChromosome:
-        new_chromosome = FloatChromosome(chromosome1.custom_data)
-        new_genes = new_chromosome.genotypes
+        new_chromosome = type(chromosome1)(chromosome1.custom_data)
+        new_genes = new_chromosome.writable_genotypes()
         genes1 = chromosome1.genotypes
         genes2 = chromosome2.genotypes
 
@@ -27,6 +30,8 @@ class MidPointRecombiner(Recombiner[FloatChromosome], ABC):
 
 class AdaptiveStepMidPointRecombiner(Recombiner[AdaptiveStepFloatChromosome],
                                      ABC):
+    uses_fitness = True
+
     @classmethod
     def recombine(
         cls: Type, chromosome1: AdaptiveStepFloatChromosome,
@@ -37,15 +42,17 @@ class AdaptiveStepMidPointRecombiner(Recombiner[AdaptiveStepFloatChromosome],
         fitness_computer_cls: Type[FitnessComputer] = cls.custom_data[
             'fitness_computer']
 
-        new_chromosome = AdaptiveStepFloatChromosome(chromosome1.custom_data)
-        new_genes = new_chromosome.genotypes
+        new_chromosome = type(chromosome1)(chromosome1.custom_data)
+        new_genes = new_chromosome.writable_genotypes()
         genes1 = chromosome1.genotypes
         genes2 = chromosome2.genotypes
-        fitness1, fitness2 = fitness_computer_cls.fitness(
-            chromosome1), fitness_computer_cls.fitness(chromosome2)
+        fitness1 = operator_fitness(cls.custom_data, fitness_computer_cls,
+                                    chromosome1)
+        fitness2 = operator_fitness(cls.custom_data, fitness_computer_cls,
+                                    chromosome2)
 
         t = fitness1 / (fitness1 + fitness2)
-        t += gauss(0, .1)
+        t += get_random(cls.custom_data).gauss(0, .1)
         t = clamp(t, 0, 1)
         for i in range(len(new_genes)):
             new_value = lerp(t, genes1[i].data[0], genes2[i].data[0])
@@ -60,6 +67,8 @@ class AdaptiveStepMidPointRecombiner(Recombiner[AdaptiveStepFloatChromosome],
 
 
 class CovarianceMidPointRecombiner(Recombiner[CovarianceFloatChromosome], ABC):
+    uses_fitness = True
+
     @classmethod
     def recombine(
             cls: Type, chromosome1: CovarianceFloatChromosome,
@@ -70,18 +79,61 @@ class CovarianceMidPointRecombiner(Recombiner[CovarianceFloatChromosome], ABC):
         fitness_computer_cls: Type[FitnessComputer] = cls.custom_data[
             'fitness_computer']
 
-        new_chromosome = CovarianceFloatChromosome(chromosome1.custom_data)
-        new_genes = new_chromosome.genotypes
+        new_chromosome = type(chromosome1)(chromosome1.custom_data)
+        new_genes = new_chromosome.writable_genotypes()
         genes1 = chromosome1.genotypes
         genes2 = chromosome2.genotypes
-        fitness1, fitness2 = fitness_computer_cls.fitness(
-            chromosome1), fitness_computer_cls.fitness(chromosome2)
+        fitness1 = operator_fitness(cls.custom_data, fitness_computer_cls,
+                                    chromosome1)
+        fitness2 = operator_fitness(cls.custom_data, fitness_computer_cls,
+                                    chromosome2)
 
         t = fitness1 / (fitness1 + fitness2)
-        t += gauss(0, 0.1)
+        t += get_random(cls.custom_data).gauss(0, 0.1)
         t = clamp(t, 0, 1)
         for i in range(len(new_genes)):
             new_genes[i].data = lerp(t, genes1[i].data, genes2[i].data)
 
         new_chromosome.genotypes = new_genes
         return new_chromosome
+
+
+class ArrayMidPointRecombiner(ArrayRecombiner):
+    """Array counterpart of MidPointRecombiner."""
+    @classmethod
+    def recombine_batch(cls: Type, genes1: np.ndarray, genes2: np.ndarray,
+                        fitness1: np.ndarray,
+                        fitness2: np.ndarray) -> np.ndarray:
+        return (genes1 + genes2) / 2
+
+
+class ArrayAdaptiveStepMidPointRecombiner(ArrayRecombiner):
+    """Array counterpart of AdaptiveStepMidPointRecombiner."""
+    @classmethod
+    def recombine_batch(cls: Type, genes1: np.ndarray, genes2: np.ndarray,
+                        fitness1: np.ndarray,
+                        fitness2: np.ndarray) -> np.ndarray:
+        n: int = cls.custom_data['n']
+        lower_bound: float = cls.custom_data['lower_bound']
+        upper_bound: float = cls.custom_data['upper_bound']
+
+        t = fitness1 / (fitness1 + fitness2)
+        t += get_numpy_random(cls.custom_data).normal(0, .1, t.shape)
+        t = np.clip(t, 0, 1)[:, np.newaxis]
+
+        new_genes = t * genes1 + (1 - t) * genes2
+        new_genes[:, :n] = np.clip(new_genes[:, :n], lower_bound, upper_bound)
+        return new_genes
+
+
+class ArrayCovarianceMidPointRecombiner(ArrayRecombiner):
+    """Array counterpart of CovarianceMidPointRecombiner."""
+    @classmethod
+    def recombine_batch(cls: Type, genes1: np.ndarray, genes2: np.ndarray,
+                        fitness1: np.ndarray,
+                        fitness2: np.ndarray) -> np.ndarray:
+        t = fitness1 / (fitness1 + fitness2)
+        t += get_numpy_random(cls.custom_data).normal(0, .1, t.shape)
+        t = np.clip(t, 0, 1)[:, np.newaxis]
+
+        return t * genes1 + (1 - t) * genes2
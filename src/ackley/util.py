@@ -1,8 +1,8 @@
-from random import random
+from random import Random
 from enum import Enum
-from typing import List
-from math import sqrt, exp, radians, tan, pi, cos, e
-from functools import reduce
+from typing import List, Tuple, Union, overload
+from math import sqrt, exp, radians, pi, cos, e
+from functools import reduce, lru_cache
 import numpy as np  #type: ignore
 
 
@@ -12,8 +12,8 @@ class DataType(Enum):
     ROTATION_ANGLE = 2
 
 
-def random_lerp(v1: float, v2: float) -> float:
-    return lerp(random(), v1, v2)
+def random_lerp(rng: Random, v1: float, v2: float) -> float:
+    return lerp(rng.random(), v1, v2)
 
 
 def lerp(t: float, v1: float, v2: float) -> float:
@@ -28,23 +28,75 @@ def sign(x: float):
     return 1 if x >= 0 else -1
 
 
-def assembly_covariance_matrix(step_sizes: List[float],
-                               rotation_angles: List[float]):
-    n: int = len(step_sizes)
-    covariance_matrix = np.zeros((n, n))
-
-    k = 0
-    for i in range(n):
-        for j in range(i, n):
-            if i == j:
-                covariance_matrix[i][j] = pow(step_sizes[i], 2)
-            else:
-                value = 0.5 * pow(step_sizes[i] - step_sizes[j], 2) * tan(
-                    2 * rotation_angles[k])
-                covariance_matrix[i][j] = covariance_matrix[j][i] = value
-                k += 1
-
-    return covariance_matrix
+@overload
+def angle_index(n: int, i: int, j: int) -> int:
+    ...
+
+
+@overload
+def angle_index(n: int, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    ...
+
+
+def angle_index(n: int, i: Union[int, np.ndarray],
+                j: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+    """Index of the rotation angle of variables i < j, among the n(n-1)/2
+    angles of n variables (sorted by i, then j). i and j may be arrays of
+    pairs, which give an array of indexes."""
+    return i * (2 * n - i - 1) // 2 + j - i - 1
+
+
+@lru_cache(maxsize=None)
+def rotation_layers(
+        n: int) -> Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray], ...]:
+    """Every pair of n variables, split into layers of disjoint pairs (round
+    robin schedule), so the rotations of a layer can be applied at once. Each
+    layer has the arrays of i, j and angle index of its pairs, read only as
+    they are shared by every caller."""
+    # Odd n is completed with a variable whose pairs are skipped
+    players = list(range(n + n % 2))
+    layers = []
+    for _ in range(len(players) - 1):
+        pairs = []
+        for p in range(len(players) // 2):
+            i, j = sorted((players[p], players[-1 - p]))
+            if j < n:
+                pairs.append((i, j))
+
+        if len(pairs) > 0:
+            rows_i, rows_j = np.array(pairs).T
+            layer = (rows_i, rows_j, angle_index(n, rows_i, rows_j))
+            for rows in layer:
+                rows.setflags(write=False)
+            layers.append(layer)
+        players = [players[0], players[-1]] + players[1:-1]
+
+    return tuple(layers)
+
+
+def rotate(offsets: np.ndarray, rotation_angles: np.ndarray) -> np.ndarray:
+    """Rotates each row of offsets (n variables) by the product of the Givens
+    rotations of every pair of variables, with the angles (n(n-1)/2, see
+    angle_index) in the same row of rotation_angles. That correlates
+    uncorrelated offsets without building (or factoring) a covariance matrix,
+    in n - 1 vectorized steps."""
+    offsets = np.array(offsets, dtype=np.float64)
+    cosines, sines = np.cos(rotation_angles), np.sin(rotation_angles)
+    for i, j, k in rotation_layers(offsets.shape[1]):
+        offsets_i, offsets_j = offsets[:, i], offsets[:, j]
+        cos_k, sin_k = cosines[:, k], sines[:, k]
+        offsets[:, i] = offsets_i * cos_k - offsets_j * sin_k
+        offsets[:, j] = offsets_i * sin_k + offsets_j * cos_k
+
+    return offsets
+
+
+def correlated_offsets(rng: np.random.Generator, step_sizes: np.ndarray,
+                       rotation_angles: np.ndarray) -> np.ndarray:
+    """Correlated mutation offsets: normal offsets with deviations step_sizes,
+    rotated by rotation_angles. One row per chromosome."""
+    return rotate(step_sizes * rng.standard_normal(step_sizes.shape),
+                  rotation_angles)
 
 
 def ackley_function(c1: float, c2: float, c3: float,
@@ -61,5 +113,17 @@ def ackley_function(c1: float, c2: float, c3: float,
     return result
 
 
+def ackley_function_batch(c1: float, c2: float, c3: float,
+                          data: np.ndarray) -> np.ndarray:
+    """Same as ackley_function, computed for every row of data at once."""
+    n: int = data.shape[1]
+
+    squares = np.einsum('ij,ij->i', data, data)
+    second_sum = np.cos(c3 * data).sum(axis=1)
+
+    return c1 + e - c1 * np.exp(-c2 * sqrt(1.0 / n) * squares) - np.exp(
+        second_sum / n)
+
+
 def compute_learning_rate(n: int, lr_multiplier: float) -> float:
     return lr_multiplier / sqrt(n)
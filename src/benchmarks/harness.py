@@ -0,0 +1,132 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from time import perf_counter, strftime
+from statistics import mean
+from os.path import exists
+import json
+import platform
+
+
+class BenchmarkResult:
+    """Times of each repeat of a benchmark that runs items operations (such as
+    operator calls or generations) at a time."""
+    def __init__(self, name: str, population_size: int, dimension: int,
+                 items: int, times: List[float]) -> None:
+        self.name = name
+        self.population_size = population_size
+        self.dimension = dimension
+        self.items = items
+        self.times = times
+
+    @property
+    def key(self) -> str:
+        """Identifies the benchmark among runs."""
+        return '{}[population_size={},dimension={}]'.format(
+            self.name, self.population_size, self.dimension)
+
+    @property
+    def best(self) -> float:
+        """Seconds per item of the fastest repeat, the least noisy measure."""
+        return min(self.times) / self.items
+
+    @property
+    def average(self) -> float:
+        """Mean seconds per item among repeats."""
+        return mean(self.times) / self.items
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(name=self.name,
+                    population_size=self.population_size,
+                    dimension=self.dimension,
+                    items=self.items,
+                    times=self.times,
+                    best=self.best,
+                    average=self.average)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BenchmarkResult':
+        return cls(data['name'], data['population_size'], data['dimension'],
+                   data['items'], data['times'])
+
+    def __str__(self) -> str:
+        return '{}: {:.3f} us best, {:.3f} us average per item'.format(
+            self.key, self.best * 1e6, self.average * 1e6)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def time_benchmark(setup: Callable[[], Any], run: Callable[[Any], Any],
+                   repeat: int) -> List[float]:
+    """Returns the seconds run takes over what setup returns, once per repeat.
+    setup runs again before each repeat and is not timed."""
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = perf_counter()
+        run(state)
+        times.append(perf_counter() - start)
+
+    return times
+
+
+def results_document(results: List[BenchmarkResult]) -> Dict[str, Any]:
+    """Machine readable description of a benchmark run."""
+    return dict(created=strftime('%Y-%m-%dT%H:%M:%S'),
+                python=platform.python_version(),
+                platform=platform.platform(),
+                results=[result.to_dict() for result in results])
+
+
+def save_results(results: List[BenchmarkResult], path: str) -> None:
+    with open(path, 'w') as results_file:
+        json.dump(results_document(results), results_file, indent=2)
+
+
+def append_history(results: List[BenchmarkResult], path: str) -> None:
+    """Appends results as a line of the JSON lines file at path."""
+    with open(path, 'a') as history_file:
+        history_file.write(json.dumps(results_document(results)) + '\n')
+
+
+def _from_document(document: Dict[str, Any]) -> Dict[str, BenchmarkResult]:
+    results = [
+        BenchmarkResult.from_dict(data) for data in document['results']
+    ]
+    return {result.key: result for result in results}
+
+
+def load_results(path: str) -> Dict[str, BenchmarkResult]:
+    """Results saved by save_results, by key."""
+    with open(path) as results_file:
+        return _from_document(json.load(results_file))
+
+
+def load_last_history(path: str) -> Optional[Dict[str, BenchmarkResult]]:
+    """Results of the last run appended by append_history, by key. None when
+    there is no history yet."""
+    if not exists(path):
+        return None
+
+    with open(path) as history_file:
+        lines = [line for line in history_file if line.strip()]
+
+    return _from_document(json.loads(lines[-1])) if lines else None
+
+
+def compare_results(
+    results: List[BenchmarkResult], baseline: Dict[str, BenchmarkResult],
+    tolerance: float
+) -> List[Tuple[BenchmarkResult, BenchmarkResult, float]]:
+    """Returns (result, baseline result, ratio of best times) for every result
+    slower than its baseline by more than tolerance (0.25 for 25%)."""
+    regressions = []
+    for result in results:
+        baseline_result = baseline.get(result.key)
+        if baseline_result is None or baseline_result.best == 0:
+            continue
+
+        ratio = result.best / baseline_result.best
+        if ratio > 1 + tolerance:
+            regressions.append((result, baseline_result, ratio))
+
+    return regressions
@@ -0,0 +1,261 @@
+from typing import Any, Callable, Dict, List, Optional, Type
+from types import ModuleType
+from enum import Enum
+
+import run_eight_queen
+import run_ackley
+import run_function_min
+from genetic_framework.chromosome import Chromosome
+from genetic_framework.experiment import Experiment, is_correct_chromosome_type
+from genetic_framework.individual import Individual
+from genetic_framework.randomness import RandomContext, RANDOM_CONTEXT
+from benchmarks.harness import BenchmarkResult, time_benchmark
+
+
+class Problem:
+    """A problem whose classes are registered in the Enums of its runner
+    module. dimension_arg is the CLI argument holding the number of genes.
+
+    Operators are timed on chromosomes of every class they work with, with
+    the runner's default arguments for everything but the population size and
+    dimension.
+    """
+    def __init__(self, name: str, runner: ModuleType, dimension_arg: str,
+                 maximize_fitness: bool) -> None:
+        self.name = name
+        self.runner = runner
+        self.dimension_arg = dimension_arg
+        self.maximize_fitness = maximize_fitness
+
+    def arguments(self, population_size: int, dimension: int) -> Dict:
+        """CLI arguments (runner's defaults) of an experiment."""
+        arguments = {
+            arg.full_name[2:]: arg.default_value
+            for arg in self.runner.ARGS
+        }
+        arguments.update({
+            'population_size': population_size,
+            self.dimension_arg: dimension,
+            # Some mating selectors pick each parent once at most
+            'num_parent_pairs': min(arguments['num_parent_pairs'],
+                                    population_size // 2),
+            'seed': 0,
+        })
+        return arguments
+
+    def members(self, enum_name: str) -> List[Enum]:
+        return list(getattr(self.runner, enum_name, []))
+
+    def fitness_computer_for(self, chromosome_cls: Type[Chromosome]) -> Type:
+        fitness_computer_cls: Type = next(
+            member.value for member in self.members('FitnessComputerEnum')
+            if is_correct_chromosome_type(member.value, chromosome_cls))
+        return fitness_computer_cls
+
+
+PROBLEMS = [
+    Problem('eight_queens', run_eight_queen, 'chess_size', True),
+    Problem('ackley', run_ackley, 'n', False),
+    Problem('function_min', run_function_min, 'vector_size', True),
+]
+
+
+class ProblemBenchmark:
+    """Times every registered class of problem, population_size chromosomes
+    (or individuals) of dimension genes at a time. Benchmarks that don't
+    support the problem (TypeError or ValueError, such as a chromosome an
+    operator can't handle) are reported in skipped, and any other failure in
+    errors, instead of results."""
+    def __init__(self, problem: Problem, population_size: int, dimension: int,
+                 repeat: int, generations: int) -> None:
+        self.problem = problem
+        self.population_size = population_size
+        self.dimension = dimension
+        self.repeat = repeat
+        self.generations = generations
+        self.arguments = problem.arguments(population_size, dimension)
+        self.results: List[BenchmarkResult] = []
+        self.skipped: List[str] = []
+        self.errors: List[str] = []
+
+    def custom_data(self, fitness_computer_cls: Optional[Type] = None) -> Dict:
+        """custom_data for operator classes, with a seeded RandomContext and
+        fitness_computer_cls as the fitness computer operators may use."""
+        custom_data: Dict = self.problem.runner.new_custom_data(self.arguments)
+        custom_data[RANDOM_CONTEXT] = RandomContext(0)
+        custom_data['fitness_computer'] = fitness_computer_cls \
+            or self.arguments['fitness_computer']
+        return custom_data
+
+    def _time(self, name: str, setup: Callable[[], Any],
+              run: Callable[[Any], Any], items: int) -> None:
+        """Internal method that times run over what setup returns, items
+        operations at a time."""
+        name = '{}/{}'.format(self.problem.name, name)
+        try:
+            times = time_benchmark(setup, run, self.repeat)
+        except (TypeError, ValueError) as error:
+            self.skipped.append('{}: {}: {}'.format(name,
+                                                    type(error).__name__,
+                                                    error))
+            return
+        except Exception as error:
+            self.errors.append('{}: {}: {}'.format(name,
+                                                   type(error).__name__,
+                                                   error))
+            return
+
+        self.results.append(
+            BenchmarkResult(name, self.population_size, self.dimension, items,
+                            times))
+
+    def _chromosomes(self, chromosome_cls: Type[Chromosome],
+                     custom_data: Dict) -> List[Chromosome]:
+        chromosomes = []
+        for _ in range(self.population_size):
+            chromosome = chromosome_cls(custom_data)
+            chromosome.initialize()
+            chromosomes.append(chromosome)
+
+        return chromosomes
+
+    def _individuals(self, custom_data: Dict) -> List[Individual]:
+        """Evaluated individuals of the default classes of the problem."""
+        individuals = [
+            Individual(self.arguments['chromosome'],
+                       self.arguments['fitness_computer'],
+                       self.arguments['mutator'], self.arguments['recombiner'],
+                       1, custom_data).initialize()
+            for _ in range(self.population_size)
+        ]
+        for individual in individuals:
+            individual.fitness()
+
+        return individuals
+
+    def time_chromosomes(self) -> None:
+        for chromosome in self.problem.members('ChromosomeEnum'):
+            custom_data = self.custom_data()
+
+            def initialize(_: None,
+                           chromosome_cls: Type = chromosome.value,
+                           custom_data: Dict = custom_data) -> None:
+                self._chromosomes(chromosome_cls, custom_data)
+
+            self._time('chromosome/{}'.format(chromosome.name), lambda: None,
+                       initialize, self.population_size)
+
+    def _time_operators(self, kind: str, enum_name: str,
+                        run: Callable[[Type, List[Chromosome]], Any]) -> None:
+        """Internal method that times run(operator class, chromosomes) for
+        every operator of enum_name and every chromosome it works with."""
+        for operator in self.problem.members(enum_name):
+            for chromosome in self.problem.members('ChromosomeEnum'):
+                if not is_correct_chromosome_type(operator.value,
+                                                  chromosome.value):
+                    continue
+
+                custom_data = self.custom_data(
+                    self.problem.fitness_computer_for(chromosome.value))
+                operator.value.set_custom_data(custom_data)
+                custom_data['fitness_computer'].set_custom_data(custom_data)
+
+                def setup(chromosome_cls: Type = chromosome.value,
+                          custom_data: Dict = custom_data) -> List[Chromosome]:
+                    return self._chromosomes(chromosome_cls, custom_data)
+
+                def run_operator(chromosomes: List[Chromosome],
+                                 operator_cls: Type = operator.value) -> None:
+                    run(operator_cls, chromosomes)
+
+                self._time(
+                    '{}/{}[{}]'.format(kind, operator.name, chromosome.name),
+                    setup, run_operator, self.population_size)
+
+    def time_fitness_computers(self) -> None:
+        self._time_operators(
+            'fitness_computer', 'FitnessComputerEnum',
+            lambda cls, chromosomes:
+            [cls.fitness(chromosome) for chromosome in chromosomes])
+
+    def time_mutators(self) -> None:
+        self._time_operators(
+            'mutator', 'MutatorEnum', lambda cls, chromosomes:
+            [cls.mutate(chromosome) for chromosome in chromosomes])
+
+    def time_recombiners(self) -> None:
+        self._time_operators(
+            'recombiner', 'RecombinerEnum', lambda cls, chromosomes: [
+                cls.recombine(chromosome, chromosomes[i - 1])
+                for i, chromosome in enumerate(chromosomes)
+            ])
+
+    def time_selectors(self) -> None:
+        maximize_fitness = self.problem.maximize_fitness
+        size = self.population_size
+        custom_data = self.custom_data()
+
+        def population() -> List[Individual]:
+            return self._individuals(custom_data)
+
+        for mating_selector in self.problem.members('MatingSelectorEnum'):
+            mating_selector.value.set_custom_data(custom_data)
+
+            def select_couples(individuals: List[Individual],
+                               cls: Type = mating_selector.value) -> None:
+                cls.select_couples(individuals, size // 2, maximize_fitness)
+
+            self._time('mating_selector/{}'.format(mating_selector.name),
+                       population, select_couples, size)
+
+        for survivor_selector in self.problem.members('SurvivorSelectorEnum'):
+            survivor_selector.value.set_custom_data(custom_data)
+
+            def select_survivors(individuals: List[Individual],
+                                 cls: Type = survivor_selector.value) -> None:
+                cls.select_survivors(size, individuals[:size],
+                                     individuals[size:], maximize_fitness)
+
+            # Parents and breed
+            self._time('survivor_selector/{}'.format(survivor_selector.name),
+                       lambda: population() + population(), select_survivors,
+                       2 * size)
+
+        for solution_selector in self.problem.members('SolutionSelectorEnum'):
+
+            def update_individuals(individuals: List[Individual],
+                                   cls: Type = solution_selector.value) -> None:
+                cls(self.arguments['number_solutions'], maximize_fitness,
+                    custom_data).update_individuals(individuals)
+
+            self._time('solution_selector/{}'.format(solution_selector.name),
+                       population, update_individuals, size)
+
+    def time_generations(self) -> None:
+        """Times generations of an Experiment with the runner's default
+        classes."""
+        def start() -> Experiment:
+            experiment: Experiment = self.problem.runner.new_experiment(
+                self.arguments)
+            experiment.verbose = False
+            experiment.start()
+            return experiment
+
+        def run_generations(experiment: Experiment) -> None:
+            try:
+                for _ in range(self.generations):
+                    experiment.run_generation()
+            finally:
+                experiment.finish()
+
+        self._time('experiment/generation', start, run_generations,
+                   self.generations)
+
+    def run(self) -> List[BenchmarkResult]:
+        self.time_chromosomes()
+        self.time_fitness_computers()
+        self.time_mutators()
+        self.time_recombiners()
+        self.time_selectors()
+        self.time_generations()
+        return self.results
@@ -0,0 +1,88 @@
+from typing import List, Sequence
+
+
+def _pairs(count: int) -> int:
+    return count * (count - 1) // 2
+
+
+class QueenAttackCounter:
+    """Counts attacking queen pairs on a board where each column holds exactly
+    one queen (rows[col] is the row of the queen at column col).
+
+    Keeps occupancy histograms for rows, diagonals (row - col) and
+    anti-diagonals (row + col), so the total is computed in O(n) and updated in
+    O(1) when a single queen moves (move) or two queens swap rows (swap).
+    """
+    def __init__(self, rows: Sequence[int]) -> None:
+        self.size = len(rows)
+        self.rows = list(rows)
+        self._row_count = [0] * self.size
+        self._diag_count = [0] * (2 * self.size - 1)
+        self._anti_diag_count = [0] * (2 * self.size - 1)
+
+        for col, row in enumerate(self.rows):
+            self._row_count[row] += 1
+            self._diag_count[row - col + self.size - 1] += 1
+            self._anti_diag_count[row + col] += 1
+
+        # Two queens can't share a row and a diagonal at the same time (they
+        # are always in different columns), so the three sums never overlap.
+        self.attacks = sum(map(_pairs, self._row_count)) \
+            + sum(map(_pairs, self._diag_count)) \
+            + sum(map(_pairs, self._anti_diag_count))
+
+    def copy(self) -> 'QueenAttackCounter':
+        new_counter = QueenAttackCounter.__new__(QueenAttackCounter)
+        new_counter.size = self.size
+        new_counter.rows = list(self.rows)
+        new_counter._row_count = list(self._row_count)
+        new_counter._diag_count = list(self._diag_count)
+        new_counter._anti_diag_count = list(self._anti_diag_count)
+        new_counter.attacks = self.attacks
+        return new_counter
+
+    def _remove(self, col: int, row: int) -> int:
+        diag = row - col + self.size - 1
+        anti_diag = row + col
+
+        self._row_count[row] -= 1
+        self._diag_count[diag] -= 1
+        self._anti_diag_count[anti_diag] -= 1
+
+        return -(self._row_count[row] + self._diag_count[diag] +
+                 self._anti_diag_count[anti_diag])
+
+    def _add(self, col: int, row: int) -> int:
+        diag = row - col + self.size - 1
+        anti_diag = row + col
+        delta = self._row_count[row] + self._diag_count[diag] + \
+            self._anti_diag_count[anti_diag]
+
+        self._row_count[row] += 1
+        self._diag_count[diag] += 1
+        self._anti_diag_count[anti_diag] += 1
+
+        return delta
+
+    def move(self, col: int, new_row: int) -> int:
+        """Moves the queen at column col to new_row. Returns the variation in
+        the number of attacks."""
+        old_row = self.rows[col]
+        if old_row == new_row:
+            return 0
+
+        delta = self._remove(col, old_row) + self._add(col, new_row)
+        self.rows[col] = new_row
+        self.attacks += delta
+
+        return delta
+
+    def swap(self, col1: int, col2: int) -> int:
+        """Swaps the rows of queens at columns col1 and col2. Returns the
+        variation in the number of attacks."""
+        row1, row2 = self.rows[col1], self.rows[col2]
+        return self.move(col1, row2) + self.move(col2, row1)
+
+
+def count_attacks(rows: Sequence[int]) -> int:
+    return QueenAttackCounter(rows).attacks
@@ -1,11 +1,43 @@
-from typing import Dict, List, Type
-from random import randint
+from typing import Dict, List, Type, Optional, Sequence
 from functools import reduce
-from copy import deepcopy
+from array import array
 
 from eight_queens.phenotypes import QueenPositionPhenotype
-from eight_queens.genotypes import BitStringGenotype, IntGenotype
+from eight_queens.genotypes import BitStringGenotype, IntGenotype, BitStringGenotypeView, IntGenotypeView
+from eight_queens.attacks import QueenAttackCounter
 from genetic_framework.chromosome import Chromosome
+from genetic_framework.compact import CompactChromosome, PackedBuffer
+from genetic_framework.randomness import get_random
+
+
+def check_permutation(rows: Sequence[int], chess_size: int) -> None:
+    """Raises ValueError unless rows holds every row in [0, chess_size)
+    exactly once. O(n), through a bitmap of the rows seen."""
+    if len(rows) != chess_size:
+        raise ValueError(
+            'Tried to set IntPermutation genes with wrong number of rows ({}). Expected {}.'
+            .format(len(rows), chess_size))
+
+    seen = bytearray(chess_size)
+    for row in rows:
+        if row < 0 or row >= chess_size or seen[row]:
+            raise ValueError(
+                'Tried to set IntPermutation genes with bad permutation ({}).'
+                .format(list(rows)))
+        seen[row] = 1
+
+
+def queen_positions(rows: Sequence[int],
+                    custom_data: Dict) -> List[QueenPositionPhenotype]:
+    """Phenotypes of a board whose rows are already known to be valid, so
+    they are not validated again."""
+    positions = []
+    for col, row in enumerate(rows):
+        phenotype = QueenPositionPhenotype(custom_data)
+        phenotype._data = (row, col)
+        positions.append(phenotype)
+
+    return positions
 
 
 class BitStringChromosome(Chromosome[QueenPositionPhenotype,
@@ -13,17 +45,29 @@ class BitStringChromosome(Chromosome[QueenPositionPhenotype,
     def __init__(self, custom_data: Dict = {}) -> None:
         super().__init__(custom_data)
         self._genotypes: List[BitStringGenotype] = []
+        # Cached by fitness computers, kept up to date by mutators and
+        # invalidated whenever genes are reassigned
+        self.attack_counter: Optional[QueenAttackCounter] = None
 
     def initialize(self) -> None:
         chess_size = self.custom_data['chess_size']
+        rng = get_random(self.custom_data)
 
+        self.attack_counter = None
         self._genotypes = []
         for i in range(chess_size):
             new_gene = BitStringGenotype(self.custom_data)
-            new_data = randint(0, chess_size - 1)
+            new_data = rng.randint(0, chess_size - 1)
             new_gene.data = "{:032b}".format(new_data)
             self._genotypes.append(new_gene)
 
+    def copy(self) -> 'BitStringChromosome':
+        new_chromosome = super().copy()
+        # Mutators update the attack counter in place, so it can't be shared
+        if self.attack_counter is not None:
+            new_chromosome.attack_counter = self.attack_counter.copy()
+        return new_chromosome
+
     @classmethod
     def genotype_to_phenotype(cls: Type, gene: BitStringGenotype,
                               **kwargs) -> QueenPositionPhenotype:
@@ -39,8 +83,8 @@ class BitStringChromosome(Chromosome[QueenPositionPhenotype,
         return new_genotype
 
     @property
-    def genotypes(self) -> List[BitStringGenotype]:
-        return self._genotypes
+    def genotypes(self) -> Sequence[BitStringGenotype]:
+        return tuple(self._genotypes)
 
     @genotypes.setter
     def genotypes(self, genes: List[BitStringGenotype]) -> None:
@@ -58,25 +102,32 @@ class BitStringChromosome(Chromosome[QueenPositionPhenotype,
                 raise ValueError(
                     'Tried to set BitStringChromosome genes with gene out of boundaries ({}). Expected [{}, {}].'
                     .format(value, 0, chess_size - 1))
-        self._genotypes = deepcopy(genes)
+        self.attack_counter = None
+        self._adopt_genotypes(genes)
+
+    @property
+    def rows(self) -> Sequence[int]:
+        """Row of the queen at each column."""
+        return [int(gene.data, 2) for gene in self._genotypes]
 
     @property
     def phenotypes(self) -> List[QueenPositionPhenotype]:
         return [
-            self.genotype_to_phenotype(self.genotypes[i], index=i)
-            for i in range(len(self.genotypes))
+            self.genotype_to_phenotype(gene, index=i)
+            for i, gene in enumerate(self._genotypes)
         ]
 
     @phenotypes.setter
     def phenotypes(self, _phenotypes: List[QueenPositionPhenotype]) -> None:
         _phenotypes.sort(key=lambda phenotype: phenotype.data[1])
 
+        self.attack_counter = None
         self._genotypes = [
             self.phenotype_to_genotype(phenotype) for phenotype in _phenotypes
         ]
 
     def __str__(self) -> str:
-        return str(self.genotypes)
+        return str(self._genotypes)
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -87,9 +138,14 @@ class IntPermutationChromosome(Chromosome[QueenPositionPhenotype,
     def __init__(self, custom_data: Dict = {}) -> None:
         super().__init__(custom_data)
         self._genotypes: List[IntGenotype] = []
+        # Cached by fitness computers, kept up to date by mutators and
+        # invalidated whenever genes are reassigned
+        self.attack_counter: Optional[QueenAttackCounter] = None
 
     def initialize(self) -> None:
         chess_size: int = self.custom_data['chess_size']
+        rng = get_random(self.custom_data)
+        self.attack_counter = None
         self._genotypes = []
 
         for i in range(chess_size):
@@ -100,10 +156,17 @@ class IntPermutationChromosome(Chromosome[QueenPositionPhenotype,
         # Permute _data list: for each index i, choose an element after i
         # (for exemple at r) and swap(i,r)
         for i in range(chess_size - 1):
-            random_swap_position = randint(i + 1, chess_size - 1)
+            random_swap_position = rng.randint(i + 1, chess_size - 1)
             self._genotypes[i], self._genotypes[random_swap_position] = \
                 self._genotypes[random_swap_position], self._genotypes[i]
 
+    def copy(self) -> 'IntPermutationChromosome':
+        new_chromosome = super().copy()
+        # Mutators update the attack counter in place, so it can't be shared
+        if self.attack_counter is not None:
+            new_chromosome.attack_counter = self.attack_counter.copy()
+        return new_chromosome
+
     @classmethod
     def genotype_to_phenotype(cls: Type, gene: IntGenotype,
                               **kwargs) -> QueenPositionPhenotype:
@@ -119,8 +182,8 @@ class IntPermutationChromosome(Chromosome[QueenPositionPhenotype,
         return new_gene
 
     @property
-    def genotypes(self) -> List[IntGenotype]:
-        return self._genotypes
+    def genotypes(self) -> Sequence[IntGenotype]:
+        return tuple(self._genotypes)
 
     @genotypes.setter
     def genotypes(self, genes: List[IntGenotype]) -> None:
@@ -130,35 +193,170 @@ class IntPermutationChromosome(Chromosome[QueenPositionPhenotype,
                 'Tried to assign genotypes to IntPermutationChromosome with wrog number of genes ({}). Expected {}.'
                 .format(len(genes), chess_size))
 
-        values = list(map(lambda gene: gene.data, genes))
-        for i in range(chess_size):
-            if values.count(i) != 1:
-                raise ValueError(
-                    'Tried to set IntPermutation genes with bad permutation ({}).'
-                    .format(values))
+        check_permutation([gene.data for gene in genes], chess_size)
 
-        self._genotypes = deepcopy(genes)
+        self.attack_counter = None
+        self._adopt_genotypes(genes)
 
     @property
-    def phenotypes(self) -> List[QueenPositionPhenotype]:
-        genes = self.genotypes
+    def rows(self) -> Sequence[int]:
+        """Row of the queen at each column."""
+        return [gene.data for gene in self._genotypes]
+
+    def set_rows(self, rows: Sequence[int], validate: bool = True) -> None:
+        """Sets the row of the queen at each column. validate is False for
+        rows already known to be a permutation (such as the ones operators
+        build from valid parents)."""
+        if validate:
+            check_permutation(rows, self.custom_data['chess_size'])
+
+        genes = []
+        for row in rows:
+            gene = IntGenotype(self.custom_data)
+            gene._data = row
+            genes.append(gene)
+
+        self.attack_counter = None
+        self._genotypes = genes
+        self._shared_genes = False
+
+    def swap_rows(self, col1: int, col2: int) -> None:
+        """Swaps the rows of the queens at columns col1 and col2, keeping the
+        attack counter up to date."""
+        genes = self.writable_genotypes()
+        genes[col1], genes[col2] = genes[col2], genes[col1]
+        if self.attack_counter is not None:
+            self.attack_counter.swap(col1, col2)
 
-        return [
-            self.genotype_to_phenotype(genes[i], index=i)
-            for i in range(len(genes))
-        ]
+    @property
+    def phenotypes(self) -> List[QueenPositionPhenotype]:
+        return queen_positions(self.rows, self.custom_data)
 
     @phenotypes.setter
     def phenotypes(self, phenotypes: List[QueenPositionPhenotype]) -> None:
         phenotypes.sort(key=lambda phenotype: phenotype.data[1])
-
-        self._genotypes = [
-            self.phenotype_to_genotype(phenotypes[i])
-            for i in range(len(phenotypes))
-        ]
+        self.set_rows([phenotype.data[0] for phenotype in phenotypes])
 
     def __str__(self) -> str:
         return str(self._genotypes)
 
     def __repr__(self) -> str:
         return self.__str__()
+
+
+class CompactBitStringChromosome(CompactChromosome, BitStringChromosome):
+    """BitStringChromosome that stores the row of every queen in a single
+    array('i'). Genes are BitStringGenotype views created on demand."""
+    typecode = 'i'
+    view_cls = BitStringGenotypeView
+
+    def initialize(self) -> None:
+        chess_size = self.custom_data['chess_size']
+        rng = get_random(self.custom_data)
+
+        self.attack_counter = None
+        self._buffer = array(
+            'i', [rng.randint(0, chess_size - 1) for _ in range(chess_size)])
+        self._shared_genes = False
+
+    @property
+    def rows(self) -> Sequence[int]:
+        # The buffer itself, it must not be changed
+        return self._buffer
+
+
+class CompactIntPermutationChromosome(CompactChromosome,
+                                      IntPermutationChromosome):
+    """IntPermutationChromosome that stores the row of every queen in a single
+    array('i'). Genes are IntGenotype views created on demand, for operators
+    written for genes: fitness computers and permutation operators read rows
+    and write them through set_rows and swap_rows, without any gene or
+    phenotype object, so boards of 100k queens stay feasible."""
+    typecode = 'i'
+    view_cls = IntGenotypeView
+
+    def initialize(self) -> None:
+        chess_size: int = self.custom_data['chess_size']
+        rng = get_random(self.custom_data)
+        rows = array('i', range(chess_size))
+
+        # Same permutation as IntPermutationChromosome.initialize
+        for i in range(chess_size - 1):
+            random_swap_position = rng.randint(i + 1, chess_size - 1)
+            rows[i], rows[random_swap_position] = \
+                rows[random_swap_position], rows[i]
+
+        self.attack_counter = None
+        self._buffer = rows
+        self._shared_genes = False
+
+    @property
+    def rows(self) -> Sequence[int]:
+        # The buffer itself, it must not be changed
+        return self._buffer
+
+    def set_rows(self, rows: Sequence[int], validate: bool = True) -> None:
+        if validate:
+            check_permutation(rows, self.custom_data['chess_size'])
+
+        self.attack_counter = None
+        self._buffer = array('i', rows)
+        self._shared_genes = False
+
+    def swap_rows(self, col1: int, col2: int) -> None:
+        buffer = self._writable_buffer()
+        buffer[col1], buffer[col2] = buffer[col2], buffer[col1]
+        if self.attack_counter is not None:
+            self.attack_counter.swap(col1, col2)
+
+
+class PackedBitStringChromosome(CompactChromosome, BitStringChromosome):
+    """BitStringChromosome whose rows are packed in a single int (through
+    PackedBuffer), with the smallest number of bytes per row that fits
+    chess_size rows. Mutators and recombiners working on bits read and write
+    that int at once, and genes are still BitStringGenotype views for
+    operators and display.
+    """
+    view_cls = BitStringGenotypeView
+
+    _buffer: PackedBuffer  # type: ignore
+
+    @property
+    def bytes_per_gene(self) -> int:
+        bits: int = (self.custom_data['chess_size'] - 1).bit_length()
+        return 1 if bits <= 8 else 2 if bits <= 16 else 4
+
+    @property
+    def bits_per_gene(self) -> int:
+        return 8 * self.bytes_per_gene
+
+    def _new_buffer(self, size: int) -> PackedBuffer:
+        return PackedBuffer(size, self.bytes_per_gene)
+
+    def initialize(self) -> None:
+        chess_size = self.custom_data['chess_size']
+        rng = get_random(self.custom_data)
+
+        self.attack_counter = None
+        self._buffer = PackedBuffer.from_items(
+            [rng.randint(0, chess_size - 1) for _ in range(chess_size)],
+            self.bytes_per_gene)
+        self._shared_genes = False
+
+    @property
+    def bits(self) -> int:
+        """Every row packed in a single int. Row of column i is at bits
+        [i * bits_per_gene, (i + 1) * bits_per_gene)."""
+        return self._buffer.value
+
+    @bits.setter
+    def bits(self, bits: int) -> None:
+        # Callers are responsible for keeping every row in [0, chess_size)
+        self.attack_counter = None
+        self._buffer = PackedBuffer(self.custom_data['chess_size'],
+                                    self.bytes_per_gene, bits)
+        self._shared_genes = False
+
+    @property
+    def rows(self) -> Sequence[int]:
+        return self._buffer.tolist()
@@ -1,8 +1,9 @@
-from typing import Type, List, Tuple
+from typing import Type, List, Tuple, Union
 from abc import ABC
 
 from genetic_framework.fitness import FitnessComputer
 from eight_queens.phenotypes import QueenPositionPhenotype
+from eight_queens.attacks import QueenAttackCounter, count_attacks
 from eight_queens.chromosomes import *
 
 
@@ -15,24 +16,28 @@ def is_diagonally_attacking(x1: int, y1: int, x2: int, y2: int) -> bool:
 
 
 def count_queen_attacks(phenotypes: List[QueenPositionPhenotype]) -> int:
-    attacking_queens_count = 0
-    for p1 in phenotypes:
-        for p2 in phenotypes:
-            if p1 == p2:
-                continue
+    rows = [0] * len(phenotypes)
+    for phenotype in phenotypes:
+        rows[phenotype.data[1]] = phenotype.data[0]
 
-            attacking_queens_count += \
-                is_horizontally_attacking(p1.data[0], p2.data[0]) \
-                or is_diagonally_attacking(p1.data[0], p1.data[1],
-                    p2.data[0], p2.data[1])
+    return count_attacks(rows)
 
-    return attacking_queens_count // 2
+
+def chromosome_queen_attacks(
+        chromosome: Union[BitStringChromosome, IntPermutationChromosome]
+) -> int:
+    """Counts attacks reusing (or caching) the chromosome's attack counter, so
+    boards kept up to date by mutators are not rescored."""
+    if chromosome.attack_counter is None:
+        chromosome.attack_counter = QueenAttackCounter(chromosome.rows)
+
+    return chromosome.attack_counter.attacks
 
 
 class BitStringFitnessComputer(FitnessComputer[BitStringChromosome], ABC):
     @classmethod
     def fitness(cls: Type, chromosome: BitStringChromosome) -> float:
-        attacks = count_queen_attacks(chromosome.phenotypes)
+        attacks = chromosome_queen_attacks(chromosome)
         return 1 / (1 + float(attacks))
 
 
@@ -40,7 +45,7 @@ class BooleanBitStringFitnessComputer(FitnessComputer[BitStringChromosome],
                                       ABC):
     @classmethod
     def fitness(cls: Type, chromosome: BitStringChromosome) -> float:
-        attacks = count_queen_attacks(chromosome.phenotypes)
+        attacks = chromosome_queen_attacks(chromosome)
         return 1.0 if attacks == 0 else 0.0
 
 
@@ -48,7 +53,7 @@ class IntPermutationFitnessComputer(FitnessComputer[IntPermutationChromosome],
                                     ABC):
     @classmethod
     def fitness(cls: Type, chromosome: IntPermutationChromosome) -> float:
-        attacks = count_queen_attacks(chromosome.phenotypes)
+        attacks = chromosome_queen_attacks(chromosome)
         return 1 / (1 + float(attacks))
 
 
@@ -56,5 +61,5 @@ class BooleanIntPermutationFitnessComputer(
         FitnessComputer[IntPermutationChromosome], ABC):
     @classmethod
     def fitness(cls: Type, chromosome: IntPermutationChromosome) -> float:
-        attacks = count_queen_attacks(chromosome.phenotypes)
+        attacks = chromosome_queen_attacks(chromosome)
         return 1.0 if attacks == 0 else 0.0
@@ -1,7 +1,8 @@
 from typing import Dict
-from random import randint
 
 from genetic_framework.chromosome import Genotype
+from genetic_framework.compact import GeneView
+from genetic_framework.randomness import get_random
 
 
 class BitStringGenotype(Genotype[str]):
@@ -13,7 +14,7 @@ class BitStringGenotype(Genotype[str]):
 
     def initialize(self) -> None:
         chess_size = self.custom_data['chess_size']
-        row = randint(0, chess_size - 1)
+        row = get_random(self.custom_data).randint(0, chess_size - 1)
         self._data = "{:032b}".format(row)
 
     @property
@@ -51,7 +52,7 @@ class IntGenotype(Genotype[int]):
 
     def initialize(self) -> None:
         chess_size = self.custom_data['chess_size']
-        self._data = randint(0, chess_size - 1)
+        self._data = get_random(self.custom_data).randint(0, chess_size - 1)
 
     @property
     def data(self) -> int:
@@ -73,3 +74,19 @@ class IntGenotype(Genotype[int]):
 
     def __repr__(self) -> str:
         return self.__str__()
+
+
+class BitStringGenotypeView(GeneView, BitStringGenotype):
+    """BitStringGenotype viewing a row stored as an integer in a
+    CompactChromosome buffer."""
+    @property
+    def _data(self) -> str:
+        return "{:032b}".format(self._buffer[self._index])
+
+    @_data.setter
+    def _data(self, value: str) -> None:
+        self._buffer[self._index] = int(value, 2)
+
+
+class IntGenotypeView(GeneView, IntGenotype):
+    """IntGenotype viewing a row stored in a CompactChromosome buffer."""
@@ -1,19 +1,90 @@
-from random import randint
 from abc import ABC
 from typing import Type
 
-from genetic_framework.mutator import Mutator
-from eight_queens.chromosomes import BitStringChromosome
+from genetic_framework.chromosome import Chromosome
+from genetic_framework.mutator import Mutator, SwapGeneMutator
+from genetic_framework.randomness import get_random
+from eight_queens.chromosomes import BitStringChromosome, IntPermutationChromosome, PackedBitStringChromosome
 
 
 class BitStringRandomizeGeneMutator(Mutator[BitStringChromosome], ABC):
     @classmethod
     def mutate_inplace(cls: Type, chromosome: BitStringChromosome) -> None:
         chess_size: int = cls.custom_data['chess_size']
+        rng = get_random(cls.custom_data)
 
-        gene_index = randint(0, chess_size - 1)
-        new_gene_value = randint(0, chess_size - 1)
+        gene_index = rng.randint(0, chess_size - 1)
+        new_gene_value = rng.randint(0, chess_size - 1)
 
-        genes = chromosome.genotypes
+        attack_counter = chromosome.attack_counter
+        genes = chromosome.writable_genotypes()
         genes[gene_index].data = "{:032b}".format(new_gene_value)
         chromosome.genotypes = genes
+
+        # Update fitness incrementally instead of rescoring the whole board
+        if attack_counter is not None:
+            attack_counter.move(gene_index, new_gene_value)
+            chromosome.attack_counter = attack_counter
+
+
+class QueenSwapGeneMutator(SwapGeneMutator, ABC):
+    """SwapGeneMutator that keeps eight queens chromosomes' attack counter up to
+    date, so fitness is updated in O(1) instead of rescoring the whole board.
+    Permutation chromosomes swap their rows in place, without gene objects."""
+    @classmethod
+    def mutate_inplace(cls: Type, chromosome: Chromosome) -> None:
+        number_genes: int = cls.custom_data['chess_size']
+        rng = get_random(cls.custom_data)
+
+        r1 = rng.randint(0, number_genes - 1)
+        r2 = rng.randint(0, number_genes - 1)
+        while r1 == r2:
+            r2 = rng.randint(0, number_genes - 1)
+
+        if isinstance(chromosome, IntPermutationChromosome):
+            chromosome.swap_rows(r1, r2)
+            return
+
+        attack_counter = getattr(chromosome, 'attack_counter', None)
+        genes = chromosome.writable_genotypes()
+
+        # Swap genes
+        genes[r1], genes[r2] = genes[r2], genes[r1]
+        chromosome.genotypes = genes  # type: ignore
+
+        if attack_counter is not None:
+            attack_counter.swap(r1, r2)
+            chromosome.attack_counter = attack_counter  # type: ignore
+
+
+class PackedBitFlipMutator(Mutator[PackedBitStringChromosome], ABC):
+    """Flips a single bit of a random row, among the bits whose flip keeps the
+    row inside the board, with one XOR over the packed rows."""
+    @classmethod
+    def mutate_inplace(cls: Type,
+                       chromosome: PackedBitStringChromosome) -> None:
+        chess_size: int = cls.custom_data['chess_size']
+        # The only row of a 1x1 board has no other value to flip to
+        if chess_size == 1:
+            return
+
+        rng = get_random(cls.custom_data)
+        bits_per_gene = chromosome.bits_per_gene
+
+        gene_index = rng.randint(0, chess_size - 1)
+        shift = gene_index * bits_per_gene
+        row = (chromosome.bits >> shift) & ((1 << bits_per_gene) - 1)
+
+        # On boards of 2 rows or more, flipping the highest set bit (or bit 0
+        # of row 0) is always valid
+        bit = rng.choice([
+            bit for bit in range(chess_size.bit_length())
+            if row ^ (1 << bit) < chess_size
+        ])
+
+        attack_counter = chromosome.attack_counter
+        chromosome.bits ^= 1 << (shift + bit)
+
+        if attack_counter is not None:
+            attack_counter.move(gene_index, row ^ (1 << bit))
+            chromosome.attack_counter = attack_counter
@@ -1,10 +1,10 @@
-from random import randint
 from typing import List, Type
-from abc import ABC
+from abc import ABC, abstractmethod
+from random import Random
 
 from genetic_framework.recombiner import Recombiner
+from genetic_framework.randomness import get_random
 from eight_queens.chromosomes import *
-from eight_queens.genotypes import IntGenotype
 
 
 class BitStringCutCrossfillRecombiner(Recombiner[BitStringChromosome], ABC):
@@ -12,70 +12,211 @@ class BitStringCutCrossfillRecombiner(Recombiner[BitStringChromosome], ABC):
     def recombine(cls: Type, chromosome1: BitStringChromosome,
                   chromosome2: BitStringChromosome) -> BitStringChromosome:
         chess_size = cls.custom_data['chess_size']
+        rng = get_random(cls.custom_data)
 
-        new_chromosome = BitStringChromosome(chromosome1.custom_data)
+        new_chromosome = type(chromosome1)(chromosome1.custom_data)
         genes1 = chromosome1.genotypes
         genes2 = chromosome2.genotypes
 
-        cut_point = randint(0, chess_size)
-        mixed_genes = genes1[:cut_point] + genes2[cut_point:]
+        cut_point = rng.randint(0, chess_size)
+        mixed_genes = list(genes1[:cut_point]) + list(genes2[cut_point:])
 
         new_chromosome.genotypes = mixed_genes
         return new_chromosome
 
 
-class IntPermutationRecombiner(Recombiner[IntPermutationChromosome], ABC):
-    # PMX crossover algorithm
-
+class PackedBitStringCutCrossfillRecombiner(
+        Recombiner[PackedBitStringChromosome], ABC):
+    """BitStringCutCrossfillRecombiner over packed rows: rows before a random
+    cut point come from chromosome1 and the rest from chromosome2, through a
+    single mask."""
     @classmethod
-    def _find_index(cls: Type['IntPermutationRecombiner'], idx: int, left: int,
-                    right: int, genes1: List[int], genes2: List[int]) -> int:
-        target = genes1[idx]
-        target_idx_p2 = genes2.index(target)
+    def recombine(
+            cls: Type, chromosome1: PackedBitStringChromosome,
+            chromosome2: PackedBitStringChromosome
+    ) -> PackedBitStringChromosome:
+        chess_size = cls.custom_data['chess_size']
+        rng = get_random(cls.custom_data)
 
-        if target_idx_p2 >= left and target_idx_p2 <= right:
-            return cls._find_index(target_idx_p2, left, right, genes1, genes2)
+        cut_point = rng.randint(0, chess_size)
+        low_mask = (1 << (cut_point * chromosome1.bits_per_gene)) - 1
 
-        return target_idx_p2
+        new_chromosome = type(chromosome1)(chromosome1.custom_data)
+        new_chromosome.bits = (chromosome1.bits & low_mask) \
+            | (chromosome2.bits & ~low_mask)
+        return new_chromosome
+
+
+class PermutationRecombiner(Recombiner[IntPermutationChromosome], ABC):
+    """Base class of crossovers between permutations of rows. Parents are
+    read through rows (in random order) and the child, a permutation by
+    construction, is set through set_rows without validation. Subclasses
+    implement cross in O(n), through lookup arrays indexed by row instead of
+    list searches."""
+    @classmethod
+    @abstractmethod
+    def cross(cls: Type, rows1: List[int], rows2: List[int],
+              rng: Random) -> List[int]:
+        """Returns a child permutation of parent permutations rows1 and
+        rows2."""
+        ...
 
     @classmethod
     def recombine(
-            cls: Type['IntPermutationRecombiner'],
+            cls: Type['PermutationRecombiner'],
             chromosome1: IntPermutationChromosome,
             chromosome2: IntPermutationChromosome) -> IntPermutationChromosome:
-        chess_size = cls.custom_data['chess_size']
-
-        new_chromosome = IntPermutationChromosome(chromosome1.custom_data)
-        chromo1_data = list(map(lambda gene: gene.data, chromosome1.genotypes))
-        chromo2_data = list(map(lambda gene: gene.data, chromosome2.genotypes))
+        rng = get_random(cls.custom_data)
+        rows1 = list(chromosome1.rows)
+        rows2 = list(chromosome2.rows)
 
         # Randomize who is going to be the parent1 and parent2
-        if randint(0, 1) == 0:
-            chromo1_data, chromo2_data = chromo2_data, chromo1_data
+        if rng.randint(0, 1) == 0:
+            rows1, rows2 = rows2, rows1
+
+        new_chromosome = type(chromosome1)(chromosome1.custom_data)
+        new_chromosome.set_rows(cls.cross(rows1, rows2, rng), validate=False)
+        return new_chromosome
 
-        new_data = [-1] * chess_size
 
-        # Defines the range to be copied to the son
-        left_r = randint(0, chess_size - 1)
-        right_r = randint(left_r, chess_size - 1)
-        new_data[left_r:right_r + 1] = chromo1_data[left_r:right_r + 1]
+def _positions(rows: List[int]) -> List[int]:
+    """Column of each row in permutation rows."""
+    positions = [0] * len(rows)
+    for col, row in enumerate(rows):
+        positions[row] = col
+    return positions
+
 
+class IntPermutationRecombiner(PermutationRecombiner, ABC):
+    """PMX crossover: a random range of columns comes from parent1, and rows
+    of parent2 in that range are placed where the mapping between both
+    parents leads outside of it. The rest comes from parent2."""
+    @classmethod
+    def cross(cls: Type, rows1: List[int], rows2: List[int],
+              rng: Random) -> List[int]:
+        size = len(rows1)
+        positions2 = _positions(rows2)
+
+        # Defines the range to be copied to the son
+        left_r = rng.randint(0, size - 1)
+        right_r = rng.randint(left_r, size - 1)
+        new_rows = list(rows2)
+        new_rows[left_r:right_r + 1] = rows1[left_r:right_r + 1]
+        in_range = bytearray(size)
+        for row in rows1[left_r:right_r + 1]:
+            in_range[row] = 1
+
+        # Mapping chains of different rows never share a column, so this
+        # loop is O(n) overall
         for i in range(left_r, right_r + 1):
-            if chromo2_data[i] in new_data:
+            if in_range[rows2[i]]:
                 continue
 
-            idx = cls._find_index(i, left_r, right_r, chromo1_data,
-                                  chromo2_data)
-            new_data[idx] = chromo2_data[i]
+            col = positions2[rows1[i]]
+            while left_r <= col <= right_r:
+                col = positions2[rows1[col]]
+            new_rows[col] = rows2[i]
 
-        for i in range(0, chess_size):
-            new_data[i] = new_data[i] if new_data[i] != -1 else chromo2_data[i]
+        return new_rows
 
-        new_genes: List[IntGenotype] = []
-        for data in new_data:
-            new_gene = IntGenotype(chromosome1.custom_data)
-            new_gene.data = data
-            new_genes.append(new_gene)
 
-        new_chromosome.genotypes = new_genes
-        return new_chromosome
+class OrderCrossoverRecombiner(PermutationRecombiner, ABC):
+    """OX crossover: a random range of columns comes from parent1, and the
+    other columns get the remaining rows in the order they appear in parent2,
+    both starting right after the range."""
+    @classmethod
+    def cross(cls: Type, rows1: List[int], rows2: List[int],
+              rng: Random) -> List[int]:
+        size = len(rows1)
+        left_r = rng.randint(0, size - 1)
+        right_r = rng.randint(left_r, size - 1)
+
+        new_rows = list(rows1)
+        in_range = bytearray(size)
+        for row in rows1[left_r:right_r + 1]:
+            in_range[row] = 1
+
+        col = (right_r + 1) % size
+        for i in range(right_r + 1, right_r + 1 + size):
+            row = rows2[i % size]
+            if not in_range[row]:
+                new_rows[col] = row
+                col = (col + 1) % size
+
+        return new_rows
+
+
+class CycleCrossoverRecombiner(PermutationRecombiner, ABC):
+    """CX crossover: columns are split into the cycles of the mapping between
+    both parents, and every row keeps the column it has in one of them,
+    alternating between parent1 and parent2 at each cycle."""
+    @classmethod
+    def cross(cls: Type, rows1: List[int], rows2: List[int],
+              rng: Random) -> List[int]:
+        size = len(rows1)
+        positions1 = _positions(rows1)
+
+        new_rows = [-1] * size
+        from_parent1 = True
+        for start in range(size):
+            if new_rows[start] != -1:
+                continue
+
+            parent = rows1 if from_parent1 else rows2
+            col = start
+            while new_rows[col] == -1:
+                new_rows[col] = parent[col]
+                col = positions1[rows2[col]]
+            from_parent1 = not from_parent1
+
+        return new_rows
+
+
+class EdgeRecombinationRecombiner(PermutationRecombiner, ABC):
+    """Edge recombination (ERX): parents are read as cycles of rows, and the
+    child is built row by row, following edges of either parent to the
+    neighbor with fewest unused neighbors (ties broken at random). When the
+    current row has no unused neighbor left, a random unused row follows.
+    Every row has 4 neighbors at most, so each step is O(1).
+    """
+    @classmethod
+    def cross(cls: Type, rows1: List[int], rows2: List[int],
+              rng: Random) -> List[int]:
+        size = len(rows1)
+        neighbors: List[List[int]] = [[] for _ in range(size)]
+        for rows in (rows1, rows2):
+            for i, row in enumerate(rows):
+                for neighbor in (rows[i - 1], rows[(i + 1) % size]):
+                    if neighbor != row and neighbor not in neighbors[row]:
+                        neighbors[row].append(neighbor)
+
+        # Unused rows, with the index of each one, for O(1) random picks
+        unused = list(range(size))
+        unused_index = list(range(size))
+
+        def use(row: int) -> None:
+            last = unused[-1]
+            unused[unused_index[row]] = last
+            unused_index[last] = unused_index[row]
+            unused.pop()
+            for neighbor in neighbors[row]:
+                neighbors[neighbor].remove(row)
+
+        row = rows1[0]
+        new_rows = [row]
+        use(row)
+        while unused:
+            candidates = neighbors[row]
+            if candidates:
+                fewest = min(len(neighbors[candidate])
+                             for candidate in candidates)
+                row = rng.choice([
+                    candidate for candidate in candidates
+                    if len(neighbors[candidate]) == fewest
+                ])
+            else:
+                row = unused[rng.randint(0, len(unused) - 1)]
+            new_rows.append(row)
+            use(row)
+
+        return new_rows
@@ -1,5 +1,4 @@
 from typing import List
-from random import random, randint
 
 from eight_queens.chromosomes import *
 from genetic_framework.individual import Individual
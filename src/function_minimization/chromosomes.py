@@ -1,10 +1,12 @@
-from typing import Dict, List
-from random import uniform
-from copy import deepcopy
+from typing import Dict, List, Type, Sequence
+import numpy as np  #type: ignore
 
 from function_minimization.phenotypes import FloatPhenotype
-from function_minimization.genotypes import FloatGenotype
+from function_minimization.genotypes import FloatGenotype, FloatGenotypeView
 from genetic_framework.chromosome import Chromosome
+from genetic_framework.compact import CompactChromosome
+from genetic_framework.array_population import ArrayChromosome
+from genetic_framework.randomness import get_random, get_numpy_random
 
 
 class FloatVectorChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
@@ -16,11 +18,12 @@ class FloatVectorChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
         vector_size = self.custom_data['vector_size']
         lower_bound = self.custom_data['parameter_lower_bound']
         upper_bound = self.custom_data['parameter_upper_bound']
+        rng = get_random(self.custom_data)
 
         self._genotypes = []
         for _ in range(vector_size):
             new_gene = FloatGenotype(self.custom_data)
-            new_gene.data = uniform(lower_bound, upper_bound)
+            new_gene.data = rng.uniform(lower_bound, upper_bound)
             self._genotypes.append(new_gene)
 
     @staticmethod
@@ -37,8 +40,8 @@ class FloatVectorChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
         return new_genotype
 
     @property
-    def genotypes(self) -> List[FloatGenotype]:
-        return self._genotypes
+    def genotypes(self) -> Sequence[FloatGenotype]:
+        return tuple(self._genotypes)
 
     @genotypes.setter
     def genotypes(self, genes: List[FloatGenotype]) -> None:
@@ -59,13 +62,18 @@ class FloatVectorChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
                     'Tried to set FloatParameterChromosome genes with gene out of boundaries ({}). Expected [{}, {}].'
                     .format(value, lower_bound, upper_bound))
 
-        self._genotypes = deepcopy(genes)
+        self._adopt_genotypes(genes)
+
+    @property
+    def values(self) -> Sequence[float]:
+        """Value of every gene."""
+        return [gene.data for gene in self._genotypes]
 
     @property
     def phenotypes(self) -> List[FloatPhenotype]:
         return [
-            FloatVectorChromosome.genotype_to_phenotype(self.genotypes[i])
-            for i in range(len(self.genotypes))
+            FloatVectorChromosome.genotype_to_phenotype(gene)
+            for gene in self._genotypes
         ]
 
     @phenotypes.setter
@@ -76,7 +84,45 @@ class FloatVectorChromosome(Chromosome[FloatPhenotype, FloatGenotype]):
         ]
 
     def __str__(self) -> str:
-        return str(self.genotypes)
+        return str(self._genotypes)
 
     def __repr__(self) -> str:
         return self.__str__()
+
+
+class CompactFloatVectorChromosome(CompactChromosome, FloatVectorChromosome):
+    """FloatVectorChromosome that stores every value in a single array('d').
+    Genes are FloatGenotype views created on demand."""
+    view_cls = FloatGenotypeView
+
+    def initialize(self) -> None:
+        self._initialize_genes(self.custom_data['vector_size'])
+
+    @property
+    def values(self) -> Sequence[float]:
+        # The buffer itself, it must not be changed
+        return self._buffer
+
+
+class ArrayFloatVectorChromosome(ArrayChromosome):
+    """Array counterpart of FloatVectorChromosome."""
+    @classmethod
+    def initialize_batch(cls: Type, population_size: int) -> np.ndarray:
+        vector_size = cls.custom_data['vector_size']
+        lower_bound = cls.custom_data['parameter_lower_bound']
+        upper_bound = cls.custom_data['parameter_upper_bound']
+
+        return get_numpy_random(cls.custom_data).uniform(
+            lower_bound, upper_bound, (population_size, vector_size))
+
+    @classmethod
+    def to_chromosome(cls: Type, row: np.ndarray) -> FloatVectorChromosome:
+        genes = []
+        for value in row:
+            new_gene = FloatGenotype(cls.custom_data)
+            new_gene.data = float(value)
+            genes.append(new_gene)
+
+        chromosome = FloatVectorChromosome(cls.custom_data)
+        chromosome.genotypes = genes
+        return chromosome
@@ -1,7 +1,9 @@
 from typing import Type, List, Tuple
 from abc import ABC
+import numpy as np  #type: ignore
 
 from genetic_framework.fitness import FitnessComputer
+from genetic_framework.array_population import ArrayFitnessComputer
 from function_minimization.genotypes import FloatGenotype
 from function_minimization.chromosomes import FloatVectorChromosome
 
@@ -10,7 +12,7 @@ class ChallengeFitnessComputer(FitnessComputer[FloatVectorChromosome], ABC):
     @staticmethod
     def fitness(chromosome: FloatVectorChromosome) -> float:
         vector_size = ChallengeFitnessComputer.custom_data['vector_size']
-        data: List[float] = [gene.data for gene in chromosome.genotypes]
+        data = chromosome.values
 
         total = 0.0
         for i in range(vector_size - 1):
@@ -20,3 +22,21 @@ class ChallengeFitnessComputer(FitnessComputer[FloatVectorChromosome], ABC):
             right = (x1 - 1)
             total += (100.0 * (left**2)) + (right**2)
         return total
+
+    @classmethod
+    def fitness_batch(cls: Type,
+                      chromosomes: List[FloatVectorChromosome]) -> List[float]:
+        data = np.array([chromosome.values for chromosome in chromosomes])
+        fitnesses: List[float] = ArrayChallengeFitnessComputer.fitness_batch(
+            data).tolist()
+        return fitnesses
+
+
+class ArrayChallengeFitnessComputer(ArrayFitnessComputer):
+    @classmethod
+    def fitness_batch(cls: Type, genes: np.ndarray) -> np.ndarray:
+        x1 = genes[:, :-1]
+        x2 = genes[:, 1:]
+        left = x2 - (x1**2)
+        right = (x1 - 1)
+        return ((100.0 * (left**2)) + (right**2)).sum(axis=1)
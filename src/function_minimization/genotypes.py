@@ -1,7 +1,8 @@
 from typing import Dict
-from random import uniform
 
 from genetic_framework.chromosome import Genotype
+from genetic_framework.compact import GeneView
+from genetic_framework.randomness import get_random
 
 
 class FloatGenotype(Genotype[float]):
@@ -12,7 +13,8 @@ class FloatGenotype(Genotype[float]):
     def initialize(self) -> None:
         lower_bound = self.custom_data['parameter_lower_bound']
         upper_bound = self.custom_data['parameter_upper_bound']
-        self._data = uniform(lower_bound, upper_bound)
+        self._data = get_random(self.custom_data).uniform(
+            lower_bound, upper_bound)
 
     @property
     def data(self) -> float:
@@ -35,3 +37,7 @@ class FloatGenotype(Genotype[float]):
 
     def __repr__(self) -> str:
         return self.__str__()
+
+
+class FloatGenotypeView(GeneView, FloatGenotype):
+    """FloatGenotype viewing a value stored in a CompactChromosome buffer."""
@@ -1,9 +1,11 @@
 from math import sqrt
-from random import randint, uniform
 from abc import ABC
-from typing import Type
+from typing import Optional, Tuple, Type
+import numpy as np  #type: ignore
 
 from genetic_framework.mutator import Mutator
+from genetic_framework.randomness import get_random, get_numpy_random
+from genetic_framework.array_population import ArrayMutator
 from function_minimization.chromosomes import FloatVectorChromosome
 from function_minimization.util import clamp
 
@@ -14,15 +16,43 @@ class RandomizeGeneMutator(Mutator[FloatVectorChromosome], ABC):
         vector_size: int = cls.custom_data['vector_size']
         lower_bound: float = cls.custom_data['parameter_lower_bound']
         upper_bound: float = cls.custom_data['parameter_upper_bound']
-        genes = chromosome.genotypes
+        rng = get_random(cls.custom_data)
+        genes = chromosome.writable_genotypes()
 
-        gene_index = randint(0, vector_size - 1)
+        gene_index = rng.randint(0, vector_size - 1)
         current_gene_value = genes[gene_index].data
         max_addition = min(current_gene_value - lower_bound,
                            upper_bound - current_gene_value)
-        new_gene_value = current_gene_value + uniform(-max_addition,
-                                                      max_addition)
+        new_gene_value = current_gene_value + rng.uniform(
+            -max_addition, max_addition)
         new_gene_value = clamp(new_gene_value, lower_bound, upper_bound)
 
         genes[gene_index].data = new_gene_value
         chromosome.genotypes = genes
+
+
+class ArrayRandomizeGeneMutator(ArrayMutator):
+    """Array counterpart of RandomizeGeneMutator."""
+    @classmethod
+    def mutate_batch(
+            cls: Type, genes: np.ndarray,
+            fitness: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        vector_size: int = cls.custom_data['vector_size']
+        lower_bound: float = cls.custom_data['parameter_lower_bound']
+        upper_bound: float = cls.custom_data['parameter_upper_bound']
+
+        rng = get_numpy_random(cls.custom_data)
+
+        new_genes = genes.copy()
+        rows = np.arange(len(genes))
+        gene_indexes = rng.integers(0, vector_size, len(genes))
+
+        current_values = new_genes[rows, gene_indexes]
+        max_additions = np.minimum(current_values - lower_bound,
+                                   upper_bound - current_values)
+        new_values = current_values + rng.uniform(-max_additions,
+                                                  max_additions)
+
+        new_genes[rows, gene_indexes] = np.clip(new_values, lower_bound,
+                                                upper_bound)
+        return new_genes, None
@@ -1,7 +1,11 @@
-from random import random
+from typing import Type
 from abc import ABC
+import numpy as np  #type: ignore
 
+from genetic_framework.chromosome import copy_genes
 from genetic_framework.recombiner import Recombiner
+from genetic_framework.randomness import get_random, get_numpy_random
+from genetic_framework.array_population import ArrayRecombiner
 from function_minimization.chromosomes import FloatVectorChromosome
 from function_minimization.genotypes import FloatGenotype
 
@@ -11,16 +15,28 @@ class RandomInterpolationRecombiner(Recombiner[FloatVectorChromosome], ABC):
     def recombine(chromosome1: FloatVectorChromosome,
                   chromosome2: FloatVectorChromosome) -> FloatVectorChromosome:
         vector_size = RandomInterpolationRecombiner.custom_data['vector_size']
+        rng = get_random(RandomInterpolationRecombiner.custom_data)
 
-        new_chromosome = FloatVectorChromosome(chromosome1.custom_data)
+        new_chromosome = type(chromosome1)(chromosome1.custom_data)
         genes1 = chromosome1.genotypes
         genes2 = chromosome2.genotypes
 
-        alpha = random()
-        mixed_genes = genes1[:]
+        alpha = rng.random()
+        # New genes, so the ones of the parents are not changed
+        mixed_genes = copy_genes(list(genes1))
         for i in range(vector_size):
             mixed_genes[i].data = alpha * genes1[i].data + (
                 1 - alpha) * genes2[i].data
 
         new_chromosome.genotypes = mixed_genes
         return new_chromosome
+
+
+class ArrayRandomInterpolationRecombiner(ArrayRecombiner):
+    """Array counterpart of RandomInterpolationRecombiner."""
+    @classmethod
+    def recombine_batch(cls: Type, genes1: np.ndarray, genes2: np.ndarray,
+                        fitness1: np.ndarray,
+                        fitness2: np.ndarray) -> np.ndarray:
+        alpha = get_numpy_random(cls.custom_data).random((len(genes1), 1))
+        return alpha * genes1 + (1 - alpha) * genes2
@@ -1,11 +1,9 @@
-from copy import deepcopy
 from typing import List, Tuple, Dict
-from random import random, randint, shuffle
 from abc import ABC
-from statistics import mean
 
 from genetic_framework.selectors import SurvivorSelector, MatingSelector, SolutionSelector
 from genetic_framework.individual import Individual
+from genetic_framework.utils import TopKArchive, select_best
 
 
 class MinimizeFitnessMatingSelector(MatingSelector, ABC):
@@ -33,11 +31,7 @@ class MinimizeFitnessSurvivorSelector(SurvivorSelector, ABC):
     def select_survivors(population_size: int, parents: List[Individual],
                          breed: List[Individual],
                          maximize_fitness: bool) -> List[Individual]:
-        new_generation_individuals = parents + breed
-        new_generation_individuals.sort(
-            key=lambda individual: individual.fitness(),
-            reverse=maximize_fitness)
-        return new_generation_individuals[:population_size]
+        return select_best(parents + breed, population_size, maximize_fitness)
 
 
 class KLowerFitnessSolutionSelector(SolutionSelector, ABC):
@@ -46,19 +40,15 @@ class KLowerFitnessSolutionSelector(SolutionSelector, ABC):
                  maximize_fitness: bool,
                  custom_data: Dict = {}) -> None:
         super().__init__(number_solutions, maximize_fitness, custom_data)
-        self._best_individuals: List[Individual] = []
+        self._archive = TopKArchive(number_solutions, maximize_fitness)
 
     @property
     def best_individual(self) -> Individual:
-        return self._best_individuals[0]
+        return self._archive.individuals[0]
 
     @property
     def best_individuals(self) -> List[Individual]:
-        return self._best_individuals
+        return self._archive.individuals
 
     def update_individuals(self, population: List[Individual]) -> None:
-        self._best_individuals.extend(population)
-        self._best_individuals.sort(
-            key=lambda individual: individual.fitness(),
-            reverse=self.maximize_fitness)
-        self._best_individuals = self.best_individuals[:self.number_solutions]
+        self._archive.update(population)
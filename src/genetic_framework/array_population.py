@@ -0,0 +1,195 @@
+from typing import Type, Optional, Tuple
+from abc import ABC, abstractmethod
+import numpy as np  #type: ignore
+
+from genetic_framework.chromosome import Chromosome
+from genetic_framework.custom_data import CustomDataHolder
+from genetic_framework.budget import EvaluationCounter
+from genetic_framework.population_stats import PopulationStats
+from genetic_framework.utils import best_indices
+
+
+class ArrayChromosome(CustomDataHolder, ABC):
+    """Defines how a whole population of chromosomes is encoded as a single
+    (population_size, number_genes) float64 array, one chromosome per row.
+    """
+    @classmethod
+    @abstractmethod
+    def initialize_batch(cls: Type, population_size: int) -> np.ndarray:
+        """Returns a new array with population_size random chromosomes."""
+        ...
+
+    @classmethod
+    @abstractmethod
+    def to_chromosome(cls: Type, row: np.ndarray) -> Chromosome:
+        """Converts a row back into its list based Chromosome counterpart."""
+        ...
+
+
+class ArrayFitnessComputer(CustomDataHolder, ABC):
+    @classmethod
+    @abstractmethod
+    def fitness_batch(cls: Type, genes: np.ndarray) -> np.ndarray:
+        """Computes the fitness of every row of genes at once."""
+        ...
+
+
+class ArrayMutator(CustomDataHolder, ABC):
+    @classmethod
+    @abstractmethod
+    def mutate_batch(
+            cls: Type, genes: np.ndarray,
+            fitness: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Returns a mutated copy of every row of genes, whose fitness is
+        fitness (NaN where it is not known yet). Mutators that evaluate the
+        mutated rows return their fitness too, so they are not evaluated again,
+        and None otherwise."""
+        ...
+
+
+class ArrayRecombiner(CustomDataHolder, ABC):
+    @classmethod
+    @abstractmethod
+    def recombine_batch(cls: Type, genes1: np.ndarray, genes2: np.ndarray,
+                        fitness1: np.ndarray,
+                        fitness2: np.ndarray) -> np.ndarray:
+        """Recombines genes1[i] with genes2[i] into the i-th row of the
+        returned array. fitness1 and fitness2 are the fitness of the parents,
+        already computed."""
+        ...
+
+
+class ArrayPopulation:
+    """Population backend that stores every chromosome in one contiguous array
+    so each operator runs once per generation over the whole breed.
+
+    Parents are paired at random and survivors are the best individuals among
+    parents and breed.
+    """
+    def __init__(self, genes: np.ndarray, crossover_prob: float,
+                 mutation_prob: float, breed_size: int, num_parent_pairs: int,
+                 maximize_fitness: bool, chromosome_cls: Type[ArrayChromosome],
+                 fitness_computer_cls: Type[ArrayFitnessComputer],
+                 mutator_cls: Type[ArrayMutator],
+                 recombiner_cls: Type[ArrayRecombiner],
+                 rng: Optional[np.random.Generator] = None,
+                 evaluation_counter: Optional[EvaluationCounter] = None
+                 ) -> None:
+        self.crossover_prob = crossover_prob
+        self.mutation_prob = mutation_prob
+        self.breed_size = breed_size
+        self.num_parent_pairs = num_parent_pairs
+        self.maximize_fitness = maximize_fitness
+        self.chromosome_cls = chromosome_cls
+        self.fitness_computer_cls = fitness_computer_cls
+        self.mutator_cls = mutator_cls
+        self.recombiner_cls = recombiner_cls
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.evaluation_counter = EvaluationCounter() \
+            if evaluation_counter is None else evaluation_counter
+        self.generation = 1
+
+        self.genes = genes
+        self.fitness = fitness_computer_cls.fitness_batch(genes)
+        self._stats: Optional[PopulationStats] = None
+        # Generation in which each individual was born
+        self.generations = np.ones(len(genes), dtype=np.int64)
+        self.evaluation_counter.add(len(genes))
+
+    def _offspring(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Internal method used to create the genes of the breed from the
+        current generation, and their fitness (NaN where it is not computed
+        yet)."""
+        size = len(self.genes)
+        breed_count = self.num_parent_pairs * self.breed_size
+
+        # A single individual can only be cloned (and maybe mutated)
+        if size == 1:
+            breed = np.repeat(self.genes, breed_count, axis=0)
+            breed_fitness = np.repeat(self.fitness, breed_count)
+        else:
+            parents1 = self.rng.integers(0, size, self.num_parent_pairs)
+            parents2 = (parents1 + self.rng.integers(
+                1, size, self.num_parent_pairs)) % size
+            parents1 = np.repeat(parents1, self.breed_size)
+            parents2 = np.repeat(parents2, self.breed_size)
+
+            # Children not recombined are clones of one of their parents
+            clones = np.where(
+                self.rng.random(breed_count) < 0.5, parents1, parents2)
+            breed = self.genes[clones]
+            breed_fitness = self.fitness[clones]
+
+            crossover = self.rng.random(breed_count) < self.crossover_prob
+            if crossover.any():
+                parents1 = parents1[crossover]
+                parents2 = parents2[crossover]
+                breed[crossover] = self.recombiner_cls.recombine_batch(
+                    self.genes[parents1], self.genes[parents2],
+                    self.fitness[parents1], self.fitness[parents2])
+                breed_fitness[crossover] = np.nan
+
+        mutation = self.rng.random(breed_count) < self.mutation_prob
+        if mutation.any():
+            breed[mutation], mutated_fitness = self.mutator_cls.mutate_batch(
+                breed[mutation], breed_fitness[mutation])
+            breed_fitness[mutation] = np.nan \
+                if mutated_fitness is None else mutated_fitness
+
+        return breed, breed_fitness
+
+    def evolve(self) -> None:
+        """Method used to evolve the population into the next generation"""
+        size = len(self.genes)
+        breed, breed_fitness = self._offspring()
+        # Only rows no operator evaluated are computed
+        unknown = np.isnan(breed_fitness)
+        if unknown.any():
+            breed_fitness[unknown] = self.fitness_computer_cls.fitness_batch(
+                breed[unknown])
+            self.evaluation_counter.add(int(np.count_nonzero(unknown)))
+
+        genes = np.concatenate((self.genes, breed))
+        fitness = np.concatenate((self.fitness, breed_fitness))
+        generations = np.concatenate(
+            (self.generations, np.full(len(breed), self.generation)))
+
+        survivors = self.best_indices(size, fitness)
+        self.genes = genes[survivors]
+        self.fitness = fitness[survivors]
+        self.generations = generations[survivors]
+        self.generation += 1
+        self._stats = None
+
+    @property
+    def num_fitness_computed(self) -> int:
+        return self.evaluation_counter.count
+
+    def restart_population(self) -> None:
+        size = len(self.genes)
+        self.genes = self.chromosome_cls.initialize_batch(size)
+        self.fitness = self.fitness_computer_cls.fitness_batch(self.genes)
+        self.evaluation_counter.add(size)
+        self._stats = None
+
+    def best_indices(self,
+                     k: int,
+                     fitness: Optional[np.ndarray] = None) -> np.ndarray:
+        """Indices of the k best individuals (of fitness, defaults to the
+        population fitness), best first."""
+        fitness = self.fitness if fitness is None else fitness
+        return np.array(best_indices(fitness, k, self.maximize_fitness),
+                        dtype=int)
+
+    @property
+    def stats(self) -> PopulationStats:
+        """Fitness statistics of the current generation, computed once."""
+        if self._stats is None:
+            self._stats = PopulationStats.from_fitness(self.fitness)
+        return self._stats
+
+    def avg_fitness(self) -> float:
+        return self.stats.mean
+
+    def sd_fitness(self) -> float:
+        return self.stats.sd
@@ -0,0 +1,43 @@
+from typing import Dict, Optional
+
+# custom_data key of the EvaluationCounter of an experiment
+EVALUATION_COUNTER = 'evaluation_counter'
+
+
+class EvaluationCounter:
+    """Counts the fitness evaluations of an experiment, in O(1) each, and tells
+    when max_evaluations (None for no limit) is reached.
+
+    Every evaluation counts, including the ones of individuals discarded by
+    survivor selection or replaced by a restart of the population.
+    """
+    def __init__(self, max_evaluations: Optional[int] = None) -> None:
+        self.max_evaluations = max_evaluations
+        self.count = 0
+
+    def add(self, number_evaluations: int = 1) -> None:
+        self.count += number_evaluations
+
+    def reset(self) -> None:
+        self.count = 0
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Evaluations left before the budget is exhausted, None when there is
+        no limit."""
+        if self.max_evaluations is None:
+            return None
+
+        return max(self.max_evaluations - self.count, 0)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_evaluations is not None \
+            and self.count >= self.max_evaluations
+
+
+def get_evaluation_counter(custom_data: Dict) -> Optional[EvaluationCounter]:
+    """EvaluationCounter in custom_data, None when evaluations are not
+    counted (individuals and operators used on their own)."""
+    counter: Optional[EvaluationCounter] = custom_data.get(EVALUATION_COUNTER)
+    return counter
@@ -0,0 +1,33 @@
+from typing import Any, Dict
+from os import replace
+import gzip
+import pickle
+
+# Incremented whenever the saved state changes in an incompatible way
+CHECKPOINT_VERSION = 2
+
+
+def save_checkpoint(state: Dict[str, Any], path: str) -> None:
+    """Writes state to path as a gzip compressed pickle. The file is replaced
+    at once, so a process killed while saving leaves the previous checkpoint
+    intact."""
+    temporary_path = '{}.tmp'.format(path)
+    with gzip.open(temporary_path, 'wb') as checkpoint_file:
+        pickle.dump(dict(version=CHECKPOINT_VERSION, state=state),
+                    checkpoint_file,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    replace(temporary_path, path)
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """Returns the state saved by save_checkpoint at path."""
+    with gzip.open(path, 'rb') as checkpoint_file:
+        checkpoint = pickle.load(checkpoint_file)
+
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(
+            'Checkpoint {} has version {}, expected {}.'.format(
+                path, checkpoint.get('version'), CHECKPOINT_VERSION))
+
+    state: Dict[str, Any] = checkpoint['state']
+    return state
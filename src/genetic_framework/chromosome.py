@@ -1,5 +1,6 @@
-from typing import List, Dict, Generic, TypeVar
+from typing import List, Dict, Generic, Hashable, Sequence, TypeVar
 from abc import ABC, abstractmethod
+from copy import copy
 """ TypeVariable for Generic types Chromosome, Phenotype, Genotype since each
 subclass of these will use its own data type to represent its internal data.
 """
@@ -77,10 +78,59 @@ PhenotypeT = TypeVar('PhenotypeT', bound=Phenotype)
 GenotypeT = TypeVar('GenotypeT', bound=Genotype)
 
 
+def copy_genes(genes: List[GenotypeT]) -> List[GenotypeT]:
+    """Returns new genes with the same data. Gene data is immutable (numbers,
+    strings and tuples), so genes are copied shallowly and keep sharing
+    custom_data."""
+    return [copy(gene) for gene in genes]
+
+
+SelfChromosome = TypeVar('SelfChromosome', bound='Chromosome')
+
+
 class Chromosome(Generic[PhenotypeT, GenotypeT], ABC):
+    """Subclasses store their genes in _genotypes. Copies made through copy
+    share them (copy-on-write): genotypes getter returns them read only,
+    without copying (callers must not change the genes it returns), code that
+    changes genes in place gets them through writable_genotypes, and
+    genotypes setter should store genes through _adopt_genotypes.
+    """
     @abstractmethod
     def __init__(self, custom_data: Dict = {}) -> None:
         self.custom_data = custom_data
+        self._genotypes: List[GenotypeT] = []
+        # Whether _genotypes may be shared with a copy of this chromosome
+        self._shared_genes = False
+
+    def copy(self: SelfChromosome) -> SelfChromosome:
+        """Returns a copy of this chromosome. Genes are only copied when either
+        chromosome accesses them for writing."""
+        new_chromosome = copy(self)
+        self._shared_genes = new_chromosome._shared_genes = True
+        return new_chromosome
+
+    def writable_genotypes(self) -> List[GenotypeT]:
+        """Returns the genes of this chromosome for changing them in place,
+        copying them first if they are shared with a copy of this
+        chromosome."""
+        if self._shared_genes:
+            self._genotypes = copy_genes(self._genotypes)
+            self._shared_genes = False
+        return self._genotypes
+
+    def _adopt_genotypes(self, genes: List[GenotypeT]) -> None:
+        """Internal method that stores genes as _genotypes. Genes are copied
+        unless they are already owned by this chromosome (as when mutators get
+        genotypes, change them and set them back)."""
+        if genes is not self._genotypes or self._shared_genes:
+            genes = copy_genes(genes)
+        self._genotypes = genes
+        self._shared_genes = False
+
+    def genes_key(self) -> Hashable:
+        """Returns a hashable value that is equal for chromosomes with equal
+        genes, without copying shared genes."""
+        return tuple(gene.data for gene in self._genotypes)
 
     @staticmethod
     @abstractmethod
@@ -99,7 +149,7 @@ class Chromosome(Generic[PhenotypeT, GenotypeT], ABC):
     # (https://github.com/python/mypy/issues/4165)
     @property  # type:ignore
     @abstractmethod
-    def genotypes(self) -> List[GenotypeT]:
+    def genotypes(self) -> Sequence[GenotypeT]:
         ...
 
     # (https://github.com/python/mypy/issues/4165)
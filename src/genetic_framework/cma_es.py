@@ -0,0 +1,212 @@
+from typing import Type, Optional, Tuple
+from math import log, sqrt
+import numpy as np  #type: ignore
+
+from genetic_framework.array_population import ArrayChromosome, ArrayFitnessComputer
+from genetic_framework.budget import EvaluationCounter
+from genetic_framework.population_stats import PopulationStats
+from genetic_framework.utils import best_indices
+
+
+def default_offspring_size(number_variables: int) -> int:
+    """Number of points CMA-ES samples per generation for number_variables
+    variables, when it is not specified."""
+    return 4 + int(3 * log(number_variables))
+
+
+class CMAESPopulation:
+    """Population backend of CMA-ES (Covariance Matrix Adaptation Evolution
+    Strategy). Instead of each chromosome carrying its own step sizes and
+    rotation angles, a single mean and covariance matrix (O(n^2) memory in
+    total) are adapted: every generation samples offspring_size rows of
+    variables from that distribution in one batch, and the best half moves
+    the mean and updates the covariance (rank-one and rank-mu updates) and the
+    global step size (cumulative step size adaptation).
+
+    Sampling goes through the eigendecomposition of the covariance, which is
+    only updated every few generations (once the covariance changed enough),
+    so large n costs O(n^2) per sampled row most generations.
+
+    Rows are the n variables of chromosome_cls (such as ArrayFloatChromosome).
+    The initial mean is the best of offspring_size rows from
+    chromosome_cls.initialize_batch. Sampled rows are clipped to bounds.
+    """
+    def __init__(self,
+                 chromosome_cls: Type[ArrayChromosome],
+                 fitness_computer_cls: Type[ArrayFitnessComputer],
+                 step_size: float,
+                 maximize_fitness: bool,
+                 offspring_size: Optional[int] = None,
+                 bounds: Optional[Tuple[float, float]] = None,
+                 rng: Optional[np.random.Generator] = None,
+                 evaluation_counter: Optional[EvaluationCounter] = None
+                 ) -> None:
+        if step_size <= 0:
+            raise ValueError(
+                'CMAESPopulation needs a positive step size ({}).'.format(
+                    step_size))
+
+        self.chromosome_cls = chromosome_cls
+        self.fitness_computer_cls = fitness_computer_cls
+        self.initial_step_size = step_size
+        self.maximize_fitness = maximize_fitness
+        self.bounds = bounds
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.evaluation_counter = EvaluationCounter() \
+            if evaluation_counter is None else evaluation_counter
+        self.generation = 1
+
+        genes = chromosome_cls.initialize_batch(offspring_size or 1)
+        n = genes.shape[1]
+        if offspring_size is None:
+            offspring_size = default_offspring_size(n)
+            genes = np.vstack(
+                (genes, chromosome_cls.initialize_batch(offspring_size - 1)))
+        if offspring_size < 2:
+            raise ValueError(
+                'CMAESPopulation needs at least 2 offspring ({}).'.format(
+                    offspring_size))
+        self.offspring_size = offspring_size
+
+        # Recombination weights of the best half, and strategy parameters
+        # (defaults of Hansen's CMA-ES tutorial)
+        num_parents = self.offspring_size // 2
+        weights = log(num_parents + 0.5) - np.log(np.arange(
+            1, num_parents + 1))
+        self.weights = weights / weights.sum()
+        self.mu_eff = 1 / float((self.weights**2).sum())
+        self.c_c = (4 + self.mu_eff / n) / (n + 4 + 2 * self.mu_eff / n)
+        self.c_s = (self.mu_eff + 2) / (n + self.mu_eff + 5)
+        self.c_1 = 2 / ((n + 1.3)**2 + self.mu_eff)
+        self.c_mu = min(
+            1 - self.c_1,
+            2 * (self.mu_eff - 2 + 1 / self.mu_eff) /
+            ((n + 2)**2 + self.mu_eff))
+        self.damps = 1 + 2 * max(0, sqrt(
+            (self.mu_eff - 1) / (n + 1)) - 1) + self.c_s
+        # Expected norm of a standard normal vector
+        self.chi_n = sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n**2))
+
+        self._reset(genes)
+
+    def _reset(self, genes: np.ndarray) -> None:
+        """Internal method that evaluates genes and restarts the distribution
+        from the best of them."""
+        n = genes.shape[1]
+        self.genes = self._clip(genes)
+        self.fitness = self.fitness_computer_cls.fitness_batch(self.genes)
+        self.evaluation_counter.add(len(self.genes))
+        self.generations = np.full(len(self.genes), self.generation)
+        self._stats: Optional[PopulationStats] = None
+
+        self.mean = self.genes[self.best_indices(1)[0]].copy()
+        self.step_size = self.initial_step_size
+        self.covariance = np.eye(n)
+        self.eigenvectors = np.eye(n)
+        self.sqrt_eigenvalues = np.ones(n)
+        self.path_c = np.zeros(n)
+        self.path_s = np.zeros(n)
+        self._evaluations_at_eigen = self.evaluation_counter.count
+        self._adapted_generations = 0
+
+    def _clip(self, genes: np.ndarray) -> np.ndarray:
+        if self.bounds is None:
+            return genes
+
+        return np.clip(genes, *self.bounds)
+
+    def _update_eigendecomposition(self) -> None:
+        """Internal method that decomposes the covariance for sampling, when
+        it changed enough since the last time (lazy update)."""
+        n = len(self.mean)
+        lag = self.offspring_size / (self.c_1 + self.c_mu) / n / 10
+        if self.evaluation_counter.count - self._evaluations_at_eigen <= lag:
+            return
+
+        self._evaluations_at_eigen = self.evaluation_counter.count
+        # Enforce symmetry against rounding errors
+        self.covariance = np.triu(self.covariance) + np.triu(
+            self.covariance, 1).T
+        eigenvalues, self.eigenvectors = np.linalg.eigh(self.covariance)
+        self.sqrt_eigenvalues = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+    def evolve(self) -> None:
+        """Samples and evaluates a new generation, and adapts the distribution
+        to its best half."""
+        self._update_eigendecomposition()
+        n = len(self.mean)
+        num_parents = len(self.weights)
+
+        # Steps from the mean, in the coordinates of the covariance and then
+        # in the variables coordinates
+        normal = self.rng.standard_normal((self.offspring_size, n))
+        steps = (normal * self.sqrt_eigenvalues) @ self.eigenvectors.T
+        genes = self._clip(self.mean + self.step_size * steps)
+        steps = (genes - self.mean) / self.step_size
+
+        fitness = self.fitness_computer_cls.fitness_batch(genes)
+        self.evaluation_counter.add(len(genes))
+        self.genes = genes
+        self.fitness = fitness
+        self.generations = np.full(len(genes), self.generation)
+        self._stats = None
+
+        parent_steps = steps[self.best_indices(num_parents)]
+        mean_step = self.weights @ parent_steps
+        self.mean = self.mean + self.step_size * mean_step
+
+        # Cumulation of the mean steps (whitened for the step size path)
+        self._adapted_generations += 1
+        whitened_step = self.eigenvectors @ (
+            (self.eigenvectors.T @ mean_step) / self.sqrt_eigenvalues)
+        self.path_s = (1 - self.c_s) * self.path_s + sqrt(
+            self.c_s * (2 - self.c_s) * self.mu_eff) * whitened_step
+        path_s_norm = float(np.linalg.norm(self.path_s))
+        # path_c stalls while path_s is too long (such as after large steps)
+        stalled = path_s_norm / sqrt(1 - (1 - self.c_s)**(
+            2 * self._adapted_generations)) / self.chi_n >= 1.4 + 2 / (n + 1)
+        self.path_c = (1 - self.c_c) * self.path_c
+        if not stalled:
+            self.path_c += sqrt(self.c_c *
+                                (2 - self.c_c) * self.mu_eff) * mean_step
+
+        # Rank-one update with path_c, rank-mu update with the parents
+        rank_one = np.outer(self.path_c, self.path_c)
+        if stalled:
+            rank_one += self.c_c * (2 - self.c_c) * self.covariance
+        rank_mu = (parent_steps.T * self.weights) @ parent_steps
+        self.covariance = (1 - self.c_1 - self.c_mu) * self.covariance \
+            + self.c_1 * rank_one + self.c_mu * rank_mu
+
+        self.step_size *= np.exp(
+            (self.c_s / self.damps) * (path_s_norm / self.chi_n - 1))
+        self.generation += 1
+
+    @property
+    def num_fitness_computed(self) -> int:
+        return self.evaluation_counter.count
+
+    def restart_population(self) -> None:
+        self._reset(self.chromosome_cls.initialize_batch(self.offspring_size))
+
+    def best_indices(self,
+                     k: int,
+                     fitness: Optional[np.ndarray] = None) -> np.ndarray:
+        """Indices of the k best rows of the current generation (of fitness,
+        defaults to its fitness), best first."""
+        fitness = self.fitness if fitness is None else fitness
+        return np.array(best_indices(fitness, k, self.maximize_fitness),
+                        dtype=int)
+
+    @property
+    def stats(self) -> PopulationStats:
+        """Fitness statistics of the current generation, computed once."""
+        if self._stats is None:
+            self._stats = PopulationStats.from_fitness(self.fitness)
+        return self._stats
+
+    def avg_fitness(self) -> float:
+        return self.stats.mean
+
+    def sd_fitness(self) -> float:
+        return self.stats.sd
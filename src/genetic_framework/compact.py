@@ -0,0 +1,183 @@
+from typing import Any, Dict, Hashable, List, Type, Iterator, Iterable
+from array import array
+from copy import copy
+import sys
+
+from genetic_framework.chromosome import Genotype
+
+
+class GeneView:
+    """Mixin for Genotype subclasses that keep their data in _data. Turns _data
+    into a view of the gene at position index of a CompactChromosome buffer,
+    so the Genotype data setter keeps validating values.
+
+    Subclasses whose data isn't a single buffer value (strings, tuples)
+    override _data to convert it.
+    """
+    def __init__(self,
+                 buffer: Any,
+                 index: int,
+                 custom_data: Dict = {}) -> None:
+        self.custom_data = custom_data
+        self._buffer = buffer
+        self._index = index
+
+    @property
+    def _data(self) -> Any:
+        return self._buffer[self._index]
+
+    @_data.setter
+    def _data(self, value: Any) -> None:
+        self._buffer[self._index] = value
+
+    def __copy__(self) -> Genotype:
+        # Copies own their data, instead of viewing the same buffer
+        genotype_cls: Any = next(
+            cls for cls in type(self).__mro__
+            if issubclass(cls, Genotype) and not issubclass(cls, GeneView))
+        gene: Genotype = genotype_cls(self.custom_data)
+        gene.__dict__.update({
+            name: value
+            for name, value in self.__dict__.items()
+            if name not in ('_buffer', '_index')
+        })
+        gene._data = self._data  # type: ignore
+        return gene
+
+
+class PackedBuffer:
+    """Sequence of length unsigned integers of item_size (1, 2 or 4) bytes,
+    packed in a single Python int: item i takes bits [i * bits, (i + 1) * bits)
+    of value, where bits is 8 * item_size.
+
+    Bitwise operations on value change several items at once and reading
+    every item is a single to_bytes call.
+    """
+    TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+
+    def __init__(self, length: int, item_size: int, value: int = 0) -> None:
+        if item_size not in PackedBuffer.TYPECODES:
+            raise ValueError(
+                'PackedBuffer items should have 1, 2 or 4 bytes ({}).'.format(
+                    item_size))
+
+        self.length = length
+        self.item_size = item_size
+        self.bits_per_item = 8 * item_size
+        self.item_mask = (1 << self.bits_per_item) - 1
+        self.value = value
+
+    @classmethod
+    def from_items(cls, items: Iterable[int],
+                   item_size: int) -> 'PackedBuffer':
+        packed = array(PackedBuffer.TYPECODES[item_size], items)
+        # Items are packed little endian, whatever the native byte order
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return cls(len(packed), item_size,
+                   int.from_bytes(packed.tobytes(), 'little'))
+
+    def tolist(self) -> List[int]:
+        packed = array(PackedBuffer.TYPECODES[self.item_size])
+        packed.frombytes(
+            self.value.to_bytes(self.length * self.item_size, 'little'))
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return packed.tolist()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> int:
+        return (self.value >> (index * self.bits_per_item)) & self.item_mask
+
+    def __setitem__(self, index: int, item: int) -> None:
+        if item < 0 or item > self.item_mask:
+            raise ValueError(
+                'Tried to store ({}) in a PackedBuffer of {} byte items.'.
+                format(item, self.item_size))
+
+        shift = index * self.bits_per_item
+        self.value = (self.value & ~(self.item_mask << shift)) | (item << shift)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.tolist())
+
+    def __copy__(self) -> 'PackedBuffer':
+        return PackedBuffer(self.length, self.item_size, self.value)
+
+
+class CompactChromosome:
+    """Mixin for Chromosome subclasses that stores every gene in a single
+    array.array buffer (values_per_gene values per gene) instead of one
+    Genotype object per gene.
+
+    _genotypes becomes a list of view_cls views created on demand, so the
+    chromosome code and operators written for Genotype objects work unchanged,
+    while bulk access to gene values is a slice of the buffer. Must come
+    before the Chromosome class in the bases.
+    Subclasses may store genes in another buffer type (such as PackedBuffer)
+    by overriding _new_buffer.
+    """
+    typecode = 'd'
+    values_per_gene = 1
+    view_cls: Type[GeneView]
+
+    _buffer: array
+    _shared_genes: bool
+    custom_data: Dict
+
+    def _new_buffer(self, size: int) -> Any:
+        """Internal method that returns a buffer of size zeros."""
+        return array(self.typecode, [0] * size)
+
+    def _new_view(self, buffer: Any, index: int) -> Any:
+        return self.view_cls(buffer, index, self.custom_data)
+
+    @property
+    def _genotypes(self) -> List[Any]:
+        # Views of a buffer that may be shared. Only meant to be read, writers
+        # go through writable_genotypes
+        buffer = self._buffer
+        return [
+            self._new_view(buffer, i)
+            for i in range(len(buffer) // self.values_per_gene)
+        ]
+
+    @_genotypes.setter
+    def _genotypes(self, genes: List[Any]) -> None:
+        buffer = self._new_buffer(len(genes) * self.values_per_gene)
+        for i, gene in enumerate(genes):
+            self._new_view(buffer, i)._data = gene.data
+
+        self._buffer = buffer
+        self._shared_genes = False
+
+    def _writable_buffer(self) -> Any:
+        """Internal method that returns _buffer, copying it first if it is
+        shared with a copy of this chromosome."""
+        if self._shared_genes:
+            self._buffer = copy(self._buffer)
+            self._shared_genes = False
+        return self._buffer
+
+    def writable_genotypes(self) -> List[Any]:
+        self._writable_buffer()
+        return self._genotypes
+
+    def _adopt_genotypes(self, genes: List[Any]) -> None:
+        # Values are always written into a new buffer
+        self._genotypes = genes
+
+    def genes_key(self) -> Hashable:
+        return tuple(self._buffer)
+
+    def _initialize_genes(self, number_genes: int) -> None:
+        """Internal method that replaces the buffer with number_genes genes
+        initialized by their Genotype.initialize."""
+        buffer = self._new_buffer(number_genes * self.values_per_gene)
+        for i in range(number_genes):
+            self._new_view(buffer, i).initialize()
+
+        self._buffer = buffer
+        self._shared_genes = False
@@ -1,13 +1,76 @@
-from typing import Dict
-from abc import ABC
+from typing import Any, Dict, Iterator, Optional, Type
+from abc import ABCMeta
+from contextlib import contextmanager
+from contextvars import ContextVar
 
+# custom_data key of the state adapted by operator classes
+OPERATOR_STATE = 'operator_state'
 
-class CustomDataHolder(ABC):
+
+class OperatorContext:
+    """custom_data of the operators of an experiment. While it is active (in
+    the current thread), operator classes read it as their custom_data instead
+    of the one set on the class, so experiments running in the same process
+    (back to back or in different threads) don't share it.
+    """
+    def __init__(self, custom_data: Dict) -> None:
+        self.custom_data = custom_data
+
+    @contextmanager
+    def activate(self) -> Iterator['OperatorContext']:
+        token = _active_context.set(self)
+        try:
+            yield self
+        finally:
+            _active_context.reset(token)
+
+
+_active_context: ContextVar[Optional[OperatorContext]] = ContextVar(
+    'operator_context', default=None)
+
+
+def get_active_context() -> Optional[OperatorContext]:
+    return _active_context.get()
+
+
+class CustomDataMeta(ABCMeta):
+    """Metaclass that resolves custom_data of CustomDataHolder classes: the
+    one of the active OperatorContext, or else the one given to
+    set_custom_data."""
+    @property
+    def custom_data(cls) -> Dict:
+        context = _active_context.get()
+        if context is not None:
+            return context.custom_data
+
+        custom_data: Dict = cls._custom_data  # type: ignore
+        return custom_data
+
+
+class CustomDataHolder(metaclass=CustomDataMeta):
     """Class that defines custom_data: data that some subclasses need to have
     in its class object, not in an instance.
+
+    Subclasses read it as cls.custom_data and keep what they adapt along an
+    experiment in get_operator_state, never in class attributes.
     """
-    custom_data: Dict = {}
+    _custom_data: Dict = {}
 
     @classmethod
     def set_custom_data(cls, custom_data: Dict) -> None:
-        cls.custom_data = custom_data
+        """Sets the custom_data used outside of any OperatorContext (such as
+        in worker processes)."""
+        cls._custom_data = custom_data
+
+
+def get_operator_state(custom_data: Dict, cls: Type,
+                       **initial_state: Any) -> Dict[str, Any]:
+    """State that operator class cls adapts along an experiment (such as the
+    step size of a mutator), kept in custom_data so each experiment adapts its
+    own. Starts as initial_state."""
+    states: Dict[str, Dict[str, Any]] = custom_data.setdefault(
+        OPERATOR_STATE, {})
+    key = '{}.{}'.format(cls.__module__, cls.__qualname__)
+    if key not in states:
+        states[key] = dict(initial_state)
+    return states[key]
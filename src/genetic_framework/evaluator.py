@@ -0,0 +1,198 @@
+from typing import Any, List, Type, Dict, Hashable, Optional, Tuple, Union
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from io import BytesIO
+from itertools import repeat
+from math import ceil
+from os import cpu_count
+import pickle
+
+from genetic_framework.chromosome import Chromosome
+from genetic_framework.custom_data import OperatorContext, get_active_context
+from genetic_framework.fitness import FitnessComputer
+from genetic_framework.individual import Individual
+from genetic_framework.fitness_cache import FitnessCache, get_fitness_cache
+
+# Number of chunks each worker receives per evaluation, when chunk size is not
+# specified. More than one balances uneven fitness costs between workers.
+CHUNKS_PER_WORKER = 4
+
+PoolExecutor = Union[ThreadPoolExecutor, ProcessPoolExecutor]
+
+# Persistent id that stands for custom_data in chromosomes sent to workers
+CUSTOM_DATA_ID = 'custom_data'
+
+
+class _ChunkPickler(pickle.Pickler):
+    """Pickles chromosomes without the custom_data they reference (such as
+    the FitnessCache), which worker processes already have."""
+    def __init__(self, file: BytesIO, custom_data: Dict) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.custom_data = custom_data
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        return CUSTOM_DATA_ID if obj is self.custom_data else None
+
+
+class _ChunkUnpickler(pickle.Unpickler):
+    """Unpickles chromosomes sent by _ChunkPickler, referencing custom_data of
+    the worker instead."""
+    def __init__(self, file: BytesIO, custom_data: Dict) -> None:
+        super().__init__(file)
+        self.custom_data = custom_data
+
+    def persistent_load(self, pid: Any) -> Dict:
+        if pid != CUSTOM_DATA_ID:
+            raise pickle.UnpicklingError(
+                'Unknown persistent id ({}).'.format(pid))
+        return self.custom_data
+
+
+def _dump_chunk(chromosomes: List[Chromosome], custom_data: Dict) -> bytes:
+    file = BytesIO()
+    _ChunkPickler(file, custom_data).dump(chromosomes)
+    return file.getvalue()
+
+
+def _evaluate_chunk(fitness_computer_cls: Type[FitnessComputer],
+                    context: Optional[OperatorContext],
+                    chromosomes: List[Chromosome]) -> List[float]:
+    if context is None:
+        return fitness_computer_cls.fitness_batch(chromosomes)
+
+    # Worker threads don't inherit the OperatorContext of the caller
+    with context.activate():
+        return fitness_computer_cls.fitness_batch(chromosomes)
+
+
+def _evaluate_dumped_chunk(fitness_computer_cls: Type[FitnessComputer],
+                           chunk: bytes) -> List[float]:
+    """_evaluate_chunk for a worker process, whose custom_data is the one its
+    fitness computer class was given by the initializer."""
+    chromosomes: List[Chromosome] = _ChunkUnpickler(
+        BytesIO(chunk), fitness_computer_cls.custom_data).load()
+    return fitness_computer_cls.fitness_batch(chromosomes)
+
+
+class FitnessEvaluator:
+    """Computes fitness for every unscored individual in one pass, through
+    FitnessComputer.fitness_batch. When custom_data has a FitnessCache,
+    chromosomes found in it are not computed again, and equal chromosomes are
+    computed once.
+
+    executor_cls: concurrent.futures Executor (ThreadPoolExecutor or
+        ProcessPoolExecutor) used to spread chunks of chromosomes among
+        max_workers workers. None evaluates everything in the calling thread.
+    chunk_size: Number of chromosomes sent to a worker at a time. Only
+        floats are returned. Worker processes receive chromosomes without
+        custom_data (which they get once, when started) and use their own.
+    """
+    def __init__(self,
+                 fitness_computer_cls: Type[FitnessComputer],
+                 custom_data: Dict = {},
+                 executor_cls: Optional[Type[PoolExecutor]] = None,
+                 max_workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None) -> None:
+        self.fitness_computer_cls = fitness_computer_cls
+        self.custom_data = custom_data
+        self.executor_cls = executor_cls
+        self.max_workers = max_workers or cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_cls is None:
+                raise ValueError('FitnessEvaluator has no executor class.')
+
+            if issubclass(self.executor_cls, ProcessPoolExecutor):
+                # Worker processes need custom_data set on their own copy of
+                # the fitness computer class. It is sent once per worker.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=self.fitness_computer_cls.set_custom_data,
+                    initargs=(self.custom_data, ))
+            else:
+                self._executor = self.executor_cls(
+                    max_workers=self.max_workers)
+
+        return self._executor
+
+    def evaluate(self, individuals: List[Individual]) -> None:
+        """Computes and stores fitness of individuals not evaluated yet."""
+        unscored = list({
+            id(individual): individual
+            for individual in individuals if not individual.is_evaluated
+        }.values())
+        cache = get_fitness_cache(self.custom_data)
+        # Individuals waiting for the fitness of an equal chromosome
+        clones: Dict[Hashable, List[Individual]] = {}
+        if cache is not None:
+            unscored, clones = self._scores_from_cache(unscored, cache)
+        if len(unscored) == 0:
+            return
+
+        chromosomes = [individual.chromosome for individual in unscored]
+
+        if self.executor_cls is None:
+            fitnesses = self.fitness_computer_cls.fitness_batch(chromosomes)
+        else:
+            chunk_size = self.chunk_size or ceil(
+                len(chromosomes) / (self.max_workers * CHUNKS_PER_WORKER))
+            chunks = [
+                chromosomes[i:i + chunk_size]
+                for i in range(0, len(chromosomes), chunk_size)
+            ]
+            if issubclass(self.executor_cls, ProcessPoolExecutor):
+                # Worker processes use the custom_data set by their
+                # initializer
+                chunk_fitnesses = self.executor.map(
+                    _evaluate_dumped_chunk, repeat(self.fitness_computer_cls),
+                    [_dump_chunk(chunk, self.custom_data) for chunk in chunks])
+            else:
+                chunk_fitnesses = self.executor.map(
+                    _evaluate_chunk, repeat(self.fitness_computer_cls),
+                    repeat(get_active_context()), chunks)
+            fitnesses = [
+                fitness for fitnesses_of_chunk in chunk_fitnesses
+                for fitness in fitnesses_of_chunk
+            ]
+
+        for individual, fitness in zip(unscored, fitnesses):
+            individual.set_fitness(fitness)
+            if cache is not None:
+                key = individual.fitness_key()
+                cache.put(key, fitness)
+                for clone in clones[key]:
+                    clone.set_fitness(fitness, count=False)
+
+    @staticmethod
+    def _scores_from_cache(
+        individuals: List[Individual], cache: FitnessCache
+    ) -> Tuple[List[Individual], Dict[Hashable, List[Individual]]]:
+        """Internal method that scores individuals whose chromosome is in
+        cache. Returns the ones left to compute (one per chromosome) and, by
+        key, the others with the same chromosome."""
+        to_compute = []
+        clones: Dict[Hashable, List[Individual]] = {}
+        for individual in individuals:
+            key = individual.fitness_key()
+            if key in clones:
+                # Counted as a hit, as it is not computed
+                cache.hits += 1
+                clones[key].append(individual)
+                continue
+
+            fitness = cache.get(key)
+            if fitness is None:
+                clones[key] = []
+                to_compute.append(individual)
+            else:
+                individual.set_fitness(fitness, count=False)
+
+        return to_compute, clones
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
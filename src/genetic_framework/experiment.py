@@ -1,7 +1,8 @@
-from typing import Type, Tuple, TypeVar, List, Dict, Any, Optional, get_args
-from collections import defaultdict
+from typing import Type, Tuple, TypeVar, List, Dict, Any, Callable, Optional, Union, get_args
 from operator import le, ge
 from threading import Thread
+from os.path import exists
+from functools import wraps
 
 from genetic_framework.fitness import FitnessComputer
 from genetic_framework.chromosome import Chromosome
@@ -9,11 +10,21 @@ from genetic_framework.mutator import Mutator
 from genetic_framework.recombiner import Recombiner
 from genetic_framework.selectors import SurvivorSelector, MatingSelector, SolutionSelector
 from genetic_framework.individual import Individual
-from genetic_framework.population import Population
+from genetic_framework.population import Population, SteadyStatePopulation
+from genetic_framework.array_population import ArrayPopulation, ArrayChromosome, ArrayFitnessComputer, ArrayMutator, ArrayRecombiner
+from genetic_framework.cma_es import CMAESPopulation
 from genetic_framework.statistics import StatisticsCollector
+from genetic_framework.evaluator import FitnessEvaluator, PoolExecutor
+from genetic_framework.randomness import RandomContext, RANDOM_CONTEXT
+from genetic_framework.budget import EvaluationCounter, EVALUATION_COUNTER
+from genetic_framework.fitness_cache import FitnessCache, FITNESS_CACHE
+from genetic_framework.custom_data import CustomDataHolder, OperatorContext
+from genetic_framework.checkpoint import save_checkpoint, load_checkpoint
 
 EPS = 1e-9
 
+T = TypeVar('T')
+
 
 # YOLO
 def listen_commands(control: Dict[str, Any]) -> None:
@@ -26,6 +37,17 @@ def listen_commands(control: Dict[str, Any]) -> None:
             control['running'] = False
 
 
+def in_operator_context(fn: Callable[..., T]) -> Callable[..., T]:
+    # Decorator for running Experiment methods with the experiment's
+    # OperatorContext active, so operator classes read its custom_data
+    @wraps(fn)
+    def wrapper(self, *args):
+        with self.operator_context.activate():
+            return fn(self, *args)
+
+    return wrapper
+
+
 # Check if cls class works with the specified chromosome type
 def is_correct_chromosome_type(cls: Type,
                                chromosome_cls: Type[Chromosome]) -> bool:
@@ -69,7 +91,42 @@ class Experiment:
                  survivor_selector_cls: Type[SurvivorSelector],
                  solution_selector_cls: Type[SolutionSelector],
                  stats_collector_types: List[Type[StatisticsCollector]],
-                 custom_data: Dict = {}) -> None:
+                 custom_data: Dict = {},
+                 batch_evaluation: bool = False,
+                 evaluation_executor_cls: Optional[Type[PoolExecutor]] = None,
+                 evaluation_workers: Optional[int] = None,
+                 evaluation_chunk_size: Optional[int] = None,
+                 seed: Optional[int] = None,
+                 steady_state: bool = False,
+                 replacement_tournament_size: Optional[int] = None,
+                 checkpoint_path: Optional[str] = None,
+                 checkpoint_interval: int = 10,
+                 fitness_cache: Optional[FitnessCache] = None) -> None:
+        """batch_evaluation: Compute fitness of every unscored individual of
+            a generation in one pass (through FitnessComputer.fitness_batch)
+            instead of lazily, one at a time. Implied by
+            evaluation_executor_cls.
+        evaluation_executor_cls: ThreadPoolExecutor or ProcessPoolExecutor
+            used to spread batch evaluation among evaluation_workers workers,
+            in chunks of evaluation_chunk_size chromosomes.
+        seed: Seed of the RandomContext used by the population and every
+            operator, chromosome and gene of the experiment (through
+            custom_data). Experiments with the same seed and arguments evolve
+            the same way. None for a random seed.
+        steady_state: Evolve through SteadyStatePopulation, which puts each
+            child in the population as soon as it is born (replacing the
+            worst individual, or the worst of replacement_tournament_size
+            random ones) instead of selecting survivors among a whole breed.
+            survivor_selector_cls is not used.
+        checkpoint_path: File where run_experiment saves its state every
+            checkpoint_interval generations and when it stops. When the file
+            already exists, run_experiment resumes from it instead of
+            starting over.
+        fitness_cache: FitnessCache shared by every individual (through
+            custom_data), so chromosomes evaluated before are not computed
+            (nor counted) again. None computes fitness of every new
+            chromosome.
+        """
         self.population_size = population_size
         self.max_generations = max_generations
         self.crossover_prob = crossover_prob
@@ -83,24 +140,33 @@ class Experiment:
         self.chromosome_cls = chromosome_cls
 
         self.fitness_computer_cls = fitness_computer_cls
-        self.fitness_computer_cls.set_custom_data(custom_data)
         self.maximize_fitness = maximize_fitness
-
         self.mutator_cls = mutator_cls
-        self.mutator_cls.set_custom_data(custom_data)
-
         self.recombiner_cls = recombiner_cls
-        self.recombiner_cls.set_custom_data(custom_data)
-
         self.mating_selector_cls = mating_selector_cls
-        self.mating_selector_cls.set_custom_data(custom_data)
-
         self.survivor_selector_cls = survivor_selector_cls
-        self.survivor_selector_cls.set_custom_data(custom_data)
-
         self.solution_selector_cls = solution_selector_cls
         self.stats_collector_types = stats_collector_types
         self.custom_data = custom_data
+        self.random_context = RandomContext(seed)
+        self.evaluation_counter = EvaluationCounter(max_fitness_computations)
+        self.fitness_cache = fitness_cache
+        self.operator_context = OperatorContext(custom_data)
+        self.set_custom_data()
+        self.batch_evaluation = batch_evaluation \
+            or evaluation_executor_cls is not None
+        self.evaluation_executor_cls = evaluation_executor_cls
+        self.evaluation_workers = evaluation_workers
+        self.evaluation_chunk_size = evaluation_chunk_size
+        self.steady_state = steady_state
+        self.replacement_tournament_size = replacement_tournament_size
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.fitness_evaluator: Optional[FitnessEvaluator] = None
+        # Why run_generation last asked to stop, None while it has not
+        self.stop_reason: Optional[str] = None
+        # Print progress every generation
+        self.verbose = True
 
         classes_to_be_validated = (
             (fitness_computer_cls, 'FitnessComputer'),
@@ -124,6 +190,7 @@ class Experiment:
             for i in range(self.population_size)
         ]
 
+    @in_operator_context
     def run_experiment(
             self) -> Tuple[List[Individual], List[StatisticsCollector]]:
         control = {'running': True}
@@ -132,12 +199,286 @@ class Experiment:
                                  args=(control, ))
         commands_thread.start()
 
+        if self.checkpoint_path is not None and exists(self.checkpoint_path):
+            self.load_checkpoint(self.checkpoint_path)
+            print('Resuming from checkpoint {} (generation {}).'.format(
+                self.checkpoint_path, self.population.generation))
+        else:
+            self.start()
+        try:
+            while self.stop_reason is None \
+                and self.population.generation <= self.max_generations \
+                and control['running']:
+                if self.run_generation():
+                    break
+                if self.checkpoint_path is not None \
+                    and self.population.generation % self.checkpoint_interval == 0:
+                    self.save_checkpoint(self.checkpoint_path)
+            else:
+                if self.stop_reason is not None:
+                    # Resumed from the checkpoint of a stopped experiment
+                    print(self.stop_reason)
+                else:
+                    print(
+                        "Maximum generations achieved: {:.3f} avg, {:.3f} standard deviation (fitness)."
+                        .format(self.population.avg_fitness(),
+                                self.population.sd_fitness()))
+
+            if self.checkpoint_path is not None:
+                self.save_checkpoint(self.checkpoint_path)
+            if self.fitness_cache is not None:
+                print(self.fitness_cache)
+        finally:
+            self.finish()
+
+        return (self.solution_selector.best_individuals,
+                self.statistics_collectors)
+
+    @property
+    def num_fitness_computations(self) -> int:
+        return self.evaluation_counter.count
+
+    def _operator_classes(self) -> Tuple[Type[CustomDataHolder], ...]:
+        return (self.fitness_computer_cls, self.mutator_cls,
+                self.recombiner_cls, self.mating_selector_cls,
+                self.survivor_selector_cls)
+
+    def set_custom_data(self) -> None:
+        """Puts the experiment RandomContext, EvaluationCounter and
+        FitnessCache in custom_data. Operator classes read it through the
+        experiment OperatorContext, active while the experiment runs, and it
+        is also set on them for code running outside of it (such as worker
+        processes)."""
+        self.custom_data[RANDOM_CONTEXT] = self.random_context
+        self.custom_data[EVALUATION_COUNTER] = self.evaluation_counter
+        if self.fitness_cache is not None:
+            self.custom_data[FITNESS_CACHE] = self.fitness_cache
+        for cls in self._operator_classes():
+            cls.set_custom_data(self.custom_data)
+
+    @in_operator_context
+    def start(self) -> None:
+        """Creates the first generation, solution selector and statistics
+        collectors, so the population can be evolved one generation at a time
+        with run_generation. Call finish when done."""
+        self.evaluation_counter.reset()
+        self._start_fitness_evaluator()
+
         initial_individuals = self._generate_initial_individuals()
-        population = Population(initial_individuals, self.crossover_prob,
-                                self.mutation_prob, self.breed_size,
-                                self.num_parent_pairs, self.maximize_fitness,
-                                self.mating_selector_cls,
-                                self.survivor_selector_cls)
+        population_args = (initial_individuals, self.crossover_prob,
+                           self.mutation_prob, self.breed_size,
+                           self.num_parent_pairs, self.maximize_fitness,
+                           self.mating_selector_cls,
+                           self.survivor_selector_cls, self.fitness_evaluator,
+                           self.random_context.random)
+        if self.steady_state:
+            self.population: Population = SteadyStatePopulation(
+                *population_args, self.evaluation_counter,
+                self.replacement_tournament_size)
+        else:
+            self.population = Population(*population_args)
+        self.solution_selector = self.solution_selector_cls(
+            self.num_solutions, self.maximize_fitness, self.custom_data)
+        self.statistics_collectors = [
+            collector_type(self.custom_data)
+            for collector_type in self.stats_collector_types
+        ]
+
+        # Count how many times sd was 0 in a row
+        self._zero_sd_counter = 0
+        self.stop_reason = None
+
+    def _start_fitness_evaluator(self) -> None:
+        self.fitness_evaluator = FitnessEvaluator(
+            self.fitness_computer_cls, self.custom_data,
+            self.evaluation_executor_cls, self.evaluation_workers,
+            self.evaluation_chunk_size) if self.batch_evaluation else None
+
+    def save_checkpoint(self, path: str) -> None:
+        """Saves everything run_generation changes (population, random number
+        generators, fitness budget, solutions, statistics and the state
+        adapted by operator classes) so the experiment can be continued
+        through load_checkpoint. Call between generations."""
+        save_checkpoint(
+            dict(custom_data=self.custom_data,
+                 population=self.population,
+                 solution_selector=self.solution_selector,
+                 statistics_collectors=self.statistics_collectors,
+                 zero_sd_counter=self._zero_sd_counter,
+                 stop_reason=self.stop_reason), path)
+
+    def load_checkpoint(self, path: str) -> None:
+        """Continues an experiment saved by save_checkpoint (with the same
+        arguments). Replaces start."""
+        state = load_checkpoint(path)
+
+        # Individuals, selectors and collectors share the saved custom_data
+        self.custom_data = state['custom_data']
+        self.random_context = self.custom_data[RANDOM_CONTEXT]
+        self.evaluation_counter = self.custom_data[EVALUATION_COUNTER]
+        self.fitness_cache = self.custom_data.get(FITNESS_CACHE)
+        self.operator_context.custom_data = self.custom_data
+        self.set_custom_data()
+
+        self._start_fitness_evaluator()
+        self.population = state['population']
+        self.population.fitness_evaluator = self.fitness_evaluator
+        self.solution_selector = state['solution_selector']
+        self.statistics_collectors = state['statistics_collectors']
+        self._zero_sd_counter = state['zero_sd_counter']
+        # Not saved by older checkpoints of experiments that were running
+        self.stop_reason = state.get('stop_reason')
+
+    @in_operator_context
+    def run_generation(self) -> bool:
+        """Evolves the population into the next generation. Returns True when
+        the experiment should stop (max number of fitness computations or
+        target fitness achieved)."""
+        population = self.population
+        self.custom_data['generation'] = population.generation
+        if self.verbose:
+            print(
+                "Evolving Generation {}: {} fitness computed, {:.3f} avg, {:.3f} standard deviation (fitness)."
+                .format(population.generation, self.num_fitness_computations,
+                        population.avg_fitness(), population.sd_fitness()))
+
+        population.evolve()
+        self.solution_selector.update_individuals(population.population)
+        for collector in self.statistics_collectors:
+            collector.collect_data_point(population, self.solution_selector)
+
+        if self.evaluation_counter.exhausted:
+            self.stop_reason = \
+                "Max number of fitness computations achieved ({}).".format(
+                    self.num_fitness_computations)
+        elif self.target_reached():
+            self.stop_reason = "Target fitness achieved ({}).".format(
+                self.solution_selector.target_individual.fitness())
+        if self.stop_reason is not None:
+            if self.verbose:
+                print(self.stop_reason)
+            return True
+        if float_equal(population.sd_fitness(), 0.0):
+            self._zero_sd_counter += 1
+        else:
+            self._zero_sd_counter = 0
+
+        if self.restart_zero_sd_tolerance is not None \
+            and self._zero_sd_counter >= self.restart_zero_sd_tolerance:
+            population.restart_population()
+
+        return False
+
+    @in_operator_context
+    def target_reached(self) -> bool:
+        fitness_comparator = ge if self.maximize_fitness else le
+        return self.target_fitness is not None and fitness_comparator(
+            self.solution_selector.target_individual.fitness(),
+            self.target_fitness)
+
+    def finish(self) -> None:
+        if self.fitness_evaluator is not None:
+            self.fitness_evaluator.shutdown()
+            self.fitness_evaluator = None
+
+
+class ArrayExperiment(Experiment):
+    """Experiment that evolves the population through ArrayPopulation. Takes
+    the same arguments as Experiment plus the array based counterparts of its
+    chromosome, fitness computer, mutator and recombiner classes.
+
+    Mating and survivor selectors are ignored (ArrayPopulation pairs parents
+    at random and keeps the best among parents and breed). Solutions are
+    converted back to Individuals of the list based classes.
+    """
+    def __init__(self, population_size: int, max_generations: int,
+                 crossover_prob: float, mutation_prob: float,
+                 target_fitness: Optional[float], num_solutions: int,
+                 breed_size: int, max_fitness_computations: int,
+                 num_parent_pairs: int,
+                 restart_zero_sd_tolerance: Optional[int],
+                 chromosome_cls: Type[Chromosome],
+                 fitness_computer_cls: Type[FitnessComputer],
+                 maximize_fitness: bool, mutator_cls: Type[Mutator],
+                 recombiner_cls: Type[Recombiner],
+                 mating_selector_cls: Type[MatingSelector],
+                 survivor_selector_cls: Type[SurvivorSelector],
+                 solution_selector_cls: Type[SolutionSelector],
+                 stats_collector_types: List[Type[StatisticsCollector]],
+                 custom_data: Dict,
+                 array_chromosome_cls: Type[ArrayChromosome],
+                 array_fitness_computer_cls: Type[ArrayFitnessComputer],
+                 array_mutator_cls: Type[ArrayMutator],
+                 array_recombiner_cls: Type[ArrayRecombiner],
+                 seed: Optional[int] = None) -> None:
+        super().__init__(population_size, max_generations, crossover_prob,
+                         mutation_prob, target_fitness, num_solutions,
+                         breed_size, max_fitness_computations,
+                         num_parent_pairs, restart_zero_sd_tolerance,
+                         chromosome_cls, fitness_computer_cls,
+                         maximize_fitness, mutator_cls, recombiner_cls,
+                         mating_selector_cls, survivor_selector_cls,
+                         solution_selector_cls, stats_collector_types,
+                         custom_data,
+                         seed=seed)
+        # Array operators that need fitness (such as adaptive mutators) use
+        # this one, instead of the list based 'fitness_computer'
+        self.custom_data['array_fitness_computer'] = array_fitness_computer_cls
+
+        self.array_chromosome_cls = array_chromosome_cls
+        self.array_chromosome_cls.set_custom_data(custom_data)
+
+        self.array_fitness_computer_cls = array_fitness_computer_cls
+        self.array_fitness_computer_cls.set_custom_data(custom_data)
+
+        self.array_mutator_cls = array_mutator_cls
+        self.array_mutator_cls.set_custom_data(custom_data)
+
+        self.array_recombiner_cls = array_recombiner_cls
+        self.array_recombiner_cls.set_custom_data(custom_data)
+
+    def _new_population(self) -> Union[ArrayPopulation, CMAESPopulation]:
+        """Internal method that returns the initial population evolved by
+        run_experiment."""
+        return ArrayPopulation(
+            self.array_chromosome_cls.initialize_batch(self.population_size),
+            self.crossover_prob, self.mutation_prob, self.breed_size,
+            self.num_parent_pairs, self.maximize_fitness,
+            self.array_chromosome_cls, self.array_fitness_computer_cls,
+            self.array_mutator_cls, self.array_recombiner_cls,
+            self.random_context.numpy, self.evaluation_counter)
+
+    def _best_individuals(
+            self, population: Union[ArrayPopulation,
+                                    CMAESPopulation]) -> List[Individual]:
+        """Internal method that converts the best rows of the population into
+        Individuals, so they can be handled by the solution selector."""
+        individuals = []
+        for i in population.best_indices(self.num_solutions):
+            individual = Individual(self.chromosome_cls,
+                                    self.fitness_computer_cls,
+                                    self.mutator_cls, self.recombiner_cls,
+                                    int(population.generations[i]),
+                                    self.custom_data)
+            individual.chromosome = self.array_chromosome_cls.to_chromosome(
+                population.genes[i])
+            # Already counted by the population
+            individual.set_fitness(float(population.fitness[i]), count=False)
+            individuals.append(individual)
+
+        return individuals
+
+    @in_operator_context
+    def run_experiment(
+            self) -> Tuple[List[Individual], List[StatisticsCollector]]:
+        control = {'running': True}
+        commands_thread = Thread(target=listen_commands,
+                                 daemon=True,
+                                 args=(control, ))
+        commands_thread.start()
+
+        self.evaluation_counter.reset()
+        population = self._new_population()
         solution_selector = self.solution_selector_cls(self.num_solutions,
                                                        self.maximize_fitness,
                                                        self.custom_data)
@@ -146,9 +487,6 @@ class Experiment:
             for collector_type in self.stats_collector_types
         ]
 
-        # Counts how many times fitness was called for each individual id
-        individual_num_fitness_computed: Dict[int, int] = defaultdict(int)
-        current_num_fitness_computations = 0
         # Count how many times sd was 0 in a row
         zero_sd_counter = 0
 
@@ -157,35 +495,27 @@ class Experiment:
             self.custom_data['generation'] = population.generation
             print(
                 "Evolving Generation {}: {} fitness computed, {:.3f} avg, {:.3f} standard deviation (fitness)."
-                .format(population.generation,
-                        current_num_fitness_computations,
+                .format(population.generation, population.num_fitness_computed,
                         population.avg_fitness(), population.sd_fitness()))
 
             population.evolve()
-            solution_selector.update_individuals(population.population)
+            solution_selector.update_individuals(
+                self._best_individuals(population))
             for collector in statistics_collectors:
                 collector.collect_data_point(population, solution_selector)
 
-            for individual in population.population:
-                if individual.num_fitness_computed != individual_num_fitness_computed[
-                        id(individual)]:
-                    individual_num_fitness_computed[id(
-                        individual)] = individual.num_fitness_computed
-            current_num_fitness_computations = sum(
-                individual_num_fitness_computed.values())
-
-            if current_num_fitness_computations >= self.max_fitness_computations:
+            if self.evaluation_counter.exhausted:
                 print(
                     "Max number of fitness computations achieved ({}).".format(
-                        current_num_fitness_computations))
+                        population.num_fitness_computed))
                 break
 
             fitness_comparator = ge if self.maximize_fitness else le
             if self.target_fitness is not None and fitness_comparator(
-                    solution_selector.best_individual.fitness(),
+                    solution_selector.target_individual.fitness(),
                     self.target_fitness):
                 print("Target fitness achieved ({}).".format(
-                    solution_selector.best_individual.fitness()))
+                    solution_selector.target_individual.fitness()))
                 break
             if float_equal(population.sd_fitness(), 0.0):
                 zero_sd_counter += 1
@@ -203,5 +533,96 @@ class Experiment:
         return (solution_selector.best_individuals, statistics_collectors)
 
 
+class CMAESExperiment(ArrayExperiment):
+    """ArrayExperiment that evolves a CMAESPopulation: one mean and covariance
+    matrix adapted for the whole population, instead of step sizes and
+    rotation angles in every chromosome. Takes the same arguments as
+    Experiment plus the array based counterparts of its chromosome (whose
+    rows must be just the variables) and fitness computer classes.
+
+    Every generation samples offspring_size rows (None for the CMA-ES default,
+    which grows with the logarithm of the number of variables), starting with
+    standard deviation step_size (None for 0.3 times the width of bounds).
+    Population size, breed size, parent pairs, probabilities, mutator,
+    recombiner and mating and survivor selectors are not used.
+    """
+    def __init__(self,
+                 population_size: int,
+                 max_generations: int,
+                 crossover_prob: float,
+                 mutation_prob: float,
+                 target_fitness: Optional[float],
+                 num_solutions: int,
+                 breed_size: int,
+                 max_fitness_computations: int,
+                 num_parent_pairs: int,
+                 restart_zero_sd_tolerance: Optional[int],
+                 chromosome_cls: Type[Chromosome],
+                 fitness_computer_cls: Type[FitnessComputer],
+                 maximize_fitness: bool,
+                 mutator_cls: Type[Mutator],
+                 recombiner_cls: Type[Recombiner],
+                 mating_selector_cls: Type[MatingSelector],
+                 survivor_selector_cls: Type[SurvivorSelector],
+                 solution_selector_cls: Type[SolutionSelector],
+                 stats_collector_types: List[Type[StatisticsCollector]],
+                 custom_data: Dict,
+                 array_chromosome_cls: Type[ArrayChromosome],
+                 array_fitness_computer_cls: Type[ArrayFitnessComputer],
+                 offspring_size: Optional[int] = None,
+                 step_size: Optional[float] = None,
+                 bounds: Optional[Tuple[float, float]] = None,
+                 seed: Optional[int] = None) -> None:
+        if step_size is None:
+            if bounds is None:
+                raise ValueError(
+                    'CMAESExperiment needs a step size or bounds.')
+            step_size = 0.3 * (bounds[1] - bounds[0])
+
+        # ArrayExperiment.__init__ is skipped, as there are no array mutator
+        # and recombiner classes to set up
+        Experiment.__init__(self,
+                            population_size,
+                            max_generations,
+                            crossover_prob,
+                            mutation_prob,
+                            target_fitness,
+                            num_solutions,
+                            breed_size,
+                            max_fitness_computations,
+                            num_parent_pairs,
+                            restart_zero_sd_tolerance,
+                            chromosome_cls,
+                            fitness_computer_cls,
+                            maximize_fitness,
+                            mutator_cls,
+                            recombiner_cls,
+                            mating_selector_cls,
+                            survivor_selector_cls,
+                            solution_selector_cls,
+                            stats_collector_types,
+                            custom_data,
+                            seed=seed)
+        self.custom_data['array_fitness_computer'] = array_fitness_computer_cls
+
+        self.array_chromosome_cls = array_chromosome_cls
+        self.array_chromosome_cls.set_custom_data(custom_data)
+
+        self.array_fitness_computer_cls = array_fitness_computer_cls
+        self.array_fitness_computer_cls.set_custom_data(custom_data)
+
+        self.offspring_size = offspring_size
+        self.step_size = step_size
+        self.bounds = bounds
+
+    def _new_population(self) -> CMAESPopulation:
+        return CMAESPopulation(self.array_chromosome_cls,
+                               self.array_fitness_computer_cls,
+                               self.step_size, self.maximize_fitness,
+                               self.offspring_size, self.bounds,
+                               self.random_context.numpy,
+                               self.evaluation_counter)
+
+
 def float_equal(f1: float, f2: float) -> bool:
     return abs(f1 - f2) < EPS
@@ -1,4 +1,4 @@
-from typing import Generic, Type
+from typing import Generic, Type, List
 from abc import ABC, abstractmethod
 
 from genetic_framework.chromosome import ChromosomeT
@@ -22,3 +22,10 @@ class FitnessComputer(Generic[ChromosomeT], CustomDataHolder, ABC):
         (Accordingly to the ChromosomeType specified at the class declaration)
         """
         ...
+
+    @classmethod
+    def fitness_batch(cls: Type, chromosomes: List[ChromosomeT]) -> List[float]:
+        """Computes fitness for every given Chromosome. Subclasses may override
+        it when scoring many chromosomes at once is cheaper than one by one.
+        """
+        return [cls.fitness(chromosome) for chromosome in chromosomes]
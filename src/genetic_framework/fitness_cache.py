@@ -0,0 +1,332 @@
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple, Type
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from hashlib import blake2b
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np  #type: ignore
+
+from genetic_framework.chromosome import Chromosome
+
+# custom_data key of the FitnessCache of an experiment
+FITNESS_CACHE = 'fitness_cache'
+
+# Shared memory of the SharedFitnessTables created by this process, by name
+_owned_memory: Dict[str, SharedMemory] = {}
+
+
+class SharedFitnessTable:
+    """Fitness values shared between processes (such as islands) through
+    shared memory: a fixed size open addressing table of 64 bit key hashes
+    (see key_hash) and fitness values. When the slots probed for a key are
+    full, the first one is overwritten.
+
+    Each slot also keeps a check word, the key hash XOR the bits of the
+    value, written along with them. Readers only return a value whose check
+    matches the key they look for, so slots torn by concurrent writes (a
+    hash of one write around the value of another) are misses, never values
+    of another key. Concurrent writes may lose entries, which only costs
+    evaluations.
+
+    Copies (unpickled in other processes) attach to the shared memory the
+    first time they are used. Only the table that created it frees it.
+    """
+    PROBES = 8
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError(
+                'SharedFitnessTable needs a positive capacity ({}).'.format(
+                    capacity))
+
+        self.capacity = capacity
+        self._owner = True
+        memory = SharedMemory(create=True, size=24 * capacity)
+        self._memory: Optional[SharedMemory] = memory
+        self.name = memory.name
+        _owned_memory[self.name] = memory
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray,
+                                     np.ndarray]] = None
+        self.arrays[0][:] = 0
+
+    @property
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Key hashes, bits of the fitness values and check words, mapped on
+        the shared memory."""
+        if self._arrays is None:
+            if self._memory is None:
+                self._memory = self._attach()
+
+            buffer = self._memory.buf
+
+            def column(i: int) -> np.ndarray:
+                return np.ndarray((self.capacity, ),
+                                  dtype=np.uint64,
+                                  buffer=buffer,
+                                  offset=8 * self.capacity * i)
+
+            self._arrays = (column(0), column(1), column(2))
+        return self._arrays
+
+    def _attach(self) -> SharedMemory:
+        if self.name in _owned_memory:
+            # Copy unpickled by the creator (such as in individuals sent back
+            # to it)
+            return _owned_memory[self.name]
+
+        # Child processes share the resource tracker of the creator, so
+        # attaching does not free the memory when they exit
+        return SharedMemory(name=self.name)
+
+    @staticmethod
+    def _update_hash(digest: Any, key: Any) -> None:
+        """Internal method that feeds the contents of key to digest: tuples
+        item by item, arrays as their raw bytes and anything else as its repr
+        (which numpy abbreviates for large arrays)."""
+        if isinstance(key, (tuple, list)):
+            digest.update('{}{}('.format(type(key).__name__,
+                                         len(key)).encode())
+            for item in key:
+                SharedFitnessTable._update_hash(digest, item)
+            digest.update(b')')
+        elif isinstance(key, np.ndarray):
+            digest.update('ndarray{}{}('.format(key.dtype.str,
+                                                key.shape).encode())
+            digest.update(np.ascontiguousarray(key).tobytes())
+            digest.update(b')')
+        else:
+            digest.update(repr(key).encode())
+            digest.update(b',')
+
+    @staticmethod
+    def key_hash(key: Hashable) -> int:
+        """Hash of key that is the same in every process (unlike hash)."""
+        digest = blake2b(digest_size=8)
+        SharedFitnessTable._update_hash(digest, key)
+        # 0 marks empty slots
+        return int.from_bytes(digest.digest(), 'little') or 1
+
+    def _slots(self, key_hash: int) -> Iterator[int]:
+        start = key_hash % self.capacity
+        return ((start + i) % self.capacity
+                for i in range(min(self.PROBES, self.capacity)))
+
+    def get(self, key_hash: int) -> Optional[float]:
+        hashes, values, checks = self.arrays
+        for slot in self._slots(key_hash):
+            slot_hash = int(hashes[slot])
+            if slot_hash == 0:
+                return None
+            if slot_hash == key_hash:
+                bits = int(values[slot])
+                if int(checks[slot]) != key_hash ^ bits:
+                    return None
+                return float(np.uint64(bits).view(np.float64))
+
+        return None
+
+    def put(self, key_hash: int, fitness: float) -> None:
+        hashes, values, checks = self.arrays
+        slots = list(self._slots(key_hash))
+        target = slots[0]
+        for slot in slots:
+            if int(hashes[slot]) in (0, key_hash):
+                target = slot
+                break
+
+        bits = int(np.float64(fitness).view(np.uint64))
+        hashes[target] = 0
+        values[target] = bits
+        checks[target] = key_hash ^ bits
+        hashes[target] = key_hash
+
+    def close(self) -> None:
+        """Detaches from the shared memory, and frees it when this table
+        created it."""
+        self._arrays = None
+        if self._memory is not None:
+            self._memory.close()
+            if self._owner:
+                del _owned_memory[self.name]
+                self._memory.unlink()
+            self._memory = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return dict(name=self.name, capacity=self.capacity)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.name = state['name']
+        self.capacity = state['capacity']
+        self._owner = False
+        self._memory = None
+        self._arrays = None
+
+
+class FitnessCache(ABC):
+    """Fitness of the chromosomes evaluated by an experiment, by genes, so
+    individuals with equal chromosomes (clones, or chromosomes found again in
+    later generations) are evaluated once. Keeps at most max_size fitness
+    values, evicted as subclasses define.
+
+    shared_table: SharedFitnessTable looked up on misses and filled with every
+        fitness computed, so other processes can reuse them.
+    """
+    def __init__(self,
+                 max_size: int,
+                 shared_table: Optional[SharedFitnessTable] = None) -> None:
+        self.max_size = max_size
+        self.shared_table = shared_table
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(fitness_computer_cls: Type,
+            chromosome: Chromosome) -> Hashable:
+        return (fitness_computer_cls.__qualname__,
+                type(chromosome).__qualname__, chromosome.genes_key())
+
+    @abstractmethod
+    def _get(self, key: Hashable) -> Optional[float]:
+        """Internal method that returns the fitness kept for key, if any, and
+        records the access for eviction."""
+        ...
+
+    @abstractmethod
+    def _put(self, key: Hashable, fitness: float) -> None:
+        """Internal method that keeps fitness for key, evicting another one
+        when the cache is full."""
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def get(self, key: Hashable) -> Optional[float]:
+        fitness = self._get(key)
+        if fitness is not None:
+            self.hits += 1
+            return fitness
+
+        if self.shared_table is not None:
+            fitness = self.shared_table.get(self.shared_table.key_hash(key))
+            if fitness is not None:
+                self.shared_hits += 1
+                self._put(key, fitness)
+                return fitness
+
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, fitness: float) -> None:
+        """Keeps a fitness just computed."""
+        self._put(key, fitness)
+        if self.shared_table is not None:
+            self.shared_table.put(self.shared_table.key_hash(key), fitness)
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.shared_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that avoided an evaluation."""
+        if self.lookups == 0:
+            return 0.0
+
+        return (self.hits + self.shared_hits) / self.lookups
+
+    def __str__(self) -> str:
+        return '{}: {} hits, {} shared hits, {} misses ({:.1%} hit rate), ' \
+            '{} fitness values kept.'.format(type(self).__name__, self.hits,
+                                             self.shared_hits, self.misses,
+                                             self.hit_rate, len(self))
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class LRUFitnessCache(FitnessCache):
+    """Evicts the least recently used fitness."""
+    def __init__(self,
+                 max_size: int,
+                 shared_table: Optional[SharedFitnessTable] = None) -> None:
+        super().__init__(max_size, shared_table)
+        self._entries: 'OrderedDict[Hashable, float]' = OrderedDict()
+
+    def _get(self, key: Hashable) -> Optional[float]:
+        fitness = self._entries.get(key)
+        if fitness is not None:
+            self._entries.move_to_end(key)
+        return fitness
+
+    def _put(self, key: Hashable, fitness: float) -> None:
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = fitness
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LFUFitnessCache(FitnessCache):
+    """Evicts the least frequently used fitness (the least recently used one
+    among ties), in O(1)."""
+    def __init__(self,
+                 max_size: int,
+                 shared_table: Optional[SharedFitnessTable] = None) -> None:
+        super().__init__(max_size, shared_table)
+        # (fitness, number of uses) by key
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+        # Keys by number of uses, least recently used first
+        self._uses: Dict[int, 'OrderedDict[Hashable, None]'] = defaultdict(
+            OrderedDict)
+        self._min_uses = 0
+
+    def _get(self, key: Hashable) -> Optional[float]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        fitness, uses = entry
+        keys = self._uses[uses]
+        del keys[key]
+        if len(keys) == 0:
+            del self._uses[uses]
+            if self._min_uses == uses:
+                self._min_uses += 1
+
+        self._uses[uses + 1][key] = None
+        self._entries[key] = (fitness, uses + 1)
+        return fitness
+
+    def _put(self, key: Hashable, fitness: float) -> None:
+        if self.max_size <= 0:
+            return
+
+        if key in self._entries:
+            self._entries[key] = (fitness, self._entries[key][1])
+            return
+
+        if len(self._entries) >= self.max_size:
+            keys = self._uses[self._min_uses]
+            evicted, _ = keys.popitem(last=False)
+            if len(keys) == 0:
+                del self._uses[self._min_uses]
+            del self._entries[evicted]
+
+        self._entries[key] = (fitness, 1)
+        self._uses[1][key] = None
+        self._min_uses = 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_fitness_cache(custom_data: Dict) -> Optional[FitnessCache]:
+    """FitnessCache in custom_data, None when fitness is not cached."""
+    cache: Optional[FitnessCache] = custom_data.get(FITNESS_CACHE)
+    return cache
@@ -1,10 +1,13 @@
-from typing import Generic, Dict, Type
-from functools import lru_cache
+from typing import Generic, Dict, Hashable, Type, Optional
+from copy import copy
 
 from genetic_framework.chromosome import ChromosomeT
 from genetic_framework.fitness import FitnessComputer
 from genetic_framework.mutator import Mutator
 from genetic_framework.recombiner import Recombiner
+from genetic_framework.budget import get_evaluation_counter
+from genetic_framework.fitness_cache import FitnessCache, get_fitness_cache
+from genetic_framework.operator_fitness import known_fitness
 
 
 class Individual(Generic[ChromosomeT]):
@@ -30,41 +33,114 @@ class Individual(Generic[ChromosomeT]):
         self.custom_data = custom_data
 
         self.num_fitness_computed = 0
+        self._fitness: Optional[float] = None
         self._chromosome = self.chromosome_cls(custom_data)
 
     def initialize(self) -> 'Individual':
         self.chromosome.initialize()
-        self.fitness.cache_clear()
+        self._clear_fitness()
         return self
 
+    def _clear_fitness(self) -> None:
+        """Internal method that marks fitness as unknown, once the chromosome
+        changes. Only this individual is affected."""
+        self._fitness = None
+
     @property
     def chromosome(self) -> ChromosomeT:
         return self._chromosome
 
     @chromosome.setter
     def chromosome(self, new_chromosome: ChromosomeT) -> None:
-        self.fitness.cache_clear()
+        self._clear_fitness()
         self._chromosome = new_chromosome
 
-    # Caches fitness computation to avoid wasting CPU time
-    @lru_cache
-    def fitness(self) -> float:
+    @property
+    def is_evaluated(self) -> bool:
+        """Whether fitness is already known for the current chromosome."""
+        return self._fitness is not None
+
+    def set_fitness(self, fitness: float, count: bool = True) -> None:
+        """Stores a fitness computed elsewhere (for example by a
+        FitnessEvaluator) for the current chromosome. count is False when the
+        evaluation was already counted."""
+        if count:
+            self._count_evaluation()
+        self._fitness = fitness
+
+    def _count_evaluation(self) -> None:
+        """Internal method that counts a fitness evaluation of this individual
+        and of the experiment it belongs to."""
         self.num_fitness_computed += 1
-        return self.fitness_computer_cls.fitness(self.chromosome)
+        counter = get_evaluation_counter(self.custom_data)
+        if counter is not None:
+            counter.add()
+
+    def fitness_key(self) -> Hashable:
+        """Key of the current chromosome in a FitnessCache."""
+        return FitnessCache.key(self.fitness_computer_cls, self.chromosome)
+
+    def fitness(self) -> float:
+        """Fitness of the current chromosome, computed once and kept until the
+        chromosome changes (None in _fitness marks it as unknown)."""
+        if self._fitness is None:
+            # Chromosomes already evaluated by the experiment are not counted
+            cache = get_fitness_cache(self.custom_data)
+            if cache is None:
+                fitness = None
+            else:
+                key = self.fitness_key()
+                fitness = cache.get(key)
+            if fitness is None:
+                self._count_evaluation()
+                fitness = self.fitness_computer_cls.fitness(self.chromosome)
+                if cache is not None:
+                    cache.put(key, fitness)
+            self._fitness = fitness
+        return self._fitness
+
+    def _known_fitness(self,
+                       *individuals: 'Individual') -> Dict[Hashable, float]:
+        """Internal method that returns the fitness already known for
+        individuals, by FitnessCache key (see known_fitness)."""
+        return {
+            individual.fitness_key(): individual.fitness()
+            for individual in individuals if individual.is_evaluated
+        }
 
     def self_mutate(self) -> 'Individual':
         """Use mutator to change this individual chromosome and return itself"""
-        self.mutator_cls.mutate_inplace(self.chromosome)
-        self.fitness.cache_clear()
+        if not self.mutator_cls.uses_fitness:
+            self.mutator_cls.mutate_inplace(self.chromosome)
+            self._clear_fitness()
+            return self
+
+        # Fitness the mutator computed for the mutated chromosome (already
+        # counted) is kept, if any
+        with known_fitness(self.custom_data,
+                           self._known_fitness(self)) as known:
+            self.mutator_cls.mutate_inplace(self.chromosome)
+        self._fitness = known.get(self.fitness_key())
         return self
 
     def recombine(self, other: 'Individual') -> 'Individual':
         """Use recombiner to combine this individual with other argument
         to generate a new individual"""
-        new_chromosome = self.recombiner_cls.recombine(self.chromosome,\
-                other.chromosome)
-
-        return self.new_individual(new_chromosome, self.generation + 1)
+        if not self.recombiner_cls.uses_fitness:
+            new_chromosome = self.recombiner_cls.recombine(self.chromosome,\
+                    other.chromosome)
+            return self.new_individual(new_chromosome, self.generation + 1)
+
+        with known_fitness(self.custom_data,
+                           self._known_fitness(self, other)) as known:
+            new_chromosome = self.recombiner_cls.recombine(
+                self.chromosome, other.chromosome)
+        new_individual = self.new_individual(new_chromosome,
+                                             self.generation + 1)
+        fitness = known.get(new_individual.fitness_key())
+        if fitness is not None:
+            new_individual.set_fitness(fitness, count=False)
+        return new_individual
 
     def new_individual(self,
                        chromosome: ChromosomeT,
@@ -79,6 +155,13 @@ class Individual(Generic[ChromosomeT]):
 
         return new_individual
 
+    def clone(self) -> 'Individual':
+        """Returns a copy of this individual, fitness included. Its chromosome
+        shares genes with this one until either of them is changed."""
+        new_individual = copy(self)
+        new_individual._chromosome = self.chromosome.copy()
+        return new_individual
+
     def __str__(self) -> str:
         return str(self.chromosome)
 
@@ -0,0 +1,271 @@
+from typing import List, Tuple, Type, Dict, Any, Optional
+from abc import ABC, abstractmethod
+from multiprocessing import Process, Pipe
+from multiprocessing.connection import Connection
+from random import Random
+from threading import Thread
+
+from genetic_framework.experiment import Experiment, ArrayExperiment, listen_commands
+from genetic_framework.individual import Individual
+from genetic_framework.randomness import RandomContext
+from genetic_framework.fitness_cache import SharedFitnessTable
+from genetic_framework.statistics import StatisticsCollector
+
+# Commands sent from IslandExperiment to island processes
+EVOLVE = 'evolve'
+FINISH = 'finish'
+
+
+def _receive(connection: Connection, process: Process) -> Any:
+    """Receives the next message of the island run by process. Fails with the
+    exit code of the process if it exited instead of replying."""
+    try:
+        return connection.recv()
+    except EOFError:
+        process.join()
+        raise RuntimeError(
+            'Island process exited with code {} before replying.'.format(
+                process.exitcode))
+
+
+class MigrationTopology(ABC):
+    """Defines which islands receive the migrants of each island."""
+    @staticmethod
+    @abstractmethod
+    def destinations(island: int, num_islands: int, rng: Random) -> List[int]:
+        """Returns the indices of the islands that receive migrants from the
+        specified island (rng for topologies that pick them at random)."""
+        ...
+
+
+class RingTopology(MigrationTopology):
+    @staticmethod
+    def destinations(island: int, num_islands: int, _: Random) -> List[int]:
+        if num_islands < 2:
+            return []
+
+        return [(island + 1) % num_islands]
+
+
+class FullyConnectedTopology(MigrationTopology):
+    @staticmethod
+    def destinations(island: int, num_islands: int, _: Random) -> List[int]:
+        return [i for i in range(num_islands) if i != island]
+
+
+class RandomTopology(MigrationTopology):
+    # A single destination, drawn again at every migration
+    @staticmethod
+    def destinations(island: int, num_islands: int, rng: Random) -> List[int]:
+        if num_islands < 2:
+            return []
+
+        return [(island + rng.randrange(1, num_islands)) % num_islands]
+
+
+def _run_island(experiment: Experiment, num_migrants: int,
+                connection: Connection) -> None:
+    """Evolves an island in its own process, migration_interval generations at
+    a time, as commanded through connection. After each command, answers with
+    (emigrants, best fitness, fitness computations, stopped, target reached).
+    When finished, sends solutions, statistics and fitness cache metrics.
+    """
+    experiment.set_custom_data()
+    experiment.verbose = False
+    experiment.start()
+    stopped = False
+
+    # Immigrants are evaluated and emigrants ranked outside run_generation
+    with experiment.operator_context.activate():
+        try:
+            while True:
+                command, payload = connection.recv()
+                if command == FINISH:
+                    break
+
+                generations, immigrants = payload
+                population = experiment.population
+                if len(immigrants) > 0:
+                    population.replace_worst(immigrants)
+
+                for _ in range(generations):
+                    stopped = stopped \
+                        or population.generation > experiment.max_generations
+                    if stopped:
+                        break
+                    stopped = experiment.run_generation()
+                stopped = stopped \
+                    or population.generation > experiment.max_generations
+
+                emigrants = sorted(population.population,
+                                   key=lambda individual: individual.fitness(),
+                                   reverse=experiment.maximize_fitness)
+                connection.send(
+                    (emigrants[:num_migrants],
+                     experiment.solution_selector.best_individual.fitness(),
+                     experiment.num_fitness_computations, stopped,
+                     experiment.target_reached()))
+        finally:
+            experiment.finish()
+
+    connection.send((experiment.solution_selector.best_individuals,
+                     experiment.statistics_collectors,
+                     None if experiment.fitness_cache is None else str(
+                         experiment.fitness_cache)))
+
+
+class IslandExperiment:
+    """Evolves several experiments (islands) at the same time, each one in its
+    own process and with its own operators and selectors.
+
+    Every migration_interval generations, copies of the num_migrants best
+    individuals of each island replace the worst individuals of the islands
+    given by topology_cls. Stops when any island achieves the target fitness or
+    every island stopped. Solutions and statistics of every island are merged.
+
+    Islands get independent streams spawned from the RandomContext of seed
+    (replacing their own), so runs with the same seed are reproducible.
+
+    shared_fitness_cache_size: Capacity of a SharedFitnessTable shared by the
+        fitness caches of every island, so islands reuse fitness computed by
+        the others. 0 keeps fitness caches apart.
+    """
+    def __init__(self,
+                 islands: List[Experiment],
+                 migration_interval: int,
+                 num_migrants: int,
+                 topology_cls: Type[MigrationTopology],
+                 seed: Optional[int] = None,
+                 shared_fitness_cache_size: int = 0) -> None:
+        if len(islands) == 0:
+            raise ValueError('IslandExperiment needs at least one island.')
+        for island in islands:
+            if isinstance(island, ArrayExperiment):
+                raise TypeError('{} can not be used as an island.'.format(
+                    type(island).__name__))
+            if shared_fitness_cache_size > 0 and island.fitness_cache is None:
+                raise ValueError(
+                    'Islands need a fitness cache to share fitness values.')
+
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.num_migrants = num_migrants
+        self.topology_cls = topology_cls
+        self.shared_fitness_cache_size = shared_fitness_cache_size
+        self.random_context = RandomContext(seed)
+        for island, island_context in zip(
+                islands, self.random_context.spawn(len(islands))):
+            island.random_context = island_context
+
+    def _migrate(self,
+                 emigrants: List[List[Individual]]) -> List[List[Individual]]:
+        """Internal method that returns the individuals each island receives
+        from the others."""
+        immigrants: List[List[Individual]] = [[] for _ in emigrants]
+        for island, island_emigrants in enumerate(emigrants):
+            for destination in self.topology_cls.destinations(
+                    island, len(emigrants), self.random_context.random):
+                immigrants[destination].extend(island_emigrants)
+
+        return immigrants
+
+    def _evolve_islands(self, connections: List[Connection],
+                        processes: List[Process],
+                        control: Dict[str, Any]) -> None:
+        """Internal method that evolves islands until they stop, exchanging
+        migrants between them."""
+        immigrants: List[List[Individual]] = [[] for _ in connections]
+        generation = 1
+
+        while control['running']:
+            for connection, island_immigrants in zip(connections, immigrants):
+                connection.send(
+                    (EVOLVE, (self.migration_interval, island_immigrants)))
+            reports = [
+                _receive(connection, process)
+                for connection, process in zip(connections, processes)
+            ]
+            generation += self.migration_interval
+
+            print(
+                "Migrating at Generation {}: {} fitness computed, {} best fitness per island."
+                .format(
+                    generation, sum(report[2] for report in reports),
+                    ', '.join('{:.3f}'.format(report[1])
+                              for report in reports)))
+
+            if any(report[4] for report in reports):
+                best = max if self.islands[0].maximize_fitness else min
+                best_fitness = best(report[1] for report in reports)
+                print("Target fitness achieved ({}).".format(best_fitness))
+                break
+            if all(report[3] for report in reports):
+                print("Every island stopped evolving.")
+                break
+
+            immigrants = self._migrate([report[0] for report in reports])
+
+    def run_experiment(
+            self) -> Tuple[List[Individual], List[StatisticsCollector]]:
+        control = {'running': True}
+        commands_thread = Thread(target=listen_commands,
+                                 daemon=True,
+                                 args=(control, ))
+        commands_thread.start()
+
+        shared_table = None
+        if self.shared_fitness_cache_size > 0:
+            shared_table = SharedFitnessTable(self.shared_fitness_cache_size)
+            for island in self.islands:
+                assert island.fitness_cache is not None
+                island.fitness_cache.shared_table = shared_table
+
+        connections: List[Connection] = []
+        processes: List[Process] = []
+        for island in self.islands:
+            connection, island_connection = Pipe()
+            process = Process(target=_run_island,
+                              args=(island, self.num_migrants,
+                                    island_connection))
+            process.start()
+            # Only the island holds its end, so recv fails once it exits
+            island_connection.close()
+            connections.append(connection)
+            processes.append(process)
+
+        try:
+            self._evolve_islands(connections, processes, control)
+            for connection in connections:
+                connection.send((FINISH, None))
+            results = [
+                _receive(connection, process)
+                for connection, process in zip(connections, processes)
+            ]
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+            if shared_table is not None:
+                shared_table.close()
+
+        for i, (_, _, fitness_cache) in enumerate(results):
+            if fitness_cache is not None:
+                print('Island {}: {}'.format(i + 1, fitness_cache))
+
+        first_island = self.islands[0]
+        solution_selector = first_island.solution_selector_cls(
+            first_island.num_solutions, first_island.maximize_fitness,
+            first_island.custom_data)
+        for best_individuals, _, _ in results:
+            solution_selector.update_individuals(best_individuals)
+
+        statistics_collectors = [
+            type(collectors[0]).merge(list(collectors),
+                                      first_island.maximize_fitness)
+            for collectors in zip(*(result[1] for result in results))
+        ]
+
+        return (solution_selector.best_individuals, statistics_collectors)
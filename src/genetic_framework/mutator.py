@@ -1,10 +1,9 @@
 from typing import Generic, Type
 from abc import ABC, abstractmethod
-from copy import deepcopy
-from random import randint
 
 from genetic_framework.chromosome import ChromosomeT, Chromosome
 from genetic_framework.custom_data import CustomDataHolder
+from genetic_framework.randomness import get_random
 
 
 class Mutator(Generic[ChromosomeT], CustomDataHolder, ABC):
@@ -16,14 +15,20 @@ class Mutator(Generic[ChromosomeT], CustomDataHolder, ABC):
 
     Then, mutate and mutate_inplace methods can receive SubClassChromosome 
     safely typechecked.
+
+    Subclasses that read fitness (through operator_fitness) set uses_fitness,
+    so the fitness known for the chromosome before and after mutation is
+    shared with its Individual.
     """
+    uses_fitness = False
+
     @classmethod
     def mutate(cls: Type, chromosome: ChromosomeT) -> ChromosomeT:
         """Mutate a given chromosome into a new one. Subclasses should specify
         the correct type of Chromosome as parameter. 
         (Accordingly to the ChromosomeType specified at the class declaration)
         """
-        new_chromosome = deepcopy(chromosome)
+        new_chromosome = chromosome.copy()
         cls.mutate_inplace(new_chromosome)
         return new_chromosome
 
@@ -41,13 +46,14 @@ class SwapGeneMutator(Mutator[Chromosome], ABC):
     @classmethod
     def mutate_inplace(cls: Type, chromosome: Chromosome) -> None:
         number_genes = len(chromosome.genotypes)
+        rng = get_random(cls.custom_data)
 
-        r1 = randint(0, number_genes - 1)
-        r2 = randint(0, number_genes - 1)
+        r1 = rng.randint(0, number_genes - 1)
+        r2 = rng.randint(0, number_genes - 1)
         while r1 == r2:
-            r2 = randint(0, number_genes - 1)
+            r2 = rng.randint(0, number_genes - 1)
 
-        genes = chromosome.genotypes
+        genes = chromosome.writable_genotypes()
 
         # Swap genes
         genes[r1], genes[r2] = genes[r2], genes[r1]
@@ -58,11 +64,12 @@ class SwapGeneRangeMutator(Mutator[Chromosome], ABC):
     @classmethod
     def mutate_inplace(cls: Type, chromosome: Chromosome) -> None:
         number_genes = len(chromosome.genotypes)
+        rng = get_random(cls.custom_data)
 
-        l = randint(0, number_genes - 1)
-        r = randint(l, number_genes - 1)
+        l = rng.randint(0, number_genes - 1)
+        r = rng.randint(l, number_genes - 1)
 
-        genes = chromosome.genotypes
+        genes = chromosome.writable_genotypes()
         _range = genes[l:r + 1]
         _range.reverse()
 
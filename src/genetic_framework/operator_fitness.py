@@ -0,0 +1,75 @@
+from typing import Dict, Hashable, Iterator, Optional, Type
+from contextlib import contextmanager
+import numpy as np  #type: ignore
+
+from genetic_framework.chromosome import Chromosome
+from genetic_framework.budget import get_evaluation_counter
+from genetic_framework.fitness_cache import FitnessCache, get_fitness_cache
+
+# custom_data key of the fitness known for the chromosomes an operator is
+# working on, by FitnessCache key
+KNOWN_FITNESS = 'known_fitness'
+
+
+@contextmanager
+def known_fitness(
+        custom_data: Dict,
+        known: Dict[Hashable, float]) -> Iterator[Dict[Hashable, float]]:
+    """Makes operator_fitness reuse known (fitness by FitnessCache key, such
+    as the one of the parents an operator gets) until the operator returns.
+    Fitness computed meanwhile is added to known, so the caller can reuse it
+    too (such as for a mutated chromosome)."""
+    custom_data[KNOWN_FITNESS] = known
+    try:
+        yield known
+    finally:
+        del custom_data[KNOWN_FITNESS]
+
+
+def operator_fitness(custom_data: Dict, fitness_computer_cls: Type,
+                     chromosome: Chromosome) -> float:
+    """Fitness of chromosome for an operator (such as an adaptive mutator),
+    through the same path as individuals: fitness already known (see
+    known_fitness) or kept by the FitnessCache is reused, and computed fitness
+    counts in the budget of the experiment and is kept in the cache."""
+    key = FitnessCache.key(fitness_computer_cls, chromosome)
+    known: Optional[Dict[Hashable, float]] = custom_data.get(KNOWN_FITNESS)
+    if known is not None and key in known:
+        return known[key]
+
+    cache = get_fitness_cache(custom_data)
+    fitness = None if cache is None else cache.get(key)
+    if fitness is None:
+        counter = get_evaluation_counter(custom_data)
+        if counter is not None:
+            counter.add()
+        fitness = fitness_computer_cls.fitness(chromosome)
+        if cache is not None:
+            cache.put(key, fitness)
+
+    if known is not None:
+        known[key] = fitness
+    return fitness
+
+
+def operator_fitness_batch(custom_data: Dict,
+                           fitness_computer_cls: Type,
+                           genes: np.ndarray,
+                           known: Optional[np.ndarray] = None) -> np.ndarray:
+    """Fitness of every row of genes for an array operator. Only rows whose
+    fitness is not known (NaN in known) are computed, and they are counted in
+    the budget of the experiment."""
+    if known is None:
+        unknown = np.ones(len(genes), dtype=bool)
+        fitness = np.full(len(genes), np.nan)
+    else:
+        unknown = np.isnan(known)
+        fitness = known.copy()
+    if not unknown.any():
+        return fitness
+
+    counter = get_evaluation_counter(custom_data)
+    if counter is not None:
+        counter.add(int(np.count_nonzero(unknown)))
+    fitness[unknown] = fitness_computer_cls.fitness_batch(genes[unknown])
+    return fitness
@@ -1,22 +1,21 @@
-from typing import List, Type, Callable, TypeVar
-from functools import lru_cache
-from copy import deepcopy
-from random import random, randint
-from math import sqrt
-from statistics import mean, stdev
+from typing import Any, Dict, List, Type, Callable, TypeVar, Optional
+from random import Random
+from heapq import heapify, heappop, heappush
 
 from genetic_framework.individual import Individual
 from genetic_framework.selectors import SurvivorSelector, MatingSelector
+from genetic_framework.evaluator import FitnessEvaluator
+from genetic_framework.population_stats import PopulationStats
+from genetic_framework.budget import EvaluationCounter
 
 T = TypeVar('T')
 
 
-def clear_caches_after(fn: Callable[..., T]) -> Callable[..., T]:
-    # Decorator for clearing Population cache after given method execution
+def clear_stats_after(fn: Callable[..., T]) -> Callable[..., T]:
+    # Decorator for discarding Population stats after given method execution
     def wrapper(self, *args):
         res = fn(self, *args)
-        self.avg_fitness.cache_clear()
-        self.sd_fitness.cache_clear()
+        self._stats = None
 
         return res
 
@@ -28,7 +27,9 @@ class Population:
                  mutation_prob: float, breed_size: int, num_parent_pairs: int,
                  maximize_fitness: bool,
                  mating_selector_cls: Type[MatingSelector],
-                 survivor_selector_cls: Type[SurvivorSelector]) -> None:
+                 survivor_selector_cls: Type[SurvivorSelector],
+                 fitness_evaluator: Optional[FitnessEvaluator] = None,
+                 rng: Optional[Random] = None) -> None:
         self.population = population
         self.crossover_prob = crossover_prob
         self.mutation_prob = mutation_prob
@@ -37,7 +38,30 @@ class Population:
         self.maximize_fitness = maximize_fitness
         self.mating_selector_cls = mating_selector_cls
         self.survivor_selector_cls = survivor_selector_cls
+        self.fitness_evaluator = fitness_evaluator
+        self.rng = Random() if rng is None else rng
         self.generation = 1
+        self._stats: Optional[PopulationStats] = None
+
+        self._evaluate(self.population)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Fitness evaluators may hold worker pools, which can't be pickled
+        state = self.__dict__.copy()
+        state['fitness_evaluator'] = None
+        return state
+
+    def _evaluate(self, individuals: List[Individual]) -> None:
+        """Internal method used to compute fitness of all unscored individuals
+        at once, when a fitness evaluator is set. Otherwise fitness is computed
+        lazily when needed."""
+        if self.fitness_evaluator is not None:
+            self.fitness_evaluator.evaluate(individuals)
+
+    def _mating_pool(self) -> List[Individual]:
+        """Internal method that returns the list mating selector chooses
+        parents from."""
+        return self.population
 
     def _offspring(self) -> List[Individual]:
         """Internal method used to create a list of new individuals (breed)
@@ -48,9 +72,9 @@ class Population:
         # if population has a single individual return a copies of it (may suffer mutation)
         if len(self.population) == 1:
             for _ in range(self.num_parent_pairs * self.breed_size):
-                new_individual = deepcopy(self.population[0])
+                new_individual = self.population[0].clone()
 
-                mutation_r = random()
+                mutation_r = self.rng.random()
                 if mutation_r < self.mutation_prob:
                     new_individual.self_mutate()
 
@@ -60,51 +84,178 @@ class Population:
             return breed
 
         parents = self.mating_selector_cls.select_couples(
-            self.population, self.num_parent_pairs, self.maximize_fitness)
+            self._mating_pool(), self.num_parent_pairs, self.maximize_fitness)
 
         for (p1, p2) in parents:
             for _ in range(self.breed_size):
                 # Generate child maybe cloned from parents
-                crossover_r = random()
+                crossover_r = self.rng.random()
                 if crossover_r < self.crossover_prob:
                     breed.append(p1.recombine(p2))
                 else:
-                    chosen_parent_clone = p1 if randint(0, 1) == 0 else p2
-                    chosen_parent_clone = deepcopy(chosen_parent_clone)
-                    breed.append(chosen_parent_clone)
+                    chosen_parent_clone = p1 if self.rng.randint(
+                        0, 1) == 0 else p2
+                    breed.append(chosen_parent_clone.clone())
 
                 breed[-1].generation = self.generation
 
                 # Maybe mutate generated child
-                mutation_r = random()
+                mutation_r = self.rng.random()
                 if mutation_r < self.mutation_prob:
                     breed[-1].self_mutate()
 
         return breed
 
-    @clear_caches_after
+    @clear_stats_after
     def evolve(self) -> None:
         """Method used to evolve the population into the next generation"""
         breed = self._offspring()
+        self._evaluate(breed)
         survivors = self.survivor_selector_cls.select_survivors(
             len(self.population), self.population, breed,
             self.maximize_fitness)
         self.population = survivors
         self.generation += 1
 
-    @clear_caches_after
+    @clear_stats_after
     def restart_population(self) -> None:
         for individual in self.population:
             individual.initialize()
+        self._evaluate(self.population)
+
+    @clear_stats_after
+    def replace_worst(self, individuals: List[Individual]) -> None:
+        """Replaces the worst individuals of the population with the given
+        ones (such as migrants from another population)."""
+        self._evaluate(individuals)
+        individuals = individuals[:len(self.population)]
+        ranked = sorted(self.population,
+                        key=lambda individual: individual.fitness(),
+                        reverse=self.maximize_fitness)
+        self.population = ranked[:len(ranked) - len(individuals)] + individuals
+
+    @property
+    def stats(self) -> PopulationStats:
+        """Fitness statistics of the current generation, computed once."""
+        if self._stats is None:
+            self._stats = PopulationStats.from_fitness(
+                [individual.fitness() for individual in self.population])
+        return self._stats
 
-    @lru_cache
     def avg_fitness(self) -> float:
-        return mean([individual.fitness() for individual in self.population])
+        return self.stats.mean
 
-    @lru_cache
     def sd_fitness(self) -> float:
-        if (len(self.population) < 2):
-            return 0
+        return self.stats.sd
+
+
+class SteadyStatePopulation(Population):
+    """Population evolved a few individuals at a time: each couple chosen by
+    the mating selector breeds breed_size children, which immediately replace
+    the worst individual of the population (or the worst of
+    replacement_tournament_size random individuals, when set) unless they are
+    worse than it. The survivor selector is not used.
+
+    Each call to evolve mates num_parent_pairs couples and counts as a
+    generation. It stops early once evaluation_counter is exhausted.
+    """
+    def __init__(self,
+                 population: List[Individual],
+                 crossover_prob: float,
+                 mutation_prob: float,
+                 breed_size: int,
+                 num_parent_pairs: int,
+                 maximize_fitness: bool,
+                 mating_selector_cls: Type[MatingSelector],
+                 survivor_selector_cls: Type[SurvivorSelector],
+                 fitness_evaluator: Optional[FitnessEvaluator] = None,
+                 rng: Optional[Random] = None,
+                 evaluation_counter: Optional[EvaluationCounter] = None,
+                 replacement_tournament_size: Optional[int] = None) -> None:
+        super().__init__(population, crossover_prob, mutation_prob,
+                         breed_size, num_parent_pairs, maximize_fitness,
+                         mating_selector_cls, survivor_selector_cls,
+                         fitness_evaluator, rng)
+        self.evaluation_counter = evaluation_counter
+        self.replacement_tournament_size = replacement_tournament_size
+        self._rebuild_index()
+
+    def _score(self, individual: Individual) -> float:
+        """Internal method that returns a score which is lower for worse
+        individuals."""
+        fitness = individual.fitness()
+        return fitness if self.maximize_fitness else -fitness
+
+    def _rebuild_index(self) -> None:
+        """Internal method that indexes the population by score. _worst is a
+        min heap of (score, version, position). Entries whose version is not
+        the current version of their position are stale and skipped."""
+        self._versions = [0] * len(self.population)
+        self._worst = [(self._score(individual), 0, i)
+                       for i, individual in enumerate(self.population)]
+        heapify(self._worst)
+
+    def _worst_position(self) -> int:
+        while True:
+            _, version, position = self._worst[0]
+            if version == self._versions[position]:
+                return position
+            heappop(self._worst)
+
+    def _replaced_position(self) -> int:
+        """Internal method that returns the position of the individual the
+        next child replaces."""
+        if self.replacement_tournament_size is None:
+            return self._worst_position()
+
+        positions = [
+            self.rng.randrange(len(self.population))
+            for _ in range(self.replacement_tournament_size)
+        ]
+        return min(positions,
+                   key=lambda position: self._score(self.population[position]))
+
+    def _replace(self, position: int, individual: Individual) -> None:
+        self.population[position] = individual
+        self._versions[position] += 1
+        heappush(self._worst, (self._score(individual),
+                               self._versions[position], position))
+
+        # Keeps memory flat: stale entries never outnumber live ones
+        if len(self._worst) > 2 * len(self.population):
+            self._rebuild_index()
+
+    def _mating_pool(self) -> List[Individual]:
+        # Mating selectors may reorder the list they are given
+        return list(self.population)
+
+    @clear_stats_after
+    def evolve(self) -> None:
+        """Method used to evolve the population into the next generation"""
+        breed = self._offspring()
+
+        # Children of each couple replace individuals before the next ones
+        for start in range(0, len(breed), self.breed_size):
+            children = breed[start:start + self.breed_size]
+            self._evaluate(children)
+            for child in children:
+                position = self._replaced_position()
+                if self._score(child) >= self._score(
+                        self.population[position]):
+                    self._replace(position, child)
+
+            if self.evaluation_counter is not None \
+                and self.evaluation_counter.exhausted:
+                break
+
+        self.generation += 1
+
+    @clear_stats_after
+    def restart_population(self) -> None:
+        super().restart_population()
+        self._rebuild_index()
 
-        return stdev([individual.fitness() for individual in self.population],
-                     self.avg_fitness())
+    @clear_stats_after
+    def replace_worst(self, individuals: List[Individual]) -> None:
+        super().replace_worst(individuals)
+        self._rebuild_index()
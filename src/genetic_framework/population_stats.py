@@ -0,0 +1,58 @@
+from typing import Dict, Optional, Sequence, Union
+from math import sqrt
+import numpy as np  #type: ignore
+
+# Quantiles of fitness kept by every PopulationStats
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class PopulationStats:
+    """Snapshot of the fitness of a population: size, mean, sample variance,
+    min, max and quantiles (by fraction, such as 0.5 for the median).
+    """
+    def __init__(self,
+                 size: int,
+                 mean: float,
+                 variance: float,
+                 minimum: float,
+                 maximum: float,
+                 quantiles: Optional[Dict[float, float]] = None) -> None:
+        self.size = size
+        self.mean = mean
+        self.variance = variance
+        self.minimum = minimum
+        self.maximum = maximum
+        self.quantiles = {} if quantiles is None else quantiles
+
+    @classmethod
+    def from_fitness(
+            cls, fitness: Union[Sequence[float],
+                                np.ndarray]) -> 'PopulationStats':
+        """Computes every statistic of fitness in one vectorized pass."""
+        values = np.asarray(fitness, dtype=np.float64)
+        if len(values) == 0:
+            raise ValueError('PopulationStats needs at least one fitness.')
+
+        quantiles = np.quantile(values, QUANTILES)
+        return cls(len(values), float(values.mean()),
+                   float(values.var(ddof=1)) if len(values) > 1 else 0.0,
+                   float(values.min()), float(values.max()),
+                   dict(zip(QUANTILES, quantiles.tolist())))
+
+    @property
+    def sd(self) -> float:
+        """Sample standard deviation, 0.0 for a single individual."""
+        return sqrt(self.variance)
+
+    @property
+    def median(self) -> float:
+        return self.quantiles[0.5]
+
+    def __str__(self) -> str:
+        return '{:.3f} avg, {:.3f} standard deviation, {:.3f} min, ' \
+            '{:.3f} max'.format(self.mean, self.sd, self.minimum,
+                                self.maximum)
+
+    def __repr__(self) -> str:
+        return str(self)
+
@@ -0,0 +1,46 @@
+from typing import Dict, List, Optional, Union
+from random import Random
+import numpy as np  #type: ignore
+
+# custom_data key of the RandomContext used by operators, chromosomes and genes
+RANDOM_CONTEXT = 'random_context'
+
+
+class RandomContext:
+    """Random number generators of an experiment: random (a random.Random, for
+    single draws) and numpy (a numpy Generator, for batch draws). Both are
+    derived from seed, so experiments created with the same seed evolve the
+    same way.
+
+    Contexts returned by spawn have independent streams, for experiments or
+    workers that draw numbers at the same time (such as islands).
+    """
+    def __init__(self,
+                 seed: Union[None, int, np.random.SeedSequence] = None) -> None:
+        self.seed_sequence = seed if isinstance(
+            seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.numpy = np.random.default_rng(self.seed_sequence)
+        self.random = Random(int(self.numpy.integers(2**63)))
+
+    def spawn(self, number_contexts: int) -> List['RandomContext']:
+        return [
+            RandomContext(seed_sequence)
+            for seed_sequence in self.seed_sequence.spawn(number_contexts)
+        ]
+
+
+# Used when custom_data has no RandomContext (operators used on their own)
+_default_context = RandomContext()
+
+
+def get_random_context(custom_data: Dict) -> RandomContext:
+    context: Optional[RandomContext] = custom_data.get(RANDOM_CONTEXT)
+    return _default_context if context is None else context
+
+
+def get_random(custom_data: Dict) -> Random:
+    return get_random_context(custom_data).random
+
+
+def get_numpy_random(custom_data: Dict) -> np.random.Generator:
+    return get_random_context(custom_data).numpy
@@ -13,7 +13,12 @@ class Recombiner(Generic[ChromosomeT], CustomDataHolder, ABC):
     class SubClassRecombiner(Recombiner[SubClassChromosome])...
 
     Then, recombine method can receive SubClassChromosome safely typechecked.
+
+    Subclasses that read fitness (through operator_fitness) set uses_fitness,
+    so the fitness known for the parents is shared with them.
     """
+    uses_fitness = False
+
     @classmethod
     @abstractmethod
     def recombine(cls: Type, chromosome1: ChromosomeT,
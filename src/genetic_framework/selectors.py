@@ -1,13 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict
-from random import random, shuffle, randint
-from statistics import mean
-from copy import deepcopy
-from operator import lt, le, gt, ge
+from typing import List, Tuple, Dict, Type
+import numpy as np  #type: ignore
 
 from genetic_framework.custom_data import CustomDataHolder
 from genetic_framework.individual import Individual
-from genetic_framework.utils import Roulette
+from genetic_framework.randomness import get_random, get_numpy_random
+from genetic_framework.utils import Roulette, TopKArchive, select_best, tournament_winners
 
 
 class MatingSelector(CustomDataHolder, ABC):
@@ -32,6 +30,16 @@ class SurvivorSelector(CustomDataHolder, ABC):
         generation."""
 
 
+# Contestants of each tournament, when custom_data has no 'tournament_size'
+DEFAULT_TOURNAMENT_SIZE = 3
+
+
+def get_tournament_size(custom_data: Dict) -> int:
+    tournament_size: int = custom_data.get('tournament_size',
+                                           DEFAULT_TOURNAMENT_SIZE)
+    return tournament_size
+
+
 class SolutionSelector(ABC):
     """
     Responsible for best individuals selection logic on a running experiment
@@ -55,6 +63,12 @@ class SolutionSelector(ABC):
     def best_individuals(self) -> List[Individual]:
         """Returns the best individuals selected and stored so far."""
 
+    @property
+    def target_individual(self) -> Individual:
+        """Returns the individual whose fitness is compared with the target
+        fitness of an experiment. Defaults to best_individual."""
+        return self.best_individual
+
     @abstractmethod
     def update_individuals(self, population: List[Individual]) -> None:
         """Updates (if necessary) the list of best individuals with 
@@ -82,53 +96,53 @@ class BestFitnessMatingSelector(MatingSelector, ABC):
 
 
 class RandomMatingSelector(MatingSelector, ABC):
-    @staticmethod
-    def select_couples(population: List[Individual], num_pairs: int,
+    @classmethod
+    def select_couples(cls: Type, population: List[Individual], num_pairs: int,
                        __: bool) -> List[Tuple[Individual, Individual]]:
         pairs: List[Tuple[Individual, Individual]] = []
         size = len(population)
+        rng = get_random(cls.custom_data)
 
         if size <= 1:
             return []
 
         for _ in range(num_pairs):
-            p1 = randint(0, size - 1)
-            p2 = randint(0, size - 1)
+            p1 = rng.randint(0, size - 1)
+            p2 = rng.randint(0, size - 1)
             while p1 == p2:
-                p2 = randint(0, size - 1)
+                p2 = rng.randint(0, size - 1)
             pairs.append((population[p1], population[p2]))
 
         return pairs
 
 
 class RouletteMatingSelector(MatingSelector, ABC):
-    @staticmethod
+    @classmethod
     def select_couples(
-            population: List[Individual], num_pairs: int,
+            cls: Type, population: List[Individual], num_pairs: int,
             maximize_fitness: bool) -> List[Tuple[Individual, Individual]]:
-        pairs: List[Tuple[Individual, Individual]] = []
-        roulette = Roulette(population, maximize_fitness)
-
         if len(population) <= 1:
             return []
 
-        for _ in range(num_pairs):
-            mate1 = roulette.get_individual()
-            mate2 = roulette.get_individual()
+        # Mates are drawn with replacement, so any number of pairs can be
+        # chosen from the population (and a pair may mate an individual
+        # with itself)
+        roulette = Roulette(population,
+                            maximize_fitness,
+                            replacement=True,
+                            rng=get_random(cls.custom_data))
+        mates = roulette.sample(2 * num_pairs)
 
-            while mate2 == mate1:
-                mate2 = roulette.get_individual()
-            pairs.append((mate1, mate2))
-
-        return pairs
+        return list(zip(mates[::2], mates[1::2]))
 
 
 class BestFromRandomMatingSelector(MatingSelector, ABC):
-    @staticmethod
+    @classmethod
     def select_couples(
-            population: List[Individual], num_pairs: int,
+            cls: Type, population: List[Individual], num_pairs: int,
             maximize_fitness: bool) -> List[Tuple[Individual, Individual]]:
         pairs: List[Tuple[Individual, Individual]] = []
+        rng = get_random(cls.custom_data)
 
         if len(population) <= 1:
             return []
@@ -136,8 +150,8 @@ class BestFromRandomMatingSelector(MatingSelector, ABC):
         random_count = min(5, len(population))
 
         for _ in range(num_pairs):
-            shuffle(population)
-            possible_mates = population[:random_count]
+            # Samples random_count distinct individuals, O(random_count)
+            possible_mates = rng.sample(population, random_count)
             selected_mates = sorted(
                 possible_mates,
                 key=lambda individual: individual.fitness(),
@@ -147,36 +161,32 @@ class BestFromRandomMatingSelector(MatingSelector, ABC):
         return pairs
 
 
+class TournamentMatingSelector(MatingSelector, ABC):
+    """Each parent is the best of custom_data['tournament_size'] random
+    individuals. Every tournament is run at once over the fitness of the
+    population."""
+    @classmethod
+    def select_couples(
+            cls: Type, population: List[Individual], num_pairs: int,
+            maximize_fitness: bool) -> List[Tuple[Individual, Individual]]:
+        if len(population) <= 1:
+            return []
+
+        winners = tournament_winners(
+            [individual.fitness() for individual in population],
+            2 * num_pairs, get_tournament_size(cls.custom_data),
+            maximize_fitness, get_numpy_random(cls.custom_data))
+        return [(population[winners[i]], population[winners[i + 1]])
+                for i in range(0, len(winners), 2)]
+
+
 class BestFitnessSurvivorSelector(SurvivorSelector, ABC):
     @staticmethod
     def select_survivors(population_size: int, parents: List[Individual],
                          breed: List[Individual],
                          maximize_fitness: bool) -> List[Individual]:
-        parents.sort(key=lambda individual: individual.fitness(),
-                     reverse=maximize_fitness)
-        breed.sort(key=lambda individual: individual.fitness(),
-                   reverse=maximize_fitness)
-        new_generation_individuals = []
-        comparison = lt if maximize_fitness else gt
-
-        i, j = 0, 0
-        while i + j < population_size:
-            if i == len(parents) and j == len(breed):
-                break
-            if i == len(parents):
-                new_generation_individuals.append(breed[j])
-                j += 1
-            elif j == len(breed):
-                new_generation_individuals.append(parents[i])
-                i += 1
-            elif comparison(parents[i].fitness(), breed[j].fitness()):
-                new_generation_individuals.append(breed[j])
-                j += 1
-            else:
-                new_generation_individuals.append(parents[i])
-                i += 1
-
-        return new_generation_individuals
+        # Parents come first, so they survive ties with the breed
+        return select_best(parents + breed, population_size, maximize_fitness)
 
 
 class BestBreedFitnessSurvivorSelector(SurvivorSelector, ABC):
@@ -184,9 +194,7 @@ class BestBreedFitnessSurvivorSelector(SurvivorSelector, ABC):
     def select_survivors(population_size: int, _: List[Individual],
                          breed: List[Individual],
                          maximize_fitness: bool) -> List[Individual]:
-        breed.sort(key=lambda individual: individual.fitness(),
-                   reverse=maximize_fitness)
-        return breed[:population_size]
+        return select_best(breed, population_size, maximize_fitness)
 
 
 class BestParentPlusBestBreedFitnessSurvivorSelector(SurvivorSelector, ABC):
@@ -194,23 +202,43 @@ class BestParentPlusBestBreedFitnessSurvivorSelector(SurvivorSelector, ABC):
     def select_survivors(population_size: int, parents: List[Individual],
                          breed: List[Individual],
                          maximize_fitness: bool) -> List[Individual]:
-        parents.sort(key=lambda individual: individual.fitness(),
-                     reverse=maximize_fitness)
-        breed.sort(key=lambda individual: individual.fitness(),
-                   reverse=maximize_fitness)
-
-        return parents[0:1] + breed[:population_size - 1]
+        return select_best(parents, 1, maximize_fitness) + select_best(
+            breed, population_size - 1, maximize_fitness)
 
 
 class RouletteSurvivorSelector(SurvivorSelector, ABC):
-    @staticmethod
-    def select_survivors(population_size: int, parents: List[Individual],
-                         breed: List[Individual],
+    @classmethod
+    def select_survivors(cls: Type, population_size: int,
+                         parents: List[Individual], breed: List[Individual],
+                         maximize_fitness: bool) -> List[Individual]:
+        roulette = Roulette(parents + breed,
+                            maximize_fitness,
+                            rng=get_random(cls.custom_data))
+
+        return roulette.sample(population_size)
+
+
+class TournamentSurvivorSelector(SurvivorSelector, ABC):
+    """Each survivor is the best of custom_data['tournament_size'] random
+    individuals among parents and breed. Individuals that survive more than
+    once are cloned, so every survivor is a distinct object."""
+    @classmethod
+    def select_survivors(cls: Type, population_size: int,
+                         parents: List[Individual], breed: List[Individual],
                          maximize_fitness: bool) -> List[Individual]:
-        new_generation_individuals: List[Individual] = []
-        roulette = Roulette(parents + breed, maximize_fitness)
+        candidates = parents + breed
+        winners = tournament_winners(
+            [individual.fitness() for individual in candidates],
+            population_size, get_tournament_size(cls.custom_data),
+            maximize_fitness, get_numpy_random(cls.custom_data))
 
-        return [roulette.get_individual() for _ in range(population_size)]
+        survivors = []
+        selected = set()
+        for i in winners:
+            survivors.append(candidates[i].clone() if i in selected else
+                             candidates[i])
+            selected.add(i)
+        return survivors
 
 
 class GenerationalSurvivorSelector(SurvivorSelector, ABC):
@@ -220,67 +248,45 @@ class GenerationalSurvivorSelector(SurvivorSelector, ABC):
                          maximize_fitness: bool) -> List[Individual]:
         new_generation_individuals = parents + breed
 
-        avg_gen = mean([
-            individual.generation for individual in new_generation_individuals
-        ])
+        generations = np.array(
+            [individual.generation for individual in new_generation_individuals],
+            dtype=np.float64)
+        avg_gen = generations.mean()
         avg_gen = 1.0 if avg_gen == 0.0 else avg_gen
 
-        avg_fitness = mean([
+        fitness = np.array([
             individual.fitness() for individual in new_generation_individuals
         ])
+        avg_fitness = fitness.mean()
         avg_fitness = 1.0 if avg_fitness == 0.0 else avg_fitness
 
-        def score(ind: Individual) -> float:
-            fitness = ind.fitness()
-            gen = ind.generation
-
-            return (fitness / avg_fitness) * (gen / avg_gen)
-
-        new_generation_individuals.sort(key=score, reverse=maximize_fitness)
-        return new_generation_individuals[:population_size]
+        scores = (fitness / avg_fitness) * (generations / avg_gen)
+        return select_best(new_generation_individuals, population_size,
+                           maximize_fitness, scores)
 
 
 class KBestFitnessSolutionSelector(SolutionSelector, ABC):
+    """Keeps the number_solutions best distinct individuals found so far.
+    target_individual is the worst of them, so an experiment reaches its
+    target fitness once every solution does."""
     def __init__(self,
                  number_solutions: int,
                  maximize_fitness: bool,
                  custom_data: Dict = {}) -> None:
         super().__init__(number_solutions, maximize_fitness, custom_data)
-        self._best_individuals: List[Individual] = []
+        self._archive = TopKArchive(number_solutions, maximize_fitness)
 
     @property
     def best_individual(self) -> Individual:
-        return self._best_individuals[-1]
+        return self._archive.individuals[0]
 
     @property
     def best_individuals(self) -> List[Individual]:
-        return self._best_individuals
+        return self._archive.individuals
+
+    @property
+    def target_individual(self) -> Individual:
+        return self._archive.individuals[-1]
 
     def update_individuals(self, population: List[Individual]) -> None:
-        self.best_individuals.sort(key=lambda individual: individual.fitness(),
-                                   reverse=self.maximize_fitness)
-        population.sort(key=lambda individual: individual.fitness(),
-                        reverse=self.maximize_fitness)
-        new_best_individuals: List[Individual] = []
-        comparison = ge if self.maximize_fitness else le
-
-        i, j = 0, 0
-        while len(new_best_individuals) < self.number_solutions:
-            if i == len(population) and j == len(self.best_individuals):
-                break
-            elif i == len(population):
-                new_best_individuals.append(self.best_individuals[j])
-                j += 1
-            elif j == len(self.best_individuals):
-                new_best_individuals.append(deepcopy(population[i]))
-                i += 1
-            elif comparison(self.best_individuals[j].fitness(),
-                            population[i].fitness()):
-                new_best_individuals.append(self.best_individuals[j])
-                j += 1
-            else:
-                new_best_individuals.append(deepcopy(population[i]))
-                i += 1
-
-        self.best_individuals.clear()
-        self.best_individuals.extend(new_best_individuals)
+        self._archive.update(population)
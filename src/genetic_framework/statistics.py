@@ -1,10 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import Dict, TypeVar, Generic, List, Tuple
+from typing import Dict, TypeVar, Generic, List, Tuple, Union, Callable, Type, Sequence
+from collections import defaultdict
+from math import sqrt
+from statistics import mean
 
 from genetic_framework.population import Population
+from genetic_framework.array_population import ArrayPopulation
+from genetic_framework.cma_es import CMAESPopulation
 from genetic_framework.selectors import SolutionSelector
 
 DataPoint = TypeVar('DataPoint')
+AnyPopulation = Union[Population, ArrayPopulation, CMAESPopulation]
+CollectorT = TypeVar('CollectorT', bound='StatisticsCollector')
+
+
+def merge_per_generation(
+        collectors: Sequence['StatisticsCollector[Tuple[int, float]]'],
+        combine: Callable[[List[float]], float]) -> List[Tuple[int, float]]:
+    """Combines (generation, value) data points of several collectors into one
+    data point per generation."""
+    values: Dict[int, List[float]] = defaultdict(list)
+    for collector in collectors:
+        for generation, value in collector.data:
+            values[generation].append(value)
+
+    return [(generation, combine(generation_values))
+            for generation, generation_values in sorted(values.items())]
 
 
 class StatisticsCollector(Generic[DataPoint], ABC):
@@ -13,7 +34,7 @@ class StatisticsCollector(Generic[DataPoint], ABC):
         self.custom_data = custom_data
 
     @abstractmethod
-    def collect_data_point(self, population: Population, \
+    def collect_data_point(self, population: AnyPopulation, \
             solution_selector: SolutionSelector) -> None:
         ...
 
@@ -22,6 +43,14 @@ class StatisticsCollector(Generic[DataPoint], ABC):
     def data(self) -> List[DataPoint]:
         ...
 
+    @classmethod
+    @abstractmethod
+    def merge(cls: Type[CollectorT], collectors: List[CollectorT],
+              maximize_fitness: bool) -> CollectorT:
+        """Combines data collected by several populations evolving at the same
+        time (such as islands) into a single collector."""
+        ...
+
     @abstractmethod
     def __str__(self) -> str:
         ...
@@ -37,14 +66,22 @@ class AvgFitnessPerGenerationStatisticsCollector(
         super().__init__(custom_data)
         self._data: List[Tuple[int, float]] = []
 
-    def collect_data_point(self, population: Population, \
+    def collect_data_point(self, population: AnyPopulation, \
             _: SolutionSelector) -> None:
-        self._data.append((population.generation, population.avg_fitness()))
+        self._data.append((population.generation, population.stats.mean))
 
     @property
     def data(self) -> List[Tuple[int, float]]:
         return self._data
 
+    @classmethod
+    def merge(cls,
+              collectors: List['AvgFitnessPerGenerationStatisticsCollector'],
+              _: bool) -> 'AvgFitnessPerGenerationStatisticsCollector':
+        merged = cls(collectors[0].custom_data)
+        merged._data = merge_per_generation(collectors, mean)
+        return merged
+
     def __str__(self) -> str:
         return str(self.data)
 
@@ -58,14 +95,24 @@ class FitnessSDPerGenerationStatisticsCollector(
         super().__init__(custom_data)
         self._data: List[Tuple[int, float]] = []
 
-    def collect_data_point(self, population: Population, \
+    def collect_data_point(self, population: AnyPopulation, \
             _: SolutionSelector) -> None:
-        self._data.append((population.generation, population.sd_fitness()))
+        self._data.append((population.generation, population.stats.sd))
 
     @property
     def data(self) -> List[Tuple[int, float]]:
         return self._data
 
+    @classmethod
+    def merge(cls,
+              collectors: List['FitnessSDPerGenerationStatisticsCollector'],
+              _: bool) -> 'FitnessSDPerGenerationStatisticsCollector':
+        # Pooled within-population deviation (populations have the same size)
+        merged = cls(collectors[0].custom_data)
+        merged._data = merge_per_generation(
+            collectors, lambda sds: sqrt(mean([sd**2 for sd in sds])))
+        return merged
+
     def __str__(self) -> str:
         return str(self.data)
 
@@ -79,7 +126,7 @@ class BestFitnessPerGenerationStatisticsCollector(
         super().__init__(custom_data)
         self._data: List[Tuple[int, float]] = []
 
-    def collect_data_point(self, population: Population, \
+    def collect_data_point(self, population: AnyPopulation, \
             solution_selector: SolutionSelector) -> None:
         self._data.append((population.generation,
                            solution_selector.best_individual.fitness()))
@@ -88,6 +135,16 @@ class BestFitnessPerGenerationStatisticsCollector(
     def data(self) -> List[Tuple[int, float]]:
         return self._data
 
+    @classmethod
+    def merge(
+        cls, collectors: List['BestFitnessPerGenerationStatisticsCollector'],
+        maximize_fitness: bool
+    ) -> 'BestFitnessPerGenerationStatisticsCollector':
+        merged = cls(collectors[0].custom_data)
+        merged._data = merge_per_generation(collectors,
+                                            max if maximize_fitness else min)
+        return merged
+
     def __str__(self) -> str:
         return str(self.data)
 
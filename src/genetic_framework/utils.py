@@ -1,41 +1,260 @@
-from random import randint, random
-from typing import List
+from random import Random
+from typing import Hashable, List, Optional, Sequence, Set, Tuple, Union
+from heapq import heappush, heapreplace
+import numpy as np  #type: ignore
 
 from genetic_framework.individual import Individual
 
 
+def _lowest_indices(keys: np.ndarray, k: int) -> np.ndarray:
+    """Internal function that returns the indices of the k lowest keys (none
+    of them NaN), lowest first, keeping the order of equal keys."""
+    if k < len(keys):
+        threshold = np.partition(keys, k - 1)[k - 1]
+        better = np.flatnonzero(keys < threshold)
+        ties = np.flatnonzero(keys == threshold)[:k - len(better)]
+        selected = np.concatenate((better, ties))
+    else:
+        selected = np.arange(len(keys))
+
+    return selected[np.argsort(keys[selected], kind='stable')]
+
+
+def best_indices(scores: Union[Sequence[float], np.ndarray], k: int,
+                 maximize: bool) -> List[int]:
+    """Indices of the k best scores, best first, in O(n + k log k). Ties keep
+    the order of scores, as a stable sort would, and NaN scores are ranked
+    last."""
+    keys = np.asarray(scores, dtype=np.float64)
+    keys = -keys if maximize else keys
+    k = max(min(k, len(keys)), 0)
+    if k == 0:
+        return []
+
+    nan = np.isnan(keys)
+    if not nan.any():
+        order: List[int] = _lowest_indices(keys, k).tolist()
+        return order
+
+    valid = np.flatnonzero(~nan)
+    best = valid[_lowest_indices(keys[valid], min(k, len(valid)))]
+    order = np.concatenate(
+        (best, np.flatnonzero(nan)[:k - len(best)])).tolist()
+    return order
+
+
+def select_best(individuals: List[Individual],
+                k: int,
+                maximize_fitness: bool,
+                scores: Optional[Union[Sequence[float], np.ndarray]] = None
+                ) -> List[Individual]:
+    """The k individuals with best scores (fitness by default, computed once
+    each), best first."""
+    if scores is None:
+        scores = [individual.fitness() for individual in individuals]
+
+    return [
+        individuals[i] for i in best_indices(scores, k, maximize_fitness)
+    ]
+
+
+def tournament_winners(scores: Sequence[float], number_winners: int,
+                       tournament_size: int, maximize: bool,
+                       rng: np.random.Generator) -> List[int]:
+    """Indices of the winners of number_winners tournaments, each among
+    tournament_size random scores (drawn with replacement), all at once in
+    O(number_winners * tournament_size)."""
+    keys = np.asarray(scores, dtype=np.float64)
+    keys = keys if maximize else -keys
+    contestants = rng.integers(0, len(keys),
+                               (number_winners, max(tournament_size, 1)))
+    best = np.argmax(keys[contestants], axis=1)
+    winners: List[int] = contestants[np.arange(number_winners),
+                                     best].tolist()
+    return winners
+
+
+class FenwickTree:
+    """Binary indexed tree over a list of values. Changes a value and finds
+    where a prefix sum is reached in O(log n)."""
+    def __init__(self, values: Sequence[float]) -> None:
+        self.values = list(values)
+        self.total = float(sum(self.values))
+        # _tree[i] holds the sum of values[i - (i & -i):i]
+        self._tree = [0.0] + [float(value) for value in self.values]
+        for i in range(1, len(self._tree)):
+            parent = i + (i & -i)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, index: int, delta: float) -> None:
+        self.values[index] += delta
+        self.total += delta
+
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def find(self, prefix_sum: float) -> int:
+        """Returns the first index whose prefix sum (values up to and including
+        it) exceeds prefix_sum, or len(self) when there is none."""
+        index = 0
+        step = 1 << (len(self.values).bit_length() - 1) if self.values else 0
+
+        while step > 0:
+            next_index = index + step
+            if next_index < len(self._tree) \
+                and self._tree[next_index] <= prefix_sum:
+                index = next_index
+                prefix_sum -= self._tree[index]
+            step >>= 1
+
+        return index
+
+
 class Roulette:
+    """Draws individuals with probability proportional to their fitness (which
+    must not be negative), in O(log n) per draw. Drawn individuals are removed
+    from the roulette unless replacement is True. When every individual left
+    has fitness 0.0, they are drawn uniformly.
+    """
+    # Draws through the tree before falling back to a linear scan
+    max_draw_attempts = 16
+
     def __init__(self,
                  population: List[Individual],
                  maximize_fitness: bool,
-                 replacement: bool = False):
-        population.sort(key=lambda individual: individual.fitness(),
-                        reverse=maximize_fitness)
+                 replacement: bool = False,
+                 rng: Optional[Random] = None):
+        weights = [individual.fitness() for individual in population]
+        for weight in weights:
+            if weight < 0:
+                raise ValueError(
+                    'Roulette needs non negative fitness ({}).'.format(weight))
+
+        self.population = population
         self.replacement = replacement
-        self._items: List[Roulette.Item] = list(
-            map(
-                lambda individual: Roulette.Item(individual,
-                                                 individual.fitness()),
-                population))
+        self.rng = Random() if rng is None else rng
+        self._weights = FenwickTree(weights)
+        # One for each individual still in the roulette
+        self._remaining = FenwickTree([1] * len(population))
+        self._num_positive_weights = sum(1 for weight in weights if weight > 0)
+
+    def _draw_index(self) -> int:
+        """Internal method that returns the index of a random individual still
+        in the roulette."""
+        if self._num_positive_weights == 0:
+            return self._remaining.find(
+                self.rng.randrange(round(self._remaining.total)))
+
+        for _ in range(self.max_draw_attempts):
+            index = self._weights.find(self.rng.random() *
+                                       self._weights.total)
+            # Rounding errors may point past the individuals left, draw again
+            if index < len(self._weights) and self._weights.values[index] > 0:
+                return index
 
-        for i in range(1, len(self._items)):
-            self._items[i].acc_probability += self._items[i -
-                                                          1].acc_probability
+        return self._scan_index()
+
+    def _scan_index(self) -> int:
+        """Internal method that draws through a linear scan over the positive
+        weights, for when the tree lost them to rounding errors."""
+        positive = [(index, weight)
+                    for index, weight in enumerate(self._weights.values)
+                    if weight > 0]
+        threshold = self.rng.random() * sum(weight for _, weight in positive)
+        for index, weight in positive:
+            threshold -= weight
+            if threshold < 0:
+                return index
+        return positive[-1][0]
+
+    def _remove(self, index: int) -> None:
+        weight = self._weights.values[index]
+        if weight > 0:
+            self._weights.add(index, -weight)
+            self._weights.values[index] = 0.0
+            self._num_positive_weights -= 1
+            # Removing a large weight cancels the small ones in the sums,
+            # rebuild them from the weights left
+            if self._weights.total <= 0 and self._num_positive_weights > 0:
+                self._weights = FenwickTree(self._weights.values)
+        self._remaining.add(index, -1)
 
     def get_individual(self) -> Individual:
-        r = random() * self._items[-1].acc_probability
-        try:
-            selected_item = next(item for item in self._items
-                                 if r <= item.acc_probability)
-        except StopIteration:
-            # When everyone has fitness 0.0, just take random one
-            r2 = randint(0, len(self._items) - 1)
-            selected_item = self._items[r2]
-        self._items.remove(selected_item)
-        return selected_item.individual
-
-    class Item:
-        def __init__(self, individual: Individual,
-                     acc_probability: float) -> None:
-            self.individual = individual
-            self.acc_probability = acc_probability
+        if round(self._remaining.total) == 0:
+            raise ValueError('Roulette has no individuals left.')
+
+        index = self._draw_index()
+        if not self.replacement:
+            self._remove(index)
+        return self.population[index]
+
+    def sample(self, k: int) -> List[Individual]:
+        """Draws k individuals, in the order they are drawn."""
+        return [self.get_individual() for _ in range(k)]
+
+
+class TopKArchive:
+    """Keeps clones of the k best individuals offered, at most one for each
+    distinct chromosome (compared through Chromosome.genes_key). Offering an
+    individual costs O(log k) and it is only cloned when it enters the archive.
+    Individuals offered later lose ties.
+    """
+    def __init__(self, k: int, maximize_fitness: bool) -> None:
+        self.k = k
+        self.maximize_fitness = maximize_fitness
+        # Min heap of (score, -order, genes key, individual): its root is the
+        # worst individual kept, the newest one among ties
+        self._heap: List[Tuple[float, int, Hashable, Individual]] = []
+        self._keys: Set[Hashable] = set()
+        self._order = 0
+        self._sorted: Optional[List[Individual]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _score(self, individual: Individual) -> float:
+        fitness = individual.fitness()
+        return fitness if self.maximize_fitness else -fitness
+
+    def offer(self, individual: Individual) -> bool:
+        """Adds a clone of individual if it is among the k best and its
+        chromosome is not in the archive yet. Returns whether it was added."""
+        if self.k <= 0:
+            return False
+
+        score = self._score(individual)
+        if len(self._heap) == self.k and score <= self._heap[0][0]:
+            return False
+
+        key = individual.chromosome.genes_key()
+        if key in self._keys:
+            return False
+
+        self._order += 1
+        entry = (score, -self._order, key, individual.clone())
+        if len(self._heap) < self.k:
+            heappush(self._heap, entry)
+        else:
+            self._keys.discard(heapreplace(self._heap, entry)[2])
+        self._keys.add(key)
+        self._sorted = None
+        return True
+
+    def update(self, individuals: Sequence[Individual]) -> None:
+        for individual in individuals:
+            self.offer(individual)
+
+    @property
+    def individuals(self) -> List[Individual]:
+        """Individuals kept, best first."""
+        if self._sorted is None:
+            self._sorted = [
+                entry[3] for entry in sorted(self._heap, reverse=True)
+            ]
+        return self._sorted
@@ -4,14 +4,17 @@ This module instantiate genetic algorithm framework to find solutions for the
 eight queen problem.
 """
 from argparse import ArgumentParser, Action
-from typing import Type, Any, List
+from typing import Type, Any, List, Dict, Union, Tuple, Optional
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from math import pi
 
 import matplotlib.pyplot as plt  # type: ignore
 import matplotlib.patches as mpatches  # type: ignore
 
-from genetic_framework.experiment import Experiment
+from genetic_framework.fitness_cache import FitnessCache, LRUFitnessCache, LFUFitnessCache
+from genetic_framework.experiment import Experiment, ArrayExperiment, CMAESExperiment
+from genetic_framework.islands import IslandExperiment, RingTopology, FullyConnectedTopology, RandomTopology
 from genetic_framework.mutator import *
 from genetic_framework.statistics import *
 from genetic_framework.selectors import *
@@ -19,7 +22,7 @@ from ackley.chromosomes import *
 from ackley.fitness import *
 from ackley.mutators import *
 from ackley.recombiners import *
-from ackley.util import assembly_covariance_matrix, ackley_function
+from ackley.util import ackley_function
 
 PROGRAM_DESCRIPTION = "Learns eight queens puzzle through genetic algorithm"
 """ Enums for choosing classes for tunning the algorithm
@@ -38,6 +41,9 @@ class ChromosomeEnum(Enum):
     FLOAT = FloatChromosome
     ADAPTIVE_STEP = AdaptiveStepFloatChromosome
     COVARIANCE = CovarianceFloatChromosome
+    COMPACT_FLOAT = CompactFloatChromosome
+    COMPACT_ADAPTIVE_STEP = CompactAdaptiveStepFloatChromosome
+    COMPACT_COVARIANCE = CompactCovarianceFloatChromosome
 
 
 class MutatorEnum(Enum):
@@ -61,6 +67,7 @@ class SurvivorSelectorEnum(Enum):
     BEST_PARENT_PLUS_BREED = BestParentPlusBestBreedFitnessSurvivorSelector
     GENERATIONAL = GenerationalSurvivorSelector
     ROULETTE = RouletteSurvivorSelector
+    TOURNAMENT = TournamentSurvivorSelector
 
 
 class MatingSelectorEnum(Enum):
@@ -68,12 +75,74 @@ class MatingSelectorEnum(Enum):
     ROULETTE = RouletteMatingSelector
     BEST_FROM_RAND = BestFromRandomMatingSelector
     RANDOM = RandomMatingSelector
+    TOURNAMENT = TournamentMatingSelector
 
 
 class SolutionSelectorEnum(Enum):
     K_BEST_FITNESS = KBestFitnessSolutionSelector
 
 
+class EvaluationExecutorEnum(Enum):
+    NONE = None
+    THREAD_POOL = ThreadPoolExecutor
+    PROCESS_POOL = ProcessPoolExecutor
+
+
+class FitnessCacheEnum(Enum):
+    NONE = None
+    LRU = LRUFitnessCache
+    LFU = LFUFitnessCache
+
+
+class MigrationTopologyEnum(Enum):
+    RING = RingTopology
+    FULLY_CONNECTED = FullyConnectedTopology
+    RANDOM = RandomTopology
+
+
+""" Array based counterparts of the classes above, used by the vectorized
+engine (ArrayExperiment). Add new array classes here to make them available.
+"""
+ARRAY_COUNTERPARTS: Dict[Type, Type] = {
+    FloatChromosome: ArrayFloatChromosome,
+    AdaptiveStepFloatChromosome: ArrayAdaptiveStepFloatChromosome,
+    CompactFloatChromosome: ArrayFloatChromosome,
+    CompactAdaptiveStepFloatChromosome: ArrayAdaptiveStepFloatChromosome,
+    CovarianceFloatChromosome: ArrayCovarianceFloatChromosome,
+    CompactCovarianceFloatChromosome: ArrayCovarianceFloatChromosome,
+    AckleyFitnessComputer: ArrayAckleyFitnessComputer,
+    AdaptiveStepAckleyFitnessComputer: ArrayAdaptiveStepAckleyFitnessComputer,
+    CovarianceAckleyFitnessComputer: ArrayCovarianceAckleyFitnessComputer,
+    DeltaMutator: ArrayDeltaMutator,
+    AdaptiveStepMutator: ArrayAdaptiveStepMutator,
+    CovarianceMutator: ArrayCovarianceMutator,
+    MidPointRecombiner: ArrayMidPointRecombiner,
+    AdaptiveStepMidPointRecombiner: ArrayAdaptiveStepMidPointRecombiner,
+    CovarianceMidPointRecombiner: ArrayCovarianceMidPointRecombiner,
+}
+
+
+# Chromosomes whose array counterpart is just the variables, as CMA-ES needs
+CMA_ES_CHROMOSOMES = (FloatChromosome, CompactFloatChromosome)
+
+
+def get_array_counterparts(
+        chromosome_cls: Type, fitness_computer_cls: Type, mutator_cls: Type,
+        recombiner_cls: Type) -> Tuple[Type, Type, Type, Type]:
+    classes = (chromosome_cls, fitness_computer_cls, mutator_cls,
+               recombiner_cls)
+    for cls in classes:
+        if cls not in ARRAY_COUNTERPARTS:
+            raise ValueError(
+                '{} has no array counterpart to run vectorized.'.format(
+                    cls.__name__))
+
+    return (ARRAY_COUNTERPARTS[chromosome_cls],
+            ARRAY_COUNTERPARTS[fitness_computer_cls],
+            ARRAY_COUNTERPARTS[mutator_cls],
+            ARRAY_COUNTERPARTS[recombiner_cls])
+
+
 class CLIArgumentDescription:
     # Class designed to model the fields that an CLI Argument should define
 
@@ -213,6 +282,185 @@ ARGS = [
         value_name='LR_MULTIPLIER',
         help_message="""Specify the value to scale the learning rate.""",
         action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='vec',
+        full_name='vectorized',
+        value_name='VECTORIZED',
+        help_message="""Set to 1 to evolve the whole population as a single
+            numpy array (parents are paired at random and the best among 
+            parents and breed survive).""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='cma',
+        full_name='cma_es',
+        value_name='CMA_ES',
+        help_message="""Set to 1 to evolve through CMA-ES: a single mean and
+            covariance matrix adapted for the whole population, sampled in
+            batches. Population, breed, operators and selectors other than the
+            solution selector are not used. Needs chromosomes of just the
+            variables.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='cmao',
+        full_name='cma_offspring',
+        value_name='CMA_OFFSPRING',
+        help_message="""Number of points CMA-ES samples per generation. (None
+            for 4 + 3 ln n)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=float,
+        default_value=None,
+        short_name='cmass',
+        full_name='cma_step_size',
+        value_name='CMA_STEP_SIZE',
+        help_message="""Initial standard deviation of CMA-ES. (None for 0.3
+            times the width of the bounds)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='be',
+        full_name='batch_evaluation',
+        value_name='BATCH_EVALUATION',
+        help_message="""Set to 1 to compute fitness of every new individual of a
+            generation in one pass, instead of one at a time when needed.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='sst',
+        full_name='steady_state',
+        value_name='STEADY_STATE',
+        help_message="""Set to 1 to put each child in the population as soon as
+            it is born, replacing the worst individual, instead of selecting
+            survivors among the whole breed of a generation.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='rts',
+        full_name='replacement_tournament_size',
+        value_name='REPLACEMENT_TOURNAMENT_SIZE',
+        help_message="""Number of random individuals among which a child
+            replaces the worst one in steady state mode. (None for the worst
+            of the whole population)""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=EvaluationExecutorEnum,
+        default_value=EvaluationExecutorEnum.NONE.value,
+        short_name='ee',
+        full_name='evaluation_executor',
+        value_name='EVAL_EXECUTOR',
+        help_message="""Specify the pool used to spread batch evaluation among 
+            workers (implies batch evaluation).""",
+        action_cls=EnumConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='ew',
+        full_name='evaluation_workers',
+        value_name='EVAL_WORKERS',
+        help_message="""Number of workers of the evaluation executor. 
+            (None for one per CPU)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='seed',
+        full_name='seed',
+        value_name='SEED',
+        help_message="""Seed of the random numbers used by the experiment, 
+            so it can be reproduced. (None for a random seed)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=str,
+        default_value=None,
+        short_name='ckp',
+        full_name='checkpoint',
+        value_name='CHECKPOINT',
+        help_message="""File where the experiment state is saved periodically
+            and when it stops. If it exists, the experiment resumes from it.
+            Not used by vectorized or island runs. (None for no checkpoints)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=10,
+        short_name='ci',
+        full_name='checkpoint_interval',
+        value_name='CHECKPOINT_INTERVAL',
+        help_message="""Number of generations between checkpoints.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=FitnessCacheEnum,
+        default_value=FitnessCacheEnum.NONE.value,
+        short_name='fca',
+        full_name='fitness_cache',
+        value_name='FITNESS_CACHE',
+        help_message="""Specify the cache of fitness by chromosome genes, so
+            chromosomes found again are not evaluated again, and how it evicts
+            fitness values when full.""",
+        action_cls=EnumConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=100000,
+        short_name='fcs',
+        full_name='fitness_cache_size',
+        value_name='FITNESS_CACHE_SIZE',
+        help_message="""Maximum number of fitness values kept by the fitness
+            cache.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=1,
+        short_name='isl',
+        full_name='islands',
+        value_name='ISLANDS',
+        help_message="""Number of populations (islands) evolved at the same 
+            time, each one in its own process. 1 disables island mode.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=10,
+        short_name='mint',
+        full_name='migration_interval',
+        value_name='MIGRATION_INTERVAL',
+        help_message="""Number of generations between migrations of 
+            individuals among islands.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=1,
+        short_name='nmig',
+        full_name='num_migrants',
+        value_name='NUM_MIGRANTS',
+        help_message="""Number of best individuals each island sends to each 
+            of its destinations at every migration.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=MigrationTopologyEnum,
+        default_value=MigrationTopologyEnum.RING.value,
+        short_name='topo',
+        full_name='migration_topology',
+        value_name='TOPOLOGY',
+        help_message="""Specify which islands receive the migrants of each 
+            island.""",
+        action_cls=EnumConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='sfc',
+        full_name='shared_fitness_cache',
+        value_name='SHARED_FITNESS_CACHE',
+        help_message="""Number of fitness values islands share through shared
+            memory, so they reuse fitness computed by each other. Needs a
+            fitness cache. 0 keeps island caches apart.""",
+        action_cls=NoConstraintAction),
     CLIArgumentDescription(
         _type=int,
         default_value=1,
@@ -267,6 +515,15 @@ ARGS = [
         help_message="""Number of parents pairs returned from mating selector 
             algorithm for generating new individual through recombination.""",
         action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=3,
+        short_name='ts',
+        full_name='tournament_size',
+        value_name='TOURNAMENT_SIZE',
+        help_message="""Number of random individuals competing for each pick
+            of the tournament mating and survivor selectors.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
     CLIArgumentDescription(
         _type=int,
         default_value=None,
@@ -377,22 +634,34 @@ STATISTICS_COLLECTOR_TYPES = [
 ]
 
 
-def main(**kwargs) -> None:
-    print('Using these CLI arguments: {}\n'.format(kwargs))
+def new_custom_data(kwargs: Dict) -> Dict:
+    """custom_data of an experiment described by CLI arguments kwargs."""
+    return dict(n=kwargs['n'],
+                c1=kwargs['c1'],
+                c2=kwargs['c2'],
+                c3=kwargs['c3'],
+                lower_bound=kwargs['lower_bound'],
+                upper_bound=kwargs['upper_bound'],
+                mutator_fitness_scale=kwargs['mutator_fitness_scale'],
+                step_size=kwargs['step_size'],
+                learning_rate_multiplier=kwargs['learning_rate_multiplier'],
+                tournament_size=kwargs['tournament_size'],
+                fitness_computer=kwargs['fitness_computer'])
+
 
-    custom_data = dict(
-        n=kwargs['n'],
-        c1=kwargs['c1'],
-        c2=kwargs['c2'],
-        c3=kwargs['c3'],
-        lower_bound=kwargs['lower_bound'],
-        upper_bound=kwargs['upper_bound'],
-        mutator_fitness_scale=kwargs['mutator_fitness_scale'],
-        step_size=kwargs['step_size'],
-        learning_rate_multiplier=kwargs['learning_rate_multiplier'],
-        fitness_computer=kwargs['fitness_computer'])
-
-    experiment = Experiment(
+def new_fitness_cache(kwargs: Dict) -> Optional[FitnessCache]:
+    """FitnessCache described by CLI arguments kwargs, if any."""
+    if kwargs['fitness_cache'] is None:
+        return None
+
+    fitness_cache: FitnessCache = kwargs['fitness_cache'](
+        kwargs['fitness_cache_size'])
+    return fitness_cache
+
+
+def new_experiment(kwargs: Dict) -> Experiment:
+    """Experiment described by CLI arguments kwargs."""
+    experiment_args = (
         kwargs['population_size'], kwargs['max_generations'],
         kwargs['crossover_probability'], kwargs['mutation_probability'],
         kwargs['target_fitness'], kwargs['number_solutions'],
@@ -401,14 +670,73 @@ def main(**kwargs) -> None:
         kwargs['chromosome'], kwargs['fitness_computer'], False,
         kwargs['mutator'], kwargs['recombiner'], kwargs['mating_selector'],
         kwargs['survivor_selector'], kwargs['solution_selector'],
-        STATISTICS_COLLECTOR_TYPES, custom_data)
+        STATISTICS_COLLECTOR_TYPES, new_custom_data(kwargs))
+
+    if kwargs['steady_state'] and (kwargs['cma_es'] or kwargs['vectorized']):
+        raise ValueError(
+            'Steady state evolution is not available for {} experiments.'.
+            format('CMA-ES' if kwargs['cma_es'] else 'vectorized'))
+
+    if kwargs['cma_es']:
+        if kwargs['chromosome'] not in CMA_ES_CHROMOSOMES:
+            raise ValueError(
+                'CMA-ES evolves chromosomes of just the variables, not {}.'.
+                format(kwargs['chromosome'].__name__))
+
+        return CMAESExperiment(*experiment_args,
+                               ARRAY_COUNTERPARTS[kwargs['chromosome']],
+                               ARRAY_COUNTERPARTS[kwargs['fitness_computer']],
+                               offspring_size=kwargs['cma_offspring'],
+                               step_size=kwargs['cma_step_size'],
+                               bounds=(kwargs['lower_bound'],
+                                       kwargs['upper_bound']),
+                               seed=kwargs['seed'])
+
+    if kwargs['vectorized']:
+        return ArrayExperiment(
+            *experiment_args,
+            *get_array_counterparts(kwargs['chromosome'],
+                                    kwargs['fitness_computer'],
+                                    kwargs['mutator'], kwargs['recombiner']),
+            seed=kwargs['seed'])
+
+    return Experiment(*experiment_args,
+                      batch_evaluation=bool(kwargs['batch_evaluation']),
+                      evaluation_executor_cls=kwargs['evaluation_executor'],
+                      evaluation_workers=kwargs['evaluation_workers'],
+                      seed=kwargs['seed'],
+                      steady_state=bool(kwargs['steady_state']),
+                      replacement_tournament_size=kwargs[
+                          'replacement_tournament_size'],
+                      checkpoint_path=kwargs['checkpoint'],
+                      checkpoint_interval=kwargs['checkpoint_interval'],
+                      fitness_cache=new_fitness_cache(kwargs))
+
+
+def main(**kwargs) -> None:
+    print('Using these CLI arguments: {}\n'.format(kwargs))
+
+    if kwargs['islands'] > 1:
+        experiment: Union[Experiment, IslandExperiment] = IslandExperiment(
+            # Islands are not checkpointed
+            [
+                new_experiment(dict(kwargs, checkpoint=None))
+                for _ in range(kwargs['islands'])
+            ],
+            kwargs['migration_interval'],
+            kwargs['num_migrants'],
+            kwargs['migration_topology'],
+            seed=kwargs['seed'],
+            shared_fitness_cache_size=kwargs['shared_fitness_cache'])
+    else:
+        experiment = new_experiment(kwargs)
     best_individuals, stats_collectors = experiment.run_experiment()
 
     print('\nSolutions:')
     for individual in best_individuals:
         print('Gen: {}, Fitness: {}'.format(individual.generation,
                                             individual.fitness()))
-        print(individual.chromosome.genotypes)
+        print(list(individual.chromosome.genotypes))
         print('\n')
 
     plot_experiment_statistics(stats_collectors)
@@ -0,0 +1,245 @@
+"""Module responsible for benchmarking the genetic algorithm framework.
+
+This module times every class registered in the Enums of the problem runners
+(chromosomes, fitness computers, mutators, recombiners and selectors) and the
+throughput of whole generations, saves the results as JSON and compares them
+with a previous run to catch performance regressions.
+"""
+from argparse import ArgumentParser, Action
+from typing import Type, Any, List, Tuple
+import sys
+
+from benchmarks.harness import BenchmarkResult, save_results, append_history, load_results, load_last_history, compare_results
+from benchmarks.problems import PROBLEMS, ProblemBenchmark
+
+PROGRAM_DESCRIPTION = "Benchmarks the operators of the genetic algorithm " \
+    "framework and compares them with previous runs"
+
+
+class CLIArgumentDescription:
+    # Class designed to model the fields that an CLI Argument should define
+
+    def __init__(self, _type: Type, default_value: Any, short_name: str,
+                 full_name: str, value_name: str, help_message: str,
+                 action_cls: Type[Action]) -> None:
+        self.type = _type
+        self.default_value = default_value
+        self.short_name = '-{}'.format(short_name)
+        self.full_name = '--{}'.format(full_name)
+        self.value_name = value_name
+        self.help_message = help_message.replace('\n', '').replace('\td', '') + \
+            " (default={}).".format(default_value)
+        self.action_cls = action_cls
+
+
+# argparse.Actions for validating CLI arguments.
+class IntegerListConstraintAction(Action):
+    """Class responsible for sanitizing comma separated lists of integers
+    greater than 1"""
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        integers = [int(value) for value in values.split(',')]
+        for integer in integers:
+            if integer < 2:
+                raise ValueError(
+                    "{} flag has a value lower than 2 which is not allowed: {}"
+                    .format(option_string, integer))
+        setattr(namespace, self.dest, integers)
+
+
+class ProblemListConstraintAction(Action):
+    """Class responsible for sanitizing comma separated lists of problems"""
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        names = [problem.name for problem in PROBLEMS]
+        problems = values.split(',')
+        for problem in problems:
+            if problem not in names:
+                raise ValueError(
+                    "{} flag has an unknown problem: {} Choices: {}".format(
+                        option_string, problem, names))
+        setattr(namespace, self.dest, problems)
+
+
+class CheckPositiveIntegerConstraintAction(Action):
+    """Class responsible for sanitizing positive integers"""
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        if values <= 0:
+            raise ValueError(
+                "{} flag has non positive value which is not allowed: {}".
+                format(option_string, values))
+        setattr(namespace, self.dest, values)
+
+
+class NoConstraintAction(Action):
+    """Dummy Action for arguments with no constraints"""
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        setattr(namespace, self.dest, values)
+
+
+# Every CLI Argument this script takes
+ARGS = [
+    CLIArgumentDescription(
+        _type=str,
+        default_value=[problem.name for problem in PROBLEMS],
+        short_name='pb',
+        full_name='problems',
+        value_name='PROBLEMS',
+        help_message="""Specify the comma separated problems to benchmark.""",
+        action_cls=ProblemListConstraintAction),
+    CLIArgumentDescription(
+        _type=str,
+        default_value=[10, 100],
+        short_name='ps',
+        full_name='population_sizes',
+        value_name='POPULATION_SIZES',
+        help_message="""Specify the comma separated population sizes, each
+        one is benchmarked.""",
+        action_cls=IntegerListConstraintAction),
+    CLIArgumentDescription(
+        _type=str,
+        default_value=[8, 30],
+        short_name='dim',
+        full_name='dimensions',
+        value_name='DIMENSIONS',
+        help_message="""Specify the comma separated number of genes of
+        chromosomes, each one is benchmarked.""",
+        action_cls=IntegerListConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=5,
+        short_name='r',
+        full_name='repeat',
+        value_name='REPEAT',
+        help_message="""Specify how many times each benchmark runs, the
+        fastest one is compared.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=10,
+        short_name='g',
+        full_name='generations',
+        value_name='GENERATIONS',
+        help_message="""Specify the number of generations run when timing
+        generation throughput.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=str,
+        default_value='',
+        short_name='f',
+        full_name='filter',
+        value_name='FILTER',
+        help_message="""Specify a text that names of the benchmarks run must
+        contain.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=str,
+        default_value='benchmark_results.json',
+        short_name='o',
+        full_name='output',
+        value_name='OUTPUT',
+        help_message="""Specify the JSON file results are saved to.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=str,
+        default_value='benchmark_history.jsonl',
+        short_name='hist',
+        full_name='history',
+        value_name='HISTORY',
+        help_message="""Specify the JSON lines file every run is appended to.
+        The last run in it is the baseline when no baseline is given.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=str,
+        default_value='',
+        short_name='base',
+        full_name='baseline',
+        value_name='BASELINE',
+        help_message="""Specify a JSON file of results to compare with.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=float,
+        default_value=0.25,
+        short_name='tol',
+        full_name='tolerance',
+        value_name='TOLERANCE',
+        help_message="""Specify how much slower (0.25 for 25%%) than the
+        baseline a benchmark may be before it is reported as a regression.""",
+        action_cls=NoConstraintAction),
+]
+
+
+def run_benchmarks(**kwargs) -> Tuple[List[BenchmarkResult], List[str]]:
+    """Runs the benchmarks selected by kwargs. Returns their results and the
+    benchmarks that failed."""
+    results: List[BenchmarkResult] = []
+    errors: List[str] = []
+    for problem in PROBLEMS:
+        if problem.name not in kwargs['problems']:
+            continue
+
+        for population_size in kwargs['population_sizes']:
+            for dimension in kwargs['dimensions']:
+                benchmark = ProblemBenchmark(problem, population_size,
+                                             dimension, kwargs['repeat'],
+                                             kwargs['generations'])
+                for result in benchmark.run():
+                    if kwargs['filter'] in result.name:
+                        print(result)
+                        results.append(result)
+
+                for skipped in benchmark.skipped:
+                    if kwargs['filter'] in skipped:
+                        print('Skipped {}'.format(skipped))
+
+                errors.extend(error for error in benchmark.errors
+                              if kwargs['filter'] in error)
+
+    return results, errors
+
+
+def main(**kwargs) -> None:
+    print('Using these CLI arguments: {}\n'.format(kwargs))
+
+    # Read before appending this run to the history
+    if kwargs['baseline']:
+        baseline = load_results(kwargs['baseline'])
+    else:
+        baseline = load_last_history(kwargs['history']) or {}
+
+    results, errors = run_benchmarks(**kwargs)
+    save_results(results, kwargs['output'])
+    append_history(results, kwargs['history'])
+
+    regressions = compare_results(results, baseline, kwargs['tolerance'])
+    if regressions:
+        print('\nRegressions:')
+        for result, baseline_result, ratio in regressions:
+            print('{}: {:.2f}x slower ({:.3f} us, was {:.3f} us)'.format(
+                result.key, ratio, result.best * 1e6,
+                baseline_result.best * 1e6))
+    else:
+        print('\nNo regressions among {} benchmarks compared.'.format(
+            sum(1 for result in results if result.key in baseline)))
+
+    if errors:
+        print('\nFailed:')
+        for error in errors:
+            print(error)
+
+    if regressions or errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=PROGRAM_DESCRIPTION)
+
+    for arg in ARGS:
+        parser.add_argument(arg.short_name,
+                            arg.full_name,
+                            help=arg.help_message,
+                            action=arg.action_cls,
+                            type=arg.type,
+                            metavar=arg.value_name,
+                            default=arg.default_value)
+    args = parser.parse_args()
+
+    main(**args.__dict__)
@@ -4,19 +4,22 @@ This module instantiate genetic algorithm framework to find solutions for the
 eight queen problem.
 """
 from argparse import ArgumentParser, Action
-from typing import Type, Any, List
+from typing import Type, Any, List, Dict, Union, Optional
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 import matplotlib.pyplot as plt  # type: ignore
 import matplotlib.patches as mpatches  # type: ignore
 
+from genetic_framework.fitness_cache import FitnessCache, LRUFitnessCache, LFUFitnessCache
 from genetic_framework.experiment import Experiment
+from genetic_framework.islands import IslandExperiment, RingTopology, FullyConnectedTopology, RandomTopology
 from genetic_framework.mutator import *
 from genetic_framework.statistics import *
 from genetic_framework.selectors import *
 from eight_queens.chromosomes import *
 from eight_queens.fitness import *
-from eight_queens.mutators import BitStringRandomizeGeneMutator
+from eight_queens.mutators import BitStringRandomizeGeneMutator, QueenSwapGeneMutator, PackedBitFlipMutator
 from eight_queens.recombiners import *
 from eight_queens.utils import print_chess_board
 
@@ -37,35 +40,63 @@ class FitnessComputerEnum(Enum):
 class ChromosomeEnum(Enum):
     BIT_STRING = BitStringChromosome
     INT_PERM = IntPermutationChromosome
+    COMPACT_BIT_STRING = CompactBitStringChromosome
+    COMPACT_INT_PERM = CompactIntPermutationChromosome
+    PACKED_BIT_STRING = PackedBitStringChromosome
 
 
 class MutatorEnum(Enum):
     RANDOMIZE_GENE = BitStringRandomizeGeneMutator
-    SWAP_GENE = SwapGeneMutator
+    SWAP_GENE = QueenSwapGeneMutator
     SWAP_RANGE = SwapGeneRangeMutator
+    BIT_FLIP = PackedBitFlipMutator
 
 
 class RecombinerEnum(Enum):
     BIT_STR_CUT_CROSS_FILL = BitStringCutCrossfillRecombiner
     PMX_INT_PERM = IntPermutationRecombiner
+    OX_INT_PERM = OrderCrossoverRecombiner
+    CX_INT_PERM = CycleCrossoverRecombiner
+    EDGE_INT_PERM = EdgeRecombinationRecombiner
+    PACKED_CUT_CROSS_FILL = PackedBitStringCutCrossfillRecombiner
 
 
 class SurvivorSelectorEnum(Enum):
     BEST_FITNESS = BestFitnessSurvivorSelector
     GENERATIONAL = GenerationalSurvivorSelector
     ROULETTE = RouletteSurvivorSelector
+    TOURNAMENT = TournamentSurvivorSelector
 
 
 class MatingSelectorEnum(Enum):
     BEST_FITNESS = BestFitnessMatingSelector
     ROULETTE = RouletteMatingSelector
     BEST_FROM_RAND = BestFromRandomMatingSelector
+    TOURNAMENT = TournamentMatingSelector
 
 
 class SolutionSelectorEnum(Enum):
     K_BEST_FITNESS = KBestFitnessSolutionSelector
 
 
+class EvaluationExecutorEnum(Enum):
+    NONE = None
+    THREAD_POOL = ThreadPoolExecutor
+    PROCESS_POOL = ProcessPoolExecutor
+
+
+class FitnessCacheEnum(Enum):
+    NONE = None
+    LRU = LRUFitnessCache
+    LFU = LFUFitnessCache
+
+
+class MigrationTopologyEnum(Enum):
+    RING = RingTopology
+    FULLY_CONNECTED = FullyConnectedTopology
+    RANDOM = RandomTopology
+
+
 class CLIArgumentDescription:
     # Class designed to model the fields that an CLI Argument should define
 
@@ -146,6 +177,145 @@ ARGS = [
         help_message="""Specify the size of the chess board in which the puzzle 
             takes place.""",
         action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='be',
+        full_name='batch_evaluation',
+        value_name='BATCH_EVALUATION',
+        help_message="""Set to 1 to compute fitness of every new individual of a
+            generation in one pass, instead of one at a time when needed.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='sst',
+        full_name='steady_state',
+        value_name='STEADY_STATE',
+        help_message="""Set to 1 to put each child in the population as soon as
+            it is born, replacing the worst individual, instead of selecting
+            survivors among the whole breed of a generation.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='rts',
+        full_name='replacement_tournament_size',
+        value_name='REPLACEMENT_TOURNAMENT_SIZE',
+        help_message="""Number of random individuals among which a child
+            replaces the worst one in steady state mode. (None for the worst
+            of the whole population)""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=EvaluationExecutorEnum,
+        default_value=EvaluationExecutorEnum.NONE.value,
+        short_name='ee',
+        full_name='evaluation_executor',
+        value_name='EVAL_EXECUTOR',
+        help_message="""Specify the pool used to spread batch evaluation among 
+            workers (implies batch evaluation).""",
+        action_cls=EnumConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='ew',
+        full_name='evaluation_workers',
+        value_name='EVAL_WORKERS',
+        help_message="""Number of workers of the evaluation executor. 
+            (None for one per CPU)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='seed',
+        full_name='seed',
+        value_name='SEED',
+        help_message="""Seed of the random numbers used by the experiment, 
+            so it can be reproduced. (None for a random seed)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=str,
+        default_value=None,
+        short_name='ckp',
+        full_name='checkpoint',
+        value_name='CHECKPOINT',
+        help_message="""File where the experiment state is saved periodically
+            and when it stops. If it exists, the experiment resumes from it.
+            Not used by island runs. (None for no checkpoints)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=10,
+        short_name='ci',
+        full_name='checkpoint_interval',
+        value_name='CHECKPOINT_INTERVAL',
+        help_message="""Number of generations between checkpoints.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=FitnessCacheEnum,
+        default_value=FitnessCacheEnum.NONE.value,
+        short_name='fca',
+        full_name='fitness_cache',
+        value_name='FITNESS_CACHE',
+        help_message="""Specify the cache of fitness by chromosome genes, so
+            chromosomes found again are not evaluated again, and how it evicts
+            fitness values when full.""",
+        action_cls=EnumConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=100000,
+        short_name='fcs',
+        full_name='fitness_cache_size',
+        value_name='FITNESS_CACHE_SIZE',
+        help_message="""Maximum number of fitness values kept by the fitness
+            cache.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=1,
+        short_name='isl',
+        full_name='islands',
+        value_name='ISLANDS',
+        help_message="""Number of populations (islands) evolved at the same 
+            time, each one in its own process. 1 disables island mode.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=10,
+        short_name='mint',
+        full_name='migration_interval',
+        value_name='MIGRATION_INTERVAL',
+        help_message="""Number of generations between migrations of 
+            individuals among islands.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=1,
+        short_name='nmig',
+        full_name='num_migrants',
+        value_name='NUM_MIGRANTS',
+        help_message="""Number of best individuals each island sends to each 
+            of its destinations at every migration.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=MigrationTopologyEnum,
+        default_value=MigrationTopologyEnum.RING.value,
+        short_name='topo',
+        full_name='migration_topology',
+        value_name='TOPOLOGY',
+        help_message="""Specify which islands receive the migrants of each 
+            island.""",
+        action_cls=EnumConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='sfc',
+        full_name='shared_fitness_cache',
+        value_name='SHARED_FITNESS_CACHE',
+        help_message="""Number of fitness values islands share through shared
+            memory, so they reuse fitness computed by each other. Needs a
+            fitness cache. 0 keeps island caches apart.""",
+        action_cls=NoConstraintAction),
     CLIArgumentDescription(
         _type=int,
         default_value=100,
@@ -200,6 +370,15 @@ ARGS = [
         help_message="""Number of parents pairs returned from mating selector 
             algorithm for generating new individual through recombination.""",
         action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=3,
+        short_name='ts',
+        full_name='tournament_size',
+        value_name='TOURNAMENT_SIZE',
+        help_message="""Number of random individuals competing for each pick
+            of the tournament mating and survivor selectors.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
     CLIArgumentDescription(
         _type=int,
         default_value=None,
@@ -310,19 +489,73 @@ STATISTICS_COLLECTOR_TYPES = [
 ]
 
 
+def new_custom_data(kwargs: Dict) -> Dict:
+    """custom_data of an experiment described by CLI arguments kwargs."""
+    return dict(chess_size=kwargs['chess_size'],
+                tournament_size=kwargs['tournament_size'])
+
+
+def new_fitness_cache(kwargs: Dict) -> Optional[FitnessCache]:
+    """FitnessCache described by CLI arguments kwargs, if any."""
+    if kwargs['fitness_cache'] is None:
+        return None
+
+    fitness_cache: FitnessCache = kwargs['fitness_cache'](
+        kwargs['fitness_cache_size'])
+    return fitness_cache
+
+
+def new_experiment(kwargs: Dict) -> Experiment:
+    """Experiment described by CLI arguments kwargs."""
+    return Experiment(kwargs['population_size'],
+                      kwargs['max_generations'],
+                      kwargs['crossover_probability'],
+                      kwargs['mutation_probability'],
+                      kwargs['target_fitness'],
+                      kwargs['number_solutions'],
+                      kwargs['breed_size'],
+                      kwargs['max_fitness_comp'],
+                      kwargs['num_parent_pairs'],
+                      kwargs['restart_tolerance'],
+                      kwargs['chromosome'],
+                      kwargs['fitness_computer'],
+                      True,
+                      kwargs['mutator'],
+                      kwargs['recombiner'],
+                      kwargs['mating_selector'],
+                      kwargs['survivor_selector'],
+                      kwargs['solution_selector'],
+                      STATISTICS_COLLECTOR_TYPES,
+                      new_custom_data(kwargs),
+                      batch_evaluation=bool(kwargs['batch_evaluation']),
+                      evaluation_executor_cls=kwargs['evaluation_executor'],
+                      evaluation_workers=kwargs['evaluation_workers'],
+                      seed=kwargs['seed'],
+                      steady_state=bool(kwargs['steady_state']),
+                      replacement_tournament_size=kwargs[
+                          'replacement_tournament_size'],
+                      checkpoint_path=kwargs['checkpoint'],
+                      checkpoint_interval=kwargs['checkpoint_interval'],
+                      fitness_cache=new_fitness_cache(kwargs))
+
+
 def main(**kwargs) -> None:
     print('Using these CLI arguments: {}\n'.format(kwargs))
 
-    experiment = Experiment(
-        kwargs['population_size'], kwargs['max_generations'],
-        kwargs['crossover_probability'], kwargs['mutation_probability'],
-        kwargs['target_fitness'], kwargs['number_solutions'],
-        kwargs['breed_size'], kwargs['max_fitness_comp'],
-        kwargs['num_parent_pairs'], kwargs['restart_tolerance'],
-        kwargs['chromosome'], kwargs['fitness_computer'], True,
-        kwargs['mutator'], kwargs['recombiner'], kwargs['mating_selector'],
-        kwargs['survivor_selector'], kwargs['solution_selector'],
-        STATISTICS_COLLECTOR_TYPES, dict(chess_size=kwargs['chess_size']))
+    if kwargs['islands'] > 1:
+        experiment: Union[Experiment, IslandExperiment] = IslandExperiment(
+            # Islands are not checkpointed
+            [
+                new_experiment(dict(kwargs, checkpoint=None))
+                for _ in range(kwargs['islands'])
+            ],
+            kwargs['migration_interval'],
+            kwargs['num_migrants'],
+            kwargs['migration_topology'],
+            seed=kwargs['seed'],
+            shared_fitness_cache_size=kwargs['shared_fitness_cache'])
+    else:
+        experiment = new_experiment(kwargs)
     best_individuals, stats_collectors = experiment.run_experiment()
 
     print('\nSolutions:')
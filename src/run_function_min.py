@@ -4,20 +4,23 @@ This module instantiate genetic algorithm framework to find solutions for the
 function minimization problem.
 """
 from argparse import ArgumentParser, Action
-from typing import Type, Any
+from typing import Type, Any, Dict, List, Tuple, Optional
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 import matplotlib.pyplot as plt  # type: ignore
 import matplotlib.patches as mpatches  # type: ignore
 
-from function_minimization.chromosomes import FloatVectorChromosome
+from function_minimization.chromosomes import FloatVectorChromosome, CompactFloatVectorChromosome, ArrayFloatVectorChromosome
 from function_minimization.phenotypes import FloatPhenotype
 from function_minimization.genotypes import FloatGenotype
-from function_minimization.fitness import ChallengeFitnessComputer
-from function_minimization.mutators import RandomizeGeneMutator
-from function_minimization.recombiners import RandomInterpolationRecombiner
+from function_minimization.fitness import ChallengeFitnessComputer, ArrayChallengeFitnessComputer
+from function_minimization.mutators import RandomizeGeneMutator, ArrayRandomizeGeneMutator
+from function_minimization.recombiners import RandomInterpolationRecombiner, ArrayRandomInterpolationRecombiner
 from function_minimization.selectors import MinimizeFitnessMatingSelector, MinimizeFitnessSurvivorSelector, KLowerFitnessSolutionSelector
-from genetic_framework.experiment import Experiment
+from genetic_framework.selectors import TournamentMatingSelector, TournamentSurvivorSelector
+from genetic_framework.fitness_cache import FitnessCache, LRUFitnessCache, LFUFitnessCache
+from genetic_framework.experiment import Experiment, ArrayExperiment, CMAESExperiment
 from genetic_framework.statistics import *
 
 PROGRAM_DESCRIPTION = "Minimizes a function through genetic algorithm"
@@ -33,6 +36,7 @@ class FitnessComputerEnum(Enum):
 
 class ChromosomeEnum(Enum):
     FLOAT_VECTOR = FloatVectorChromosome
+    COMPACT_FLOAT_VECTOR = CompactFloatVectorChromosome
 
 
 class MutatorEnum(Enum):
@@ -45,16 +49,63 @@ class RecombinerEnum(Enum):
 
 class SurvivorSelectorEnum(Enum):
     MINIMIZE_FITNESS = MinimizeFitnessSurvivorSelector
+    TOURNAMENT = TournamentSurvivorSelector
 
 
 class MatingSelectorEnum(Enum):
     MINIMIZE_FITNESS = MinimizeFitnessMatingSelector
+    TOURNAMENT = TournamentMatingSelector
 
 
 class SolutionSelectorEnum(Enum):
     K_LOWER_FITNESS = KLowerFitnessSolutionSelector
 
 
+class EvaluationExecutorEnum(Enum):
+    NONE = None
+    THREAD_POOL = ThreadPoolExecutor
+    PROCESS_POOL = ProcessPoolExecutor
+
+
+class FitnessCacheEnum(Enum):
+    NONE = None
+    LRU = LRUFitnessCache
+    LFU = LFUFitnessCache
+
+
+""" Array based counterparts of the classes above, used by the vectorized
+engine (ArrayExperiment). Add new array classes here to make them available.
+"""
+ARRAY_COUNTERPARTS: Dict[Type, Type] = {
+    FloatVectorChromosome: ArrayFloatVectorChromosome,
+    CompactFloatVectorChromosome: ArrayFloatVectorChromosome,
+    ChallengeFitnessComputer: ArrayChallengeFitnessComputer,
+    RandomizeGeneMutator: ArrayRandomizeGeneMutator,
+    RandomInterpolationRecombiner: ArrayRandomInterpolationRecombiner,
+}
+
+
+# Chromosomes whose array counterpart is just the variables, as CMA-ES needs
+CMA_ES_CHROMOSOMES = (FloatVectorChromosome, CompactFloatVectorChromosome)
+
+
+def get_array_counterparts(
+        chromosome_cls: Type, fitness_computer_cls: Type, mutator_cls: Type,
+        recombiner_cls: Type) -> Tuple[Type, Type, Type, Type]:
+    classes = (chromosome_cls, fitness_computer_cls, mutator_cls,
+               recombiner_cls)
+    for cls in classes:
+        if cls not in ARRAY_COUNTERPARTS:
+            raise ValueError(
+                '{} has no array counterpart to run vectorized.'.format(
+                    cls.__name__))
+
+    return (ARRAY_COUNTERPARTS[chromosome_cls],
+            ARRAY_COUNTERPARTS[fitness_computer_cls],
+            ARRAY_COUNTERPARTS[mutator_cls],
+            ARRAY_COUNTERPARTS[recombiner_cls])
+
+
 class CLIArgumentDescription:
     # Class designed to model the fields that an CLI Argument should define
 
@@ -153,6 +204,139 @@ ARGS = [
         help_message=
         """Specify the maximum value the funcion's parameter is allowed to have""",
         action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='vec',
+        full_name='vectorized',
+        value_name='VECTORIZED',
+        help_message="""Set to 1 to evolve the whole population as a single
+            numpy array (parents are paired at random and the best among 
+            parents and breed survive).""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='cma',
+        full_name='cma_es',
+        value_name='CMA_ES',
+        help_message="""Set to 1 to evolve through CMA-ES: a single mean and
+            covariance matrix adapted for the whole population, sampled in
+            batches. Population, breed, operators and selectors other than the
+            solution selector are not used. Needs chromosomes of just the
+            variables.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='cmao',
+        full_name='cma_offspring',
+        value_name='CMA_OFFSPRING',
+        help_message="""Number of points CMA-ES samples per generation. (None
+            for 4 + 3 ln n)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=float,
+        default_value=None,
+        short_name='cmass',
+        full_name='cma_step_size',
+        value_name='CMA_STEP_SIZE',
+        help_message="""Initial standard deviation of CMA-ES. (None for 0.3
+            times the width of the bounds)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='be',
+        full_name='batch_evaluation',
+        value_name='BATCH_EVALUATION',
+        help_message="""Set to 1 to compute fitness of every new individual of a
+            generation in one pass, instead of one at a time when needed.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=0,
+        short_name='sst',
+        full_name='steady_state',
+        value_name='STEADY_STATE',
+        help_message="""Set to 1 to put each child in the population as soon as
+            it is born, replacing the worst individual, instead of selecting
+            survivors among the whole breed of a generation.""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='rts',
+        full_name='replacement_tournament_size',
+        value_name='REPLACEMENT_TOURNAMENT_SIZE',
+        help_message="""Number of random individuals among which a child
+            replaces the worst one in steady state mode. (None for the worst
+            of the whole population)""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=EvaluationExecutorEnum,
+        default_value=EvaluationExecutorEnum.NONE.value,
+        short_name='ee',
+        full_name='evaluation_executor',
+        value_name='EVAL_EXECUTOR',
+        help_message="""Specify the pool used to spread batch evaluation among 
+            workers (implies batch evaluation).""",
+        action_cls=EnumConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='ew',
+        full_name='evaluation_workers',
+        value_name='EVAL_WORKERS',
+        help_message="""Number of workers of the evaluation executor. 
+            (None for one per CPU)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=None,
+        short_name='seed',
+        full_name='seed',
+        value_name='SEED',
+        help_message="""Seed of the random numbers used by the experiment, 
+            so it can be reproduced. (None for a random seed)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=str,
+        default_value=None,
+        short_name='ckp',
+        full_name='checkpoint',
+        value_name='CHECKPOINT',
+        help_message="""File where the experiment state is saved periodically
+            and when it stops. If it exists, the experiment resumes from it.
+            Not used by vectorized runs. (None for no checkpoints)""",
+        action_cls=NoConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=10,
+        short_name='ci',
+        full_name='checkpoint_interval',
+        value_name='CHECKPOINT_INTERVAL',
+        help_message="""Number of generations between checkpoints.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=FitnessCacheEnum,
+        default_value=FitnessCacheEnum.NONE.value,
+        short_name='fca',
+        full_name='fitness_cache',
+        value_name='FITNESS_CACHE',
+        help_message="""Specify the cache of fitness by chromosome genes, so
+            chromosomes found again are not evaluated again, and how it evicts
+            fitness values when full.""",
+        action_cls=EnumConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=100000,
+        short_name='fcs',
+        full_name='fitness_cache_size',
+        value_name='FITNESS_CACHE_SIZE',
+        help_message="""Maximum number of fitness values kept by the fitness
+            cache.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
     CLIArgumentDescription(
         _type=int,
         default_value=100,
@@ -207,6 +391,15 @@ ARGS = [
         help_message="""Number of parents pairs returned from mating selector 
             algorithm for generating new individual through recombination.""",
         action_cls=CheckPositiveIntegerConstraintAction),
+    CLIArgumentDescription(
+        _type=int,
+        default_value=3,
+        short_name='ts',
+        full_name='tournament_size',
+        value_name='TOURNAMENT_SIZE',
+        help_message="""Number of random individuals competing for each pick
+            of the tournament mating and survivor selectors.""",
+        action_cls=CheckPositiveIntegerConstraintAction),
     CLIArgumentDescription(
         _type=float,
         default_value=None,
@@ -307,10 +500,27 @@ STATISTICS_COLLECTOR_TYPES = [
 ]
 
 
-def main(**kwargs) -> None:
-    print('Using these CLI arguments: {}\n'.format(kwargs))
+def new_custom_data(kwargs: Dict) -> Dict:
+    """custom_data of an experiment described by CLI arguments kwargs."""
+    return dict(parameter_lower_bound=kwargs['parameter_lower_bound'],
+                parameter_upper_bound=kwargs['parameter_upper_bound'],
+                vector_size=kwargs['vector_size'],
+                tournament_size=kwargs['tournament_size'])
+
+
+def new_fitness_cache(kwargs: Dict) -> Optional[FitnessCache]:
+    """FitnessCache described by CLI arguments kwargs, if any."""
+    if kwargs['fitness_cache'] is None:
+        return None
+
+    fitness_cache: FitnessCache = kwargs['fitness_cache'](
+        kwargs['fitness_cache_size'])
+    return fitness_cache
+
 
-    experiment = Experiment(
+def new_experiment(kwargs: Dict) -> Experiment:
+    """Experiment described by CLI arguments kwargs."""
+    experiment_args = (
         kwargs['population_size'], kwargs['max_generations'],
         kwargs['crossover_probability'], kwargs['mutation_probability'],
         kwargs['target_fitness'], kwargs['number_solutions'],
@@ -319,10 +529,53 @@ def main(**kwargs) -> None:
         kwargs['fitness_computer'], True, kwargs['mutator'],
         kwargs['recombiner'], kwargs['mating_selector'],
         kwargs['survivor_selector'], kwargs['solution_selector'],
-        STATISTICS_COLLECTOR_TYPES,
-        dict(parameter_lower_bound=kwargs['parameter_lower_bound'],
-             parameter_upper_bound=kwargs['parameter_upper_bound'],
-             vector_size=kwargs['vector_size']))
+        STATISTICS_COLLECTOR_TYPES, new_custom_data(kwargs))
+
+    if kwargs['steady_state'] and (kwargs['cma_es'] or kwargs['vectorized']):
+        raise ValueError(
+            'Steady state evolution is not available for {} experiments.'.
+            format('CMA-ES' if kwargs['cma_es'] else 'vectorized'))
+
+    if kwargs['cma_es']:
+        if kwargs['chromosome'] not in CMA_ES_CHROMOSOMES:
+            raise ValueError(
+                'CMA-ES evolves chromosomes of just the variables, not {}.'.
+                format(kwargs['chromosome'].__name__))
+
+        return CMAESExperiment(*experiment_args,
+                               ARRAY_COUNTERPARTS[kwargs['chromosome']],
+                               ARRAY_COUNTERPARTS[kwargs['fitness_computer']],
+                               offspring_size=kwargs['cma_offspring'],
+                               step_size=kwargs['cma_step_size'],
+                               bounds=(kwargs['parameter_lower_bound'],
+                                       kwargs['parameter_upper_bound']),
+                               seed=kwargs['seed'])
+
+    if kwargs['vectorized']:
+        return ArrayExperiment(
+            *experiment_args,
+            *get_array_counterparts(kwargs['chromosome'],
+                                    kwargs['fitness_computer'],
+                                    kwargs['mutator'], kwargs['recombiner']),
+            seed=kwargs['seed'])
+
+    return Experiment(*experiment_args,
+                      batch_evaluation=bool(kwargs['batch_evaluation']),
+                      evaluation_executor_cls=kwargs['evaluation_executor'],
+                      evaluation_workers=kwargs['evaluation_workers'],
+                      seed=kwargs['seed'],
+                      steady_state=bool(kwargs['steady_state']),
+                      replacement_tournament_size=kwargs[
+                          'replacement_tournament_size'],
+                      checkpoint_path=kwargs['checkpoint'],
+                      checkpoint_interval=kwargs['checkpoint_interval'],
+                      fitness_cache=new_fitness_cache(kwargs))
+
+
+def main(**kwargs) -> None:
+    print('Using these CLI arguments: {}\n'.format(kwargs))
+
+    experiment = new_experiment(kwargs)
     best_individuals, stats_collectors = experiment.run_experiment()
 
     print('\nSolutions:')